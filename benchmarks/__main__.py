@@ -0,0 +1,7 @@
+from benchmarks import asid_lookup_parsing, compression, log_formatting, serialisation, startup
+
+BENCHMARKS = [serialisation, compression, log_formatting, startup, asid_lookup_parsing]
+
+for benchmark in BENCHMARKS:
+    benchmark.run()
+    print()
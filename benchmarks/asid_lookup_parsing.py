@@ -0,0 +1,54 @@
+import csv
+import gzip
+import os
+from io import BytesIO
+
+from benchmarks.common import best_of, report
+from prmods.domain.ods_portal.asid_lookup import AsidLookup, parse_spine_directory_chunks
+from prmods.utils.io.chunks import iter_line_aligned_chunks
+
+ASID_LOOKUP_ROW_COUNT = 500_000
+SPINE_DIRECTORY_HEADER = "ASID,NACS,OrgName,MName,PName,OrgType,PostCode\n"
+
+
+def build_gzip_asid_lookup(row_count: int = ASID_LOOKUP_ROW_COUNT) -> bytes:
+    rows = "".join(
+        f"{index:012d},A{index % 20000:05d},GP PRACTICE {index % 20000},Supplier,"
+        f"System {index % 7},Practice,HP{index % 99} 1PQ\n"
+        for index in range(row_count)
+    )
+    return gzip.compress((SPINE_DIRECTORY_HEADER + rows).encode("utf-8"))
+
+
+def _worker_counts():
+    cpu_count = os.cpu_count() or 1
+    counts = [1, 2, 4, cpu_count]
+    return sorted({count for count in counts if count <= cpu_count})
+
+
+def run():
+    body = build_gzip_asid_lookup()
+
+    def parse_serially():
+        with gzip.open(BytesIO(body), mode="rt") as f:
+            return AsidLookup.from_spine_directory_format(csv.DictReader(f))
+
+    print(f"ASID lookup parsing ({ASID_LOOKUP_ROW_COUNT} rows, decompressed while parsing)")
+    serial_seconds = best_of(parse_serially, number=1, repeat=3)
+    report("csv.DictReader", serial_seconds)
+
+    for workers in _worker_counts():
+
+        def parse_in_parallel():
+            with gzip.open(BytesIO(body), mode="rt") as f:
+                return parse_spine_directory_chunks(iter_line_aligned_chunks(f), workers)
+
+        report(
+            f"process pool, {workers} workers",
+            best_of(parse_in_parallel, number=1, repeat=3),
+            serial_seconds,
+        )
+
+
+if __name__ == "__main__":
+    run()
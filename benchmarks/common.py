@@ -0,0 +1,54 @@
+import timeit
+from datetime import datetime
+from typing import Callable, Optional
+
+from dateutil.tz import tzutc
+
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+
+NATIONAL_PRACTICE_COUNT = 7000
+NATIONAL_SICBL_COUNT = 110
+
+
+def build_national_scale_metadata(
+    practice_count: int = NATIONAL_PRACTICE_COUNT, sicbl_count: int = NATIONAL_SICBL_COUNT
+) -> OrganisationMetadata:
+    practices = [
+        PracticeDetails(
+            ods_code=f"A{index:05d}",
+            name=f"GP PRACTICE NUMBER {index}",
+            asids=[f"{index:06d}{asid:06d}" for asid in range(1 + index % 3)],
+        )
+        for index in range(practice_count)
+    ]
+    sicbls = [
+        SicblDetails(
+            ods_code=f"{index:02d}X",
+            name=f"NHS SUB ICB LOCATION {index}",
+            practices=[practice.ods_code for practice in practices[index::sicbl_count]],
+        )
+        for index in range(sicbl_count)
+    ]
+    return OrganisationMetadata(
+        generated_on=datetime(2020, 1, 30, 18, 44, 49, tzinfo=tzutc()),
+        year=2020,
+        month=1,
+        practices=practices,
+        sicbls=sicbls,
+    )
+
+
+def best_of(function: Callable[[], object], number: int = 5, repeat: int = 5) -> float:
+    """Returns the best time in seconds for a single call of the function."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def report(name: str, seconds: float, baseline_seconds: Optional[float] = None):
+    line = f"{name:<48} {seconds * 1000:10.2f} ms"
+    if baseline_seconds:
+        line += f"  ({baseline_seconds / seconds:.2f}x)"
+    print(line)
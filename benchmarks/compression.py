@@ -0,0 +1,32 @@
+import importlib.util
+
+from benchmarks.common import best_of, build_national_scale_metadata, report
+from prmods.domain.ods_portal.metadata_encoder import iter_encode_organisation_metadata
+from prmods.utils.io.compression import GZIP, ZSTD, compress_text_chunks
+
+
+def run():
+    metadata = build_national_scale_metadata()
+    content_encodings = [GZIP]
+    if importlib.util.find_spec("zstandard"):
+        content_encodings.append(ZSTD)
+
+    print("Organisation metadata compression (streamed during serialisation)")
+    for content_encoding in content_encodings:
+
+        def compress():
+            return compress_text_chunks(
+                iter_encode_organisation_metadata(metadata), content_encoding
+            )
+
+        result = compress()
+        report(f"encode + {content_encoding}", best_of(compress))
+        print(
+            f"  {result.uncompressed_size} -> {result.compressed_size} bytes, "
+            f"ratio {result.compression_ratio:.1f}, "
+            f"compressing {result.compression_seconds * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+import json
+import time
+from datetime import datetime
+from logging import makeLogRecord
+
+from prmods.utils.io.json_formatter import JsonFormatter
+
+RECORD_COUNT = 100000
+DEFAULT_LOG_RECORD_ATTRS = vars(makeLogRecord({})).keys()
+
+
+class DictionaryMergeJsonFormatter:
+    """The JsonFormatter implementation before the hot path was optimised."""
+
+    def format(self, record):
+        return json.dumps(
+            {
+                name: value
+                for (name, value) in vars(record).items()
+                if name not in DEFAULT_LOG_RECORD_ATTRS
+            }
+            | {
+                "level": record.levelname,
+                "message": record.msg,
+                "module": record.module,
+                "time": datetime.utcfromtimestamp(record.created).isoformat(),
+            }
+        )
+
+
+def _build_records():
+    start = time.time()
+    return [
+        makeLogRecord(
+            {
+                "msg": "ASIDS not found for ODS code: A12345",
+                "levelname": "WARNING",
+                "module": "metadata_service",
+                "created": start + index / 1000,
+                "event": "ASIDS_NOT_FOUND",
+                "ods_code": "A12345",
+            }
+        )
+        for index in range(RECORD_COUNT)
+    ]
+
+
+def _records_per_second(formatter, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def run():
+    records = _build_records()
+    formatters = [
+        ("dict merge + utcfromtimestamp + json.dumps", DictionaryMergeJsonFormatter()),
+        ("JsonFormatter", JsonFormatter()),
+    ]
+
+    print("JSON log record formatting")
+    for name, formatter in formatters:
+        print(f"{name:<48} {_records_per_second(formatter, records):12,.0f} records/s")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,27 @@
+import json
+from dataclasses import asdict
+
+from benchmarks.common import best_of, build_national_scale_metadata, report
+from prmods.domain.ods_portal.metadata_encoder import encode_organisation_metadata
+from prmods.utils.io.s3 import _serialize_datetime
+
+
+def run():
+    metadata = build_national_scale_metadata()
+
+    def legacy():
+        return json.dumps(asdict(metadata), default=_serialize_datetime)
+
+    def encoder():
+        return encode_organisation_metadata(metadata)
+
+    assert legacy() == encoder(), "encoder output differs from asdict + json.dumps"
+
+    print("Organisation metadata serialisation")
+    baseline = best_of(legacy)
+    report("asdict + json.dumps", baseline)
+    report("encode_organisation_metadata", best_of(encoder), baseline)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,89 @@
+import json
+import subprocess
+import sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+RUNS = 5
+
+EAGER_IMPORTS = "import boto3, requests, dateutil.parser, dateutil.relativedelta\n"
+
+STARTUP_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+{eager_imports}
+import prmods.pipeline.main
+from prmods.domain.ods_portal.ods_portal_client import OdsPortalClient
+from prmods.domain.ods_portal.ods_portal_data_fetcher import OdsPortalDataFetcher
+from prmods.utils.io.s3 import create_s3_client
+
+imported = time.perf_counter()
+OdsPortalDataFetcher(OdsPortalClient(search_url="{search_url}")).fetch_all_sicbls()
+first_request = time.perf_counter()
+create_s3_client(endpoint_url="{search_url}")
+s3_client_created = time.perf_counter()
+
+print(json.dumps({{
+    "import": imported - start,
+    "first_request": first_request - start,
+    "s3_client": s3_client_created - first_request,
+}}))
+"""
+
+
+class _EmptyOdsResponseHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"Organisations": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _best_startup_timings(script: str) -> dict:
+    runs = []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output))
+    return {name: min(run[name] for run in runs) for name in runs[0]}
+
+
+def _report(name: str, timings: dict):
+    print(
+        f"{name:<24} import {timings['import'] * 1000:8.1f} ms"
+        f"  first ODS request {timings['first_request'] * 1000:8.1f} ms"
+        f"  first S3 client {timings['s3_client'] * 1000:8.1f} ms"
+    )
+
+
+def run():
+    server = HTTPServer(("127.0.0.1", 0), _EmptyOdsResponseHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    search_url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        print(f"Cold start in a fresh interpreter, best of {RUNS} runs")
+        _report(
+            "eager imports",
+            _best_startup_timings(
+                STARTUP_SCRIPT.format(eager_imports=EAGER_IMPORTS, search_url=search_url)
+            ),
+        )
+        _report(
+            "lazy imports",
+            _best_startup_timings(STARTUP_SCRIPT.format(eager_imports="", search_url=search_url)),
+        )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run()
@@ -11,9 +11,15 @@ setup(
         "boto3>=1.29.7",
         "urllib3==1.26.18",
     ],
+    extras_require={
+        "zstd": ["zstandard>=0.19"],
+        "parquet": ["pyarrow>=12"],
+    },
     entry_points={
         "console_scripts": [
             "ods-portal-pipeline=prmods.pipeline.main:main",
+            "ods-portal-backfill=prmods.pipeline.backfill:main",
+            "ods-portal-sicbl-crawl-worker=prmods.pipeline.sicbl_crawl_worker:main",
         ]
     },
 )
@@ -0,0 +1,187 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from logging import Logger
+from threading import Condition
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from prmods.domain.ods_portal.ods_portal_client import OdsPortalException
+from prmods.domain.ods_portal.ods_portal_data_fetcher import OdsDataSource, OrganisationDetails
+
+module_logger = logging.getLogger(__name__)
+
+DEFAULT_INITIAL_CONCURRENCY = 2
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_LATENCY_SPIKE_FACTOR = 3.0
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BACKOFF_SECONDS = 0.5
+MAX_RETRY_BACKOFF_SECONDS = 8.0
+LATENCY_SMOOTHING = 0.2
+
+CONCURRENCY_INCREASED = "ODS_CONCURRENCY_INCREASED"
+CONCURRENCY_DECREASED = "ODS_CONCURRENCY_DECREASED"
+
+
+def is_throttling_error(error: Exception) -> bool:
+    return isinstance(error, OdsPortalException) and (
+        error.status_code == 429 or error.status_code >= 500
+    )
+
+
+class AimdConcurrencyLimiter:
+    """
+    Additive increase, multiplicative decrease limit on in-flight ODS requests. Each
+    healthy response adds 1/limit, so the limit grows by one per round of requests. A
+    throttling error, or a latency more than spike_factor times the smoothed latency,
+    multiplies the limit by decrease_factor. Only the first bad response from requests
+    started at the current limit decreases it, so one slow round of requests is not
+    counted several times. Every successful response, spike or not, updates the smoothed
+    latency, so after a lasting change in latency the limit grows again.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = DEFAULT_INITIAL_CONCURRENCY,
+        max_limit: int = DEFAULT_MAX_CONCURRENCY,
+        min_limit: int = 1,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        latency_spike_factor: float = DEFAULT_LATENCY_SPIKE_FACTOR,
+        clock: Callable[[], float] = time.perf_counter,
+        logger: Logger = module_logger,
+    ):
+        self._limit = float(initial_limit)
+        self._max_limit = max_limit
+        self._min_limit = min_limit
+        self._decrease_factor = decrease_factor
+        self._latency_spike_factor = latency_spike_factor
+        self._clock = clock
+        self._logger = logger
+        self._condition = Condition()
+        self._in_flight = 0
+        self._epoch = 0
+        self._smoothed_latency: Optional[float] = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            epoch = self._epoch
+        start = self._clock()
+        try:
+            yield
+        except Exception as error:
+            self._release(epoch, self._clock() - start, error)
+            raise
+        self._release(epoch, self._clock() - start, None)
+
+    def _is_latency_spike(self, latency_seconds: float) -> bool:
+        return (
+            self._smoothed_latency is not None
+            and latency_seconds > self._smoothed_latency * self._latency_spike_factor
+        )
+
+    def _release(self, epoch: int, latency_seconds: float, error: Optional[Exception]):
+        with self._condition:
+            self._in_flight -= 1
+            decrease_reason = self._decrease_reason(latency_seconds, error)
+            if error is None:
+                self._record_latency(latency_seconds)
+            if decrease_reason is not None:
+                self._decrease(epoch, decrease_reason, latency_seconds)
+            elif error is None:
+                self._increase(latency_seconds)
+            self._condition.notify_all()
+
+    def _decrease_reason(self, latency_seconds: float, error: Optional[Exception]) -> Optional[str]:
+        if isinstance(error, OdsPortalException) and is_throttling_error(error):
+            return f"ODS returned {error.status_code}"
+        if error is None and self._is_latency_spike(latency_seconds):
+            return "latency spike"
+        return None
+
+    def _record_latency(self, latency_seconds: float):
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency_seconds
+        self._smoothed_latency += LATENCY_SMOOTHING * (latency_seconds - self._smoothed_latency)
+
+    def _increase(self, latency_seconds: float):
+        previous_limit = self.limit
+        self._limit = min(self._limit + 1 / self._limit, float(self._max_limit))
+        if self.limit > previous_limit:
+            self._log_decision(CONCURRENCY_INCREASED, "healthy responses", latency_seconds)
+
+    def _decrease(self, epoch: int, reason: str, latency_seconds: float):
+        if epoch != self._epoch:
+            return
+        self._epoch += 1
+        self._limit = max(self._limit * self._decrease_factor, float(self._min_limit))
+        self._log_decision(CONCURRENCY_DECREASED, reason, latency_seconds)
+
+    def _log_decision(self, event: str, reason: str, latency_seconds: float):
+        self._logger.info(
+            f"ODS concurrency limit set to {self.limit}: {reason}",
+            extra={
+                "event": event,
+                "limit": self.limit,
+                "reason": reason,
+                "latency_seconds": round(latency_seconds, 3),
+                "smoothed_latency_seconds": round(self._smoothed_latency or 0.0, 3),
+            },
+        )
+
+
+class AdaptiveSicblPracticesFetcher:
+    """
+    Fetches the practices of each SICBL concurrently, with the number of requests in
+    flight set by an AIMD limiter. A query that ODS throttles is retried after an
+    exponential backoff with full jitter, by when the limit has been lowered.
+    """
+
+    def __init__(
+        self,
+        data_source: OdsDataSource,
+        limiter: AimdConcurrencyLimiter,
+        max_workers: int = DEFAULT_MAX_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_seconds: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._data_source = data_source
+        self._limiter = limiter
+        self._max_workers = max_workers
+        self._max_attempts = max_attempts
+        self._backoff_seconds = backoff_seconds
+        self._sleep = sleep
+
+    def _backoff(self, attempt: int):
+        backoff_limit = min(self._backoff_seconds * 2 ** (attempt - 1), MAX_RETRY_BACKOFF_SECONDS)
+        # Retry jitter only spreads out retries, so it does not need a secure generator
+        self._sleep(random.uniform(0, backoff_limit))  # nosec B311
+
+    def _fetch_with_retries(self, sicbl_ods_code: str) -> List[OrganisationDetails]:
+        attempt = 1
+        while True:
+            try:
+                with self._limiter.slot():
+                    return self._data_source.fetch_practices_for_sicbl(sicbl_ods_code)
+            except OdsPortalException as error:
+                if not is_throttling_error(error) or attempt == self._max_attempts:
+                    raise
+            self._backoff(attempt)
+            attempt += 1
+
+    def fetch_sicbl_practices(
+        self, sicbls: Iterable[OrganisationDetails]
+    ) -> Dict[str, List[OrganisationDetails]]:
+        sicbl_ods_codes = list(dict.fromkeys(sicbl.ods_code for sicbl in sicbls))
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            results = executor.map(self._fetch_with_retries, sicbl_ods_codes)
+            return dict(zip(sicbl_ods_codes, results))
@@ -1,6 +1,28 @@
-from collections import defaultdict
+import csv
+import logging
+from collections import defaultdict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import DefaultDict, Iterable, List
+from functools import partial
+from io import StringIO
+from itertools import chain
+from multiprocessing import get_context
+from typing import Callable, DefaultDict, Deque, Dict, Iterable, Iterator, List, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ODS_CODE_COLUMN = "NACS"
+ASID_COLUMN = "ASID"
+
+# Chunks submitted to the process pool but not yet merged, per worker
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+class InvalidSpineDirectoryExtract(Exception):
+    pass
 
 
 @dataclass
@@ -14,9 +36,20 @@ class AsidLookup:
     def from_spine_directory_format(cls, rows: Iterable[dict]):
         return cls([OdsAsid(row["NACS"], row["ASID"]) for row in rows])
 
+    @classmethod
+    def from_partial_mappings(cls, partial_mappings: Iterable[Dict[str, List[str]]]):
+        asid_lookup = cls([])
+        for partial_mapping in partial_mappings:
+            for ods_code, asids in partial_mapping.items():
+                asid_lookup._ods_asid_mapping[ods_code].extend(asids)
+        return asid_lookup
+
     def __init__(self, mappings: Iterable[OdsAsid]):
         self._ods_asid_mapping = _construct_ods_asid_mapping(mappings)
 
+    def __len__(self):
+        return len(self._ods_asid_mapping)
+
     def has_ods(self, ods_code: str):
         return ods_code in self._ods_asid_mapping
 
@@ -29,3 +62,69 @@ def _construct_ods_asid_mapping(mappings: Iterable[OdsAsid]) -> defaultdict:
     for mapping in mappings:
         ods_asid_mapping[mapping.ods_code].append(mapping.asid)
     return ods_asid_mapping
+
+
+def _parse_spine_directory_chunk(
+    ods_code_column: int, asid_column: int, chunk: str
+) -> Dict[str, List[str]]:
+    partial_mapping: Dict[str, List[str]] = {}
+    row_length = max(ods_code_column, asid_column) + 1
+    for row in csv.reader(StringIO(chunk)):
+        if len(row) >= row_length:
+            partial_mapping.setdefault(row[ods_code_column], []).append(row[asid_column])
+        elif row:
+            _log_short_row(row)
+    return partial_mapping
+
+
+def _log_short_row(row: List[str]):
+    logger.warning(
+        "Skipping spine directory row with missing columns",
+        extra={"event": "SKIPPED_SHORT_SPINE_DIRECTORY_ROW", "row": row},
+    )
+
+
+def _map_in_order(
+    executor: Executor, function: Callable[[T], R], items: Iterable[T], max_in_flight: int
+) -> Iterator[R]:
+    in_flight: Deque[Future] = deque()
+    for item in items:
+        in_flight.append(executor.submit(function, item))
+        if len(in_flight) >= max_in_flight:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def _spine_directory_columns(header_line: str) -> Tuple[int, int]:
+    if not header_line.strip():
+        raise InvalidSpineDirectoryExtract("Spine directory extract is empty")
+    header = next(csv.reader([header_line]))
+    missing_columns = [column for column in (ODS_CODE_COLUMN, ASID_COLUMN) if column not in header]
+    if missing_columns:
+        raise InvalidSpineDirectoryExtract(
+            f"Spine directory extract header is missing columns: {', '.join(missing_columns)}"
+        )
+    return header.index(ODS_CODE_COLUMN), header.index(ASID_COLUMN)
+
+
+def parse_spine_directory_chunks(chunks: Iterable[str], max_workers: int) -> AsidLookup:
+    """
+    Parses line-aligned chunks of a spine directory CSV extract in a process pool and merges
+    the partial mappings in chunk order, which keeps the ASIDs of each ODS code in file order.
+    Only a few chunks per worker are read ahead of the merge, so the extract is not held in
+    memory all at once. Workers are spawned rather than forked, as the pipeline runs this on
+    a thread.
+    """
+    chunk_iterator = iter(chunks)
+    header_line, _, first_rows = next(chunk_iterator, "").partition("\n")
+    parse_chunk = partial(_parse_spine_directory_chunk, *_spine_directory_columns(header_line))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn")) as executor:
+        return AsidLookup.from_partial_mappings(
+            _map_in_order(
+                executor,
+                parse_chunk,
+                chain([first_rows], chunk_iterator),
+                max_in_flight=max_workers * CHUNKS_IN_FLIGHT_PER_WORKER,
+            )
+        )
@@ -0,0 +1,37 @@
+import logging
+from typing import Dict, List
+
+from prmods.domain.ods_portal.ods_portal_client import OdsClient, ods_query_key
+from prmods.utils.io.json_store import JsonStore
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointingOdsPortalClient:
+    """
+    Saves each completed query to a store keyed by run ID and query parameters, so that
+    a restarted run with the same run ID only fetches the queries that are left.
+    """
+
+    def __init__(self, ods_client: OdsClient, store: JsonStore, run_id: str):
+        self._ods_client = ods_client
+        self._store = store
+        self._run_id = run_id
+
+    def fetch_organisation_data(self, params: Dict[str, str]) -> List[dict]:
+        checkpoint_key = f"{self._run_id}/{ods_query_key(params)}.json"
+        checkpointed_data = self._store.read(checkpoint_key)
+        if checkpointed_data is not None:
+            logger.info(
+                "Using checkpointed ODS query result: " + checkpoint_key,
+                extra={"event": "ODS_QUERY_CHECKPOINT_HIT", "checkpoint_key": checkpoint_key},
+            )
+            return checkpointed_data
+
+        response_data = self._ods_client.fetch_organisation_data(params)
+        self._store.write(checkpoint_key, response_data)
+        logger.info(
+            "Saved ODS query checkpoint: " + checkpoint_key,
+            extra={"event": "ODS_QUERY_CHECKPOINT_SAVED", "checkpoint_key": checkpoint_key},
+        )
+        return response_data
@@ -0,0 +1,153 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Event, Lock
+from typing import Deque, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_MAX_PERCENT = 10
+DEFAULT_HEDGE_INITIAL_THRESHOLD_SECONDS = 2.0
+DEFAULT_HEDGE_WORKERS = 8
+LATENCY_WINDOW_SIZE = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+def _is_successful(future: Future) -> bool:
+    return future.exception() is None and future.result().status_code == 200
+
+
+class LatencyTracker:
+    """
+    Keeps the latencies of the most recent requests and reports a percentile of them,
+    falling back to an initial threshold until enough requests have completed.
+    """
+
+    def __init__(
+        self,
+        percentile: int = DEFAULT_HEDGE_PERCENTILE,
+        initial_threshold_seconds: float = DEFAULT_HEDGE_INITIAL_THRESHOLD_SECONDS,
+        window_size: int = LATENCY_WINDOW_SIZE,
+        min_samples: int = MIN_LATENCY_SAMPLES,
+    ):
+        self._percentile = percentile
+        self._initial_threshold_seconds = initial_threshold_seconds
+        self._min_samples = min_samples
+        self._lock = Lock()
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def threshold_seconds(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self._min_samples:
+                return self._initial_threshold_seconds
+            latencies = sorted(self._latencies)
+        return latencies[(len(latencies) - 1) * self._percentile // 100]
+
+
+class HedgedRequestStats:
+    """
+    Counts the requests made through a hedged client, not including hedges, and the
+    hedges fired and won. Hedges are capped as a percentage of those requests.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.requests_sent = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests_sent += 1
+
+    def try_fire_hedge(self, max_percent: int) -> bool:
+        with self._lock:
+            if (self.hedges_fired + 1) * 100 > self.requests_sent * max_percent:
+                return False
+            self.hedges_fired += 1
+            return True
+
+    def record_hedge_won(self):
+        with self._lock:
+            self.hedges_won += 1
+
+
+class HedgedHttpClient:
+    """
+    Sends a duplicate of any GET that has not answered within the current latency
+    threshold of starting, and returns whichever 200 response arrives first, or the
+    primary's result when neither succeeds. Hedges are capped at max_percent of requests
+    sent. A request that is already in flight cannot be interrupted, so the slower
+    response is discarded when it arrives. The pool that sends the requests should have
+    room for every request in flight plus its hedge, and is shut down by close().
+    """
+
+    def __init__(
+        self,
+        http_client=None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        stats: Optional[HedgedRequestStats] = None,
+        max_percent: int = DEFAULT_HEDGE_MAX_PERCENT,
+        max_workers: int = DEFAULT_HEDGE_WORKERS,
+    ):
+        self._http_client = http_client
+        self._latency_tracker = latency_tracker or LatencyTracker()
+        self.stats = stats or HedgedRequestStats()
+        self._max_percent = max_percent
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ods-hedged-request"
+        )
+
+    def _timed_get(self, started: Event, *args):
+        started.set()
+        if self._http_client is None:
+            # requests is slow to import, so wait until the first request
+            import requests
+
+            self._http_client = requests
+        start = time.perf_counter()
+        response = self._http_client.get(*args)
+        self._latency_tracker.record(time.perf_counter() - start)
+        return response
+
+    def _first_successful(self, primary: Future, hedge: Future):
+        pending: Set[Future] = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            successful = [future for future in done if _is_successful(future)]
+            if successful:
+                return successful[0]
+        return primary
+
+    def get(self, *args):
+        threshold_seconds = self._latency_tracker.threshold_seconds()
+        self.stats.record_request()
+        primary_started = Event()
+        primary = self._executor.submit(self._timed_get, primary_started, *args)
+        # Time spent queued for a pool thread does not count towards the threshold
+        primary_started.wait()
+        done, _ = wait({primary}, timeout=threshold_seconds)
+        if done or not self.stats.try_fire_hedge(self._max_percent):
+            return primary.result()
+
+        logger.info(
+            f"Hedging ODS request after {threshold_seconds:.3f}s",
+            extra={"event": "ODS_REQUEST_HEDGED", "threshold_seconds": threshold_seconds},
+        )
+        hedge = self._executor.submit(self._timed_get, Event(), *args)
+        winner = self._first_successful(primary, hedge)
+        loser = hedge if winner is primary else primary
+        loser.cancel()
+        if winner is hedge:
+            self.stats.record_hedge_won()
+        return winner.result()
+
+    def close(self):
+        # A discarded response may still be in flight, so do not wait for it
+        self._executor.shutdown(wait=False)
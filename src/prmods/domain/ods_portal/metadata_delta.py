@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Set
+
+from prmods.domain.ods_portal.metadata_service import OrganisationMetadata, PracticeDetails
+
+
+@dataclass
+class PracticeAsidChange:
+    ods_code: str
+    added_asids: List[str]
+    removed_asids: List[str]
+
+
+@dataclass
+class PracticeSicblChange:
+    ods_code: str
+    previous_sicbls: List[str]
+    current_sicbls: List[str]
+
+
+@dataclass
+class OrganisationMetadataDelta:
+    generated_on: datetime
+    year: int
+    month: int
+    previous_year: int
+    previous_month: int
+    added_practices: List[PracticeDetails]
+    removed_practices: List[PracticeDetails]
+    asid_changes: List[PracticeAsidChange]
+    sicbl_changes: List[PracticeSicblChange]
+
+
+def _practices_by_ods_code(metadata: OrganisationMetadata) -> Dict[str, PracticeDetails]:
+    return {practice.ods_code: practice for practice in metadata.practices}
+
+
+def _sicbls_by_practice_ods_code(metadata: OrganisationMetadata) -> Dict[str, Set[str]]:
+    sicbls_by_practice: Dict[str, Set[str]] = {}
+    for sicbl in metadata.sicbls:
+        for practice_ods_code in sicbl.practices:
+            sicbls_by_practice.setdefault(practice_ods_code, set()).add(sicbl.ods_code)
+    return sicbls_by_practice
+
+
+def _asid_changes(
+    previous: Dict[str, PracticeDetails], current: Dict[str, PracticeDetails], ods_codes: List[str]
+) -> List[PracticeAsidChange]:
+    changes = []
+    for ods_code in ods_codes:
+        previous_asids = set(previous[ods_code].asids)
+        current_asids = set(current[ods_code].asids)
+        if previous_asids != current_asids:
+            changes.append(
+                PracticeAsidChange(
+                    ods_code=ods_code,
+                    added_asids=sorted(current_asids - previous_asids),
+                    removed_asids=sorted(previous_asids - current_asids),
+                )
+            )
+    return changes
+
+
+def _sicbl_changes(
+    previous: Dict[str, Set[str]], current: Dict[str, Set[str]], ods_codes: List[str]
+) -> List[PracticeSicblChange]:
+    return [
+        PracticeSicblChange(
+            ods_code=ods_code,
+            previous_sicbls=sorted(previous.get(ods_code, set())),
+            current_sicbls=sorted(current.get(ods_code, set())),
+        )
+        for ods_code in ods_codes
+        if previous.get(ods_code, set()) != current.get(ods_code, set())
+    ]
+
+
+def compute_metadata_delta(
+    previous: OrganisationMetadata, current: OrganisationMetadata
+) -> OrganisationMetadataDelta:
+    """
+    Compares two months of metadata by ODS code. Practices present in both months are
+    checked for ASID changes and for moves between SICBLs.
+    """
+    previous_practices = _practices_by_ods_code(previous)
+    current_practices = _practices_by_ods_code(current)
+    previous_ods_codes = previous_practices.keys()
+    current_ods_codes = current_practices.keys()
+    retained_ods_codes = sorted(previous_ods_codes & current_ods_codes)
+
+    return OrganisationMetadataDelta(
+        generated_on=datetime.now(timezone.utc),
+        year=current.year,
+        month=current.month,
+        previous_year=previous.year,
+        previous_month=previous.month,
+        added_practices=[
+            current_practices[ods_code]
+            for ods_code in sorted(current_ods_codes - previous_ods_codes)
+        ],
+        removed_practices=[
+            previous_practices[ods_code]
+            for ods_code in sorted(previous_ods_codes - current_ods_codes)
+        ],
+        asid_changes=_asid_changes(previous_practices, current_practices, retained_ods_codes),
+        sicbl_changes=_sicbl_changes(
+            _sicbls_by_practice_ods_code(previous),
+            _sicbls_by_practice_ods_code(current),
+            retained_ods_codes,
+        ),
+    )
@@ -0,0 +1,151 @@
+import hashlib
+from datetime import datetime
+from json.encoder import encode_basestring_ascii
+from typing import Iterable, Iterator, List
+
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+
+
+def _encode_str_list(values: List[str]) -> str:
+    return "[" + ", ".join(encode_basestring_ascii(value) for value in values) + "]"
+
+
+def _encode_practice(practice: PracticeDetails) -> str:
+    return (
+        '{"ods_code": '
+        + encode_basestring_ascii(practice.ods_code)
+        + ', "name": '
+        + encode_basestring_ascii(practice.name)
+        + ', "asids": '
+        + _encode_str_list(practice.asids)
+        + "}"
+    )
+
+
+def _encode_sicbl(sicbl: SicblDetails) -> str:
+    return (
+        '{"ods_code": '
+        + encode_basestring_ascii(sicbl.ods_code)
+        + ', "name": '
+        + encode_basestring_ascii(sicbl.name)
+        + ', "practices": '
+        + _encode_str_list(sicbl.practices)
+        + "}"
+    )
+
+
+def _iter_encode_list(encoded_items: Iterable[str]) -> Iterator[str]:
+    separator = "["
+    for encoded_item in encoded_items:
+        yield separator + encoded_item
+        separator = ", "
+    yield "[]" if separator == "[" else "]"
+
+
+def iter_encode_organisation_metadata_parts(
+    generated_on: datetime,
+    year: int,
+    month: int,
+    practices: Iterable[PracticeDetails],
+    sicbls: Iterable[SicblDetails],
+) -> Iterator[str]:
+    """
+    Yields the JSON document for the metadata in chunks, reading straight from the
+    dataclasses. Practices are consumed in full before the first SICBL is read.
+    """
+    yield (
+        '{"generated_on": '
+        + encode_basestring_ascii(generated_on.isoformat())
+        + ', "year": '
+        + int.__repr__(year)
+        + ', "month": '
+        + int.__repr__(month)
+        + ', "practices": '
+    )
+    yield from _iter_encode_list(_encode_practice(practice) for practice in practices)
+    yield ', "sicbls": '
+    yield from _iter_encode_list(_encode_sicbl(sicbl) for sicbl in sicbls)
+    yield "}"
+
+
+def iter_encode_organisation_metadata(metadata: OrganisationMetadata) -> Iterator[str]:
+    """
+    The output is identical to json.dumps(asdict(metadata)) with datetimes serialised
+    as ISO 8601 strings.
+    """
+    return iter_encode_organisation_metadata_parts(
+        metadata.generated_on, metadata.year, metadata.month, metadata.practices, metadata.sicbls
+    )
+
+
+def encode_organisation_metadata(metadata: OrganisationMetadata) -> str:
+    return "".join(iter_encode_organisation_metadata(metadata))
+
+
+def encode_sicbl_shard(
+    metadata: OrganisationMetadata, sicbl: SicblDetails, practices: Iterable[PracticeDetails]
+) -> str:
+    """Encodes a single SICBL with the full details of its practices."""
+    return "".join(
+        [
+            '{"generated_on": ',
+            encode_basestring_ascii(metadata.generated_on.isoformat()),
+            ', "year": ',
+            int.__repr__(metadata.year),
+            ', "month": ',
+            int.__repr__(metadata.month),
+            ', "ods_code": ',
+            encode_basestring_ascii(sicbl.ods_code),
+            ', "name": ',
+            encode_basestring_ascii(sicbl.name),
+            ', "practices": ',
+            *_iter_encode_list(_encode_practice(practice) for practice in practices),
+            "}",
+        ]
+    )
+
+
+def _canonical_practices(practices: List[PracticeDetails]) -> Iterator[PracticeDetails]:
+    # ASID order is part of the published content, so only practice order is normalised
+    yield from sorted(practices, key=lambda practice: practice.ods_code)
+
+
+def _canonical_sicbls(sicbls: List[SicblDetails]) -> Iterator[SicblDetails]:
+    for sicbl in sorted(sicbls, key=lambda sicbl: sicbl.ods_code):
+        yield SicblDetails(
+            ods_code=sicbl.ods_code, name=sicbl.name, practices=sorted(sicbl.practices)
+        )
+
+
+def _iter_encode_canonical_content(metadata: OrganisationMetadata) -> Iterator[str]:
+    yield (
+        '{"year": '
+        + int.__repr__(metadata.year)
+        + ', "month": '
+        + int.__repr__(metadata.month)
+        + ', "practices": '
+    )
+    yield from _iter_encode_list(
+        _encode_practice(practice) for practice in _canonical_practices(metadata.practices)
+    )
+    yield ', "sicbls": '
+    yield from _iter_encode_list(
+        _encode_sicbl(sicbl) for sicbl in _canonical_sicbls(metadata.sicbls)
+    )
+    yield "}"
+
+
+def content_hash(metadata: OrganisationMetadata) -> str:
+    """
+    Returns a SHA-256 hex digest of the metadata content. Practices, SICBLs and their
+    ASID and practice lists are hashed in sorted order and generated_on is excluded, so
+    the hash only changes when the content does.
+    """
+    digest = hashlib.sha256()
+    for chunk in _iter_encode_canonical_content(metadata):
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
@@ -1,9 +1,9 @@
+from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from logging import Logger, getLogger
-from typing import Iterable, List, Optional, Set
-
-from dateutil.tz import tzutc
+from threading import Lock
+from typing import Callable, DefaultDict, Dict, Iterable, Iterator, List, Optional, Set
 
 from prmods.domain.ods_portal.asid_lookup import AsidLookup
 from prmods.domain.ods_portal.ods_portal_data_fetcher import OdsDataSource, OrganisationDetails
@@ -36,33 +36,148 @@ class OrganisationMetadata:
         cls, practices: List[PracticeDetails], sicbls: List[SicblDetails], year: int, month: int
     ):
         return cls(
-            generated_on=datetime.now(tzutc()),
+            generated_on=datetime.now(timezone.utc),
             practices=practices,
             sicbls=sicbls,
             year=year,
             month=month,
         )
 
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            generated_on=datetime.fromisoformat(data["generated_on"]),
+            year=data["year"],
+            month=data["month"],
+            practices=[PracticeDetails(**practice) for practice in data["practices"]],
+            sicbls=[SicblDetails(**sicbl) for sicbl in data["sicbls"]],
+        )
+
 
 module_logger = getLogger(__name__)
 
+ASIDS_NOT_FOUND = "ASIDS_NOT_FOUND"
+DUPLICATE_ODS_CODE_FOUND = "DUPLICATE_ODS_CODE_FOUND"
+ORGANISATION_DETAILS_DEDUP = "ORGANISATION_DETAILS_DEDUP"
+ODS_CACHE_HIT_RATES = "ODS_CACHE_HIT_RATES"
+ODS_REQUEST_HEDGING = "ODS_REQUEST_HEDGING"
+
+PRACTICES_WITH_ASIDS_STAGE = "PRACTICES_WITH_ASIDS"
+SICBL_PRACTICE_ALLOCATIONS_STAGE = "SICBL_PRACTICE_ALLOCATIONS"
+
+DEFAULT_OBSERVABILITY_SAMPLE_SIZE = 10
+
 
 class MetadataServiceObservabilityProbe:
     def __init__(self, logger: Logger = module_logger):
         self._logger = logger
 
-    def record_asids_not_found(self, ods_code: str):
+    def record_asids_not_found(self, ods_code: str, stage: str = PRACTICES_WITH_ASIDS_STAGE):
         self._logger.warning(
             f"ASIDS not found for ODS code: {ods_code}",
-            extra={"event": "ASIDS_NOT_FOUND", "ods_code": ods_code},
+            extra={"event": ASIDS_NOT_FOUND, "ods_code": ods_code},
         )
 
-    def record_duplicate_organisation(self, ods_code: str):
+    def record_duplicate_organisation(self, ods_code: str, stage: str):
         self._logger.warning(
             f"Duplicate ODS code found: {ods_code}",
-            extra={"event": "DUPLICATE_ODS_CODE_FOUND", "ods_code": ods_code},
+            extra={"event": DUPLICATE_ODS_CODE_FOUND, "ods_code": ods_code},
+        )
+
+    def record_stage_completed(self, stage: str):
+        pass
+
+    def record_organisation_details_dedup(self, requested_count: int, created_count: int):
+        dedup_ratio = requested_count / created_count if created_count else 1.0
+        self._logger.info(
+            f"{requested_count} organisations from ODS shared {created_count} objects",
+            extra={
+                "event": ORGANISATION_DETAILS_DEDUP,
+                "requested_count": requested_count,
+                "created_count": created_count,
+                "dedup_ratio": round(dedup_ratio, 2),
+            },
         )
 
+    def record_ods_cache_hit_rates(self, hit_rates: Dict[str, dict]):
+        self._logger.info(
+            "ODS query cache hit rates: "
+            + ", ".join(f"{tier} {rates['hit_rate']}" for tier, rates in hit_rates.items()),
+            extra={"event": ODS_CACHE_HIT_RATES, "tiers": hit_rates},
+        )
+
+    def record_hedged_requests(self, requests_sent: int, hedges_fired: int, hedges_won: int):
+        self._logger.info(
+            f"{hedges_fired} of {requests_sent} ODS requests were hedged, {hedges_won} hedges won",
+            extra={
+                "event": ODS_REQUEST_HEDGING,
+                "requests_sent": requests_sent,
+                "hedges_fired": hedges_fired,
+                "hedges_won": hedges_won,
+            },
+        )
+
+
+class AggregatingMetadataServiceObservabilityProbe(MetadataServiceObservabilityProbe):
+    """
+    Counts events instead of logging each one, keeping a bounded sample of ODS codes
+    per event. Counts are kept per stage, so that stages running at the same time do not
+    report each other's events. One summary event per event type is logged when a stage
+    completes.
+    """
+
+    def __init__(
+        self,
+        logger: Logger = module_logger,
+        sample_size: int = DEFAULT_OBSERVABILITY_SAMPLE_SIZE,
+        retain_all_ods_codes: bool = False,
+    ):
+        super().__init__(logger)
+        self._sample_size = sample_size
+        self._retain_all_ods_codes = retain_all_ods_codes
+        self._lock = Lock()
+        self._counts: DefaultDict[str, DefaultDict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self._samples: DefaultDict[str, DefaultDict[str, List[str]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self._all_ods_codes: DefaultDict[str, List[str]] = defaultdict(list)
+
+    def _record(self, event: str, ods_code: str, stage: str):
+        with self._lock:
+            self._counts[stage][event] += 1
+            samples = self._samples[stage][event]
+            if len(samples) < self._sample_size:
+                samples.append(ods_code)
+            if self._retain_all_ods_codes:
+                self._all_ods_codes[event].append(ods_code)
+
+    def record_asids_not_found(self, ods_code: str, stage: str = PRACTICES_WITH_ASIDS_STAGE):
+        self._record(ASIDS_NOT_FOUND, ods_code, stage)
+
+    def record_duplicate_organisation(self, ods_code: str, stage: str):
+        self._record(DUPLICATE_ODS_CODE_FOUND, ods_code, stage)
+
+    def record_stage_completed(self, stage: str):
+        with self._lock:
+            counts: Dict[str, int] = self._counts.pop(stage, {})
+            samples: Dict[str, List[str]] = self._samples.pop(stage, {})
+        for event, count in counts.items():
+            self._logger.warning(
+                f"{event} recorded for {count} ODS codes during {stage}",
+                extra={
+                    "event": f"{event}_SUMMARY",
+                    "stage": stage,
+                    "count": count,
+                    "sample_ods_codes": samples[event],
+                },
+            )
+
+    def all_ods_codes(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {event: list(ods_codes) for event, ods_codes in self._all_ods_codes.items()}
+
 
 class Gp2gpOrganisationMetadataService:
     def __init__(
@@ -71,45 +186,100 @@ class Gp2gpOrganisationMetadataService:
         self._data_fetcher = data_fetcher
         self._probe = observability_probe
 
-    def retrieve_practices_with_asids(
-        self, asid_lookup: AsidLookup, show_prison_practices_toggle: Optional[bool] = False
-    ) -> List[PracticeDetails]:
+    def fetch_unique_practices(
+        self, show_prison_practices_toggle: Optional[bool] = False
+    ) -> List[OrganisationDetails]:
         practices = self._data_fetcher.fetch_all_practices(
             show_prison_practices_toggle=show_prison_practices_toggle
         )
-        unique_practices = self._remove_duplicate_organisations(practices)
+        return list(self._remove_duplicate_organisations(practices, PRACTICES_WITH_ASIDS_STAGE))
 
-        return list(self._enrich_practices_with_asids(unique_practices, asid_lookup))
+    def enrich_practices_with_asids(
+        self, practices: Iterable[OrganisationDetails], asid_lookup: AsidLookup
+    ) -> List[PracticeDetails]:
+        practices_with_asids = list(self._enrich_practices_with_asids(practices, asid_lookup))
+        self._probe.record_stage_completed(PRACTICES_WITH_ASIDS_STAGE)
+        return practices_with_asids
 
-    def retrieve_sicbl_practice_allocations(
-        self, canonical_practice_list: List[PracticeDetails]
-    ) -> List[SicblDetails]:
+    def retrieve_practices_with_asids(
+        self, asid_lookup: AsidLookup, show_prison_practices_toggle: Optional[bool] = False
+    ) -> List[PracticeDetails]:
+        unique_practices = self.fetch_unique_practices(show_prison_practices_toggle)
+        return self.enrich_practices_with_asids(unique_practices, asid_lookup)
+
+    def fetch_unique_sicbls(self) -> List[OrganisationDetails]:
         sicbls = self._data_fetcher.fetch_all_sicbls()
-        unique_sicbls = self._remove_duplicate_organisations(sicbls)
+        return list(self._remove_duplicate_organisations(sicbls, SICBL_PRACTICE_ALLOCATIONS_STAGE))
+
+    def fetch_sicbl_practices(
+        self, sicbls: Iterable[OrganisationDetails]
+    ) -> Dict[str, List[OrganisationDetails]]:
+        return {
+            sicbl.ods_code: self._data_fetcher.fetch_practices_for_sicbl(sicbl.ods_code)
+            for sicbl in sicbls
+        }
+
+    def allocate_sicbl_practices(
+        self,
+        sicbls: Iterable[OrganisationDetails],
+        sicbl_practices: Dict[str, List[OrganisationDetails]],
+        canonical_practice_list: List[PracticeDetails],
+    ) -> List[SicblDetails]:
+        # ODS codes are interned by the data fetcher, so most lookups match on identity
         canonical_practice_ods_codes = {practice.ods_code for practice in canonical_practice_list}
         sicbl_practice_allocations = [
-            self._fetch_sicbl_practice_allocation(sicbl, canonical_practice_ods_codes)
-            for sicbl in unique_sicbls
+            SicblDetails(
+                ods_code=sicbl.ods_code,
+                name=sicbl.name,
+                practices=[
+                    practice.ods_code
+                    for practice in sicbl_practices[sicbl.ods_code]
+                    if practice.ods_code in canonical_practice_ods_codes
+                ],
+            )
+            for sicbl in sicbls
         ]
         sicbls_containing_practices = [
             sicbl for sicbl in sicbl_practice_allocations if len(sicbl.practices) > 0
         ]
+        self._probe.record_stage_completed(SICBL_PRACTICE_ALLOCATIONS_STAGE)
         return sicbls_containing_practices
 
-    def _fetch_sicbl_practice_allocation(
-        self, sicbl: OrganisationDetails, canonical_practice_ods_codes: Set[str]
-    ) -> SicblDetails:
-        sicbl_practices = self._data_fetcher.fetch_practices_for_sicbl(sicbl.ods_code)
+    def retrieve_sicbl_practice_allocations(
+        self, canonical_practice_list: List[PracticeDetails]
+    ) -> List[SicblDetails]:
+        unique_sicbls = self.fetch_unique_sicbls()
+        sicbl_practices = self.fetch_sicbl_practices(unique_sicbls)
+        return self.allocate_sicbl_practices(
+            unique_sicbls, sicbl_practices, canonical_practice_list
+        )
 
-        return SicblDetails(
-            ods_code=sicbl.ods_code,
-            name=sicbl.name,
-            practices=[
+    def iter_practices_with_asids(
+        self, practices: Iterable[OrganisationDetails], asid_lookup: AsidLookup
+    ) -> Iterator[PracticeDetails]:
+        unique_practices = self._remove_duplicate_organisations(
+            practices, PRACTICES_WITH_ASIDS_STAGE
+        )
+        yield from self._enrich_practices_with_asids(unique_practices, asid_lookup)
+        self._probe.record_stage_completed(PRACTICES_WITH_ASIDS_STAGE)
+
+    def iter_sicbl_practice_allocations(
+        self,
+        sicbls: Iterable[OrganisationDetails],
+        practices_for_sicbl: Callable[[str], Iterable[OrganisationDetails]],
+        canonical_practice_ods_codes: Set[str],
+    ) -> Iterator[SicblDetails]:
+        for sicbl in self._remove_duplicate_organisations(sicbls, SICBL_PRACTICE_ALLOCATIONS_STAGE):
+            practice_ods_codes = [
                 practice.ods_code
-                for practice in sicbl_practices
+                for practice in practices_for_sicbl(sicbl.ods_code)
                 if practice.ods_code in canonical_practice_ods_codes
-            ],
-        )
+            ]
+            if practice_ods_codes:
+                yield SicblDetails(
+                    ods_code=sicbl.ods_code, name=sicbl.name, practices=practice_ods_codes
+                )
+        self._probe.record_stage_completed(SICBL_PRACTICE_ALLOCATIONS_STAGE)
 
     def _enrich_practices_with_asids(
         self, practices: Iterable[OrganisationDetails], asid_lookup: AsidLookup
@@ -122,16 +292,17 @@ class Gp2gpOrganisationMetadataService:
                     name=practice.name,
                 )
             else:
-                self._probe.record_asids_not_found(practice.ods_code)
+                self._probe.record_asids_not_found(practice.ods_code, PRACTICES_WITH_ASIDS_STAGE)
 
     def _remove_duplicate_organisations(
         self,
-        organisations: List[OrganisationDetails],
+        organisations: Iterable[OrganisationDetails],
+        stage: str,
     ) -> Iterable[OrganisationDetails]:
         seen_ods = set()
         for organisation in organisations:
             if organisation.ods_code not in seen_ods:
                 yield organisation
             else:
-                self._probe.record_duplicate_organisation(organisation.ods_code)
+                self._probe.record_duplicate_organisation(organisation.ods_code, stage)
             seen_ods.add(organisation.ods_code)
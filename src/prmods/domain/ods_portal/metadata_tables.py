@@ -0,0 +1,42 @@
+from typing import Dict, List
+
+from prmods.domain.ods_portal.metadata_service import OrganisationMetadata
+
+PRACTICES_TABLE = "practices"
+PRACTICE_ASIDS_TABLE = "practice_asids"
+SICBL_PRACTICES_TABLE = "sicbl_practices"
+
+Columns = Dict[str, List[str]]
+
+
+def _practices_columns(metadata: OrganisationMetadata) -> Columns:
+    return {
+        "ods_code": [practice.ods_code for practice in metadata.practices],
+        "name": [practice.name for practice in metadata.practices],
+    }
+
+
+def _practice_asids_columns(metadata: OrganisationMetadata) -> Columns:
+    columns: Columns = {"ods_code": [], "asid": []}
+    for practice in metadata.practices:
+        columns["ods_code"].extend([practice.ods_code] * len(practice.asids))
+        columns["asid"].extend(practice.asids)
+    return columns
+
+
+def _sicbl_practices_columns(metadata: OrganisationMetadata) -> Columns:
+    columns: Columns = {"sicbl_ods_code": [], "sicbl_name": [], "practice_ods_code": []}
+    for sicbl in metadata.sicbls:
+        columns["sicbl_ods_code"].extend([sicbl.ods_code] * len(sicbl.practices))
+        columns["sicbl_name"].extend([sicbl.name] * len(sicbl.practices))
+        columns["practice_ods_code"].extend(sicbl.practices)
+    return columns
+
+
+def organisation_metadata_tables(metadata: OrganisationMetadata) -> Dict[str, Columns]:
+    """Flattens the metadata into column-oriented tables, keyed by table name."""
+    return {
+        PRACTICES_TABLE: _practices_columns(metadata),
+        PRACTICE_ASIDS_TABLE: _practice_asids_columns(metadata),
+        SICBL_PRACTICES_TABLE: _sicbl_practices_columns(metadata),
+    }
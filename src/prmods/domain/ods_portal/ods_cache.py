@@ -0,0 +1,257 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+from prmods.domain.ods_portal.ods_portal_client import OdsClient, normalised_query
+from prmods.utils.io.json_store import JsonStore, LocalJsonStore, S3JsonStore
+from prmods.utils.io.s3 import S3DataManager
+
+logger = logging.getLogger(__name__)
+
+MEMORY_TIER = "memory"
+DISK_TIER = "disk"
+S3_TIER = "s3"
+
+Clock = Callable[[], float]
+
+
+def ods_cache_key(search_url: str, params: Dict[str, str]) -> str:
+    query = f"{search_url}?{normalised_query(params)}"
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class CacheTier(Protocol):
+    name: str
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        ...
+
+    def put(self, key: str, organisations: List[dict]):
+        ...
+
+
+class MemoryCacheTier:
+    """
+    In-process least recently used cache of ODS query results.
+    """
+
+    name = MEMORY_TIER
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Clock = time.time):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[str, Tuple[float, List[dict]]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, organisations = entry
+            if self._clock() - stored_at > self._ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return organisations
+
+    def put(self, key: str, organisations: List[dict]):
+        with self._lock:
+            self._entries[key] = (self._clock(), organisations)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class StoreCacheTier:
+    """
+    Cache of ODS query results in a JSON store. Each entry records when it was stored,
+    so that entries older than the TTL are treated as missing.
+    """
+
+    def __init__(self, name: str, store: JsonStore, ttl_seconds: float, clock: Clock = time.time):
+        self.name = name
+        self._store = store
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+
+    @staticmethod
+    def _entry_key(key: str) -> str:
+        return f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        entry = self._store.read(self._entry_key(key))
+        if entry is None or self._clock() - entry["stored_at"] > self._ttl_seconds:
+            return None
+        return entry["organisations"]
+
+    def put(self, key: str, organisations: List[dict]):
+        self._store.write(
+            self._entry_key(key), {"stored_at": self._clock(), "organisations": organisations}
+        )
+
+
+class EntryLimit:
+    """
+    Keeps a store to its max_entries most recently written entries. The entries already
+    in the store are listed, oldest first, on the first write. After that each write is
+    tracked in memory, so writing does not list the store again.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        list_keys: Callable[[], Iterable[str]],
+        remove: Callable[[List[str]], None],
+    ):
+        self._max_entries = max_entries
+        self._list_keys = list_keys
+        self._remove = remove
+        self._lock = Lock()
+        self._keys: Optional[OrderedDict[str, None]] = None
+
+    def add(self, key: str):
+        with self._lock:
+            if self._keys is None:
+                self._keys = OrderedDict.fromkeys(self._list_keys())
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            excess_entries = max(len(self._keys) - self._max_entries, 0)
+            removed_keys = [self._keys.popitem(last=False)[0] for _ in range(excess_entries)]
+        if removed_keys:
+            self._remove(removed_keys)
+
+
+class DiskCacheTier(StoreCacheTier):
+    """
+    Cache of ODS query results in a local directory, keeping the most recently written
+    entries when there are more than max_entries.
+    """
+
+    def __init__(
+        self, directory: str, max_entries: int, ttl_seconds: float, clock: Clock = time.time
+    ):
+        super().__init__(DISK_TIER, LocalJsonStore(directory), ttl_seconds, clock)
+        self._directory = Path(directory)
+        self._entry_limit = EntryLimit(max_entries, self._list_keys, self._remove)
+
+    def _list_keys(self) -> List[str]:
+        paths = sorted(self._directory.glob("*.json"), key=lambda path: path.stat().st_mtime_ns)
+        return [path.stem for path in paths]
+
+    def _remove(self, keys: List[str]):
+        for key in keys:
+            (self._directory / self._entry_key(key)).unlink(missing_ok=True)
+
+    def put(self, key: str, organisations: List[dict]):
+        super().put(key, organisations)
+        self._entry_limit.add(key)
+
+
+class S3CacheTier(StoreCacheTier):
+    """
+    Cache of ODS query results under an S3 prefix shared between runs, keeping the most
+    recently written entries when there are more than max_entries. Entries beyond the
+    limit are deleted with one DeleteObjects request per batch.
+    """
+
+    def __init__(
+        self,
+        s3_manager: S3DataManager,
+        prefix_uri: str,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Clock = time.time,
+    ):
+        super().__init__(S3_TIER, S3JsonStore(s3_manager, prefix_uri), ttl_seconds, clock)
+        self._s3_manager = s3_manager
+        self._prefix_uri = prefix_uri.rstrip("/")
+        self._entry_limit = EntryLimit(max_entries, self._list_keys, self._remove)
+
+    def _entry_uri(self, key: str) -> str:
+        return f"{self._prefix_uri}/{self._entry_key(key)}"
+
+    def _list_keys(self) -> List[str]:
+        object_uris = self._s3_manager.list_object_uris(self._prefix_uri + "/", oldest_first=True)
+        return [
+            Path(object_uri.rsplit("/", 1)[-1]).stem
+            for object_uri in object_uris
+            if object_uri.endswith(".json")
+        ]
+
+    def _remove(self, keys: List[str]):
+        self._s3_manager.delete_objects([self._entry_uri(key) for key in keys])
+
+    def put(self, key: str, organisations: List[dict]):
+        super().put(key, organisations)
+        self._entry_limit.add(key)
+
+
+class OdsCacheStats:
+    def __init__(self):
+        self._lock = Lock()
+        self._lookups: Dict[str, int] = {}
+        self._hits: Dict[str, int] = {}
+
+    def record_lookup(self, tier: str, hit: bool):
+        with self._lock:
+            self._lookups[tier] = self._lookups.get(tier, 0) + 1
+            self._hits[tier] = self._hits.get(tier, 0) + int(hit)
+
+    def hit_rates(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                tier: {
+                    "lookups": lookups,
+                    "hits": self._hits[tier],
+                    "hit_rate": round(self._hits[tier] / lookups, 2),
+                }
+                for tier, lookups in self._lookups.items()
+            }
+
+
+class TieredCacheOdsClient:
+    """
+    Looks up each query in the tiers in order, keyed by the ODS Portal search URL and the
+    normalised query parameters. A hit is copied into the faster tiers that missed, and
+    a result fetched from the ODS Portal is written to every tier.
+    """
+
+    def __init__(
+        self,
+        ods_client: OdsClient,
+        tiers: Sequence[CacheTier],
+        search_url: str,
+        stats: Optional[OdsCacheStats] = None,
+    ):
+        self._ods_client = ods_client
+        self._tiers = tiers
+        self._search_url = search_url
+        self.stats = stats or OdsCacheStats()
+
+    def fetch_organisation_data(self, params: Dict[str, str]) -> List[dict]:
+        key = ods_cache_key(self._search_url, params)
+        for index, tier in enumerate(self._tiers):
+            organisations = tier.get(key)
+            self.stats.record_lookup(tier.name, hit=organisations is not None)
+            if organisations is not None:
+                logger.info(
+                    f"Using cached ODS query result from {tier.name} tier",
+                    extra={"event": "ODS_QUERY_CACHE_HIT", "tier": tier.name, "cache_key": key},
+                )
+                self._put(self._tiers[:index], key, organisations)
+                return organisations
+
+        organisations = self._ods_client.fetch_organisation_data(params)
+        self._put(self._tiers, key, organisations)
+        return organisations
+
+    @staticmethod
+    def _put(tiers: Sequence[CacheTier], key: str, organisations: List[dict]):
+        for tier in tiers:
+            tier.put(key, organisations)
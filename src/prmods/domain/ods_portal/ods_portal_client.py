@@ -1,6 +1,7 @@
+import hashlib
 import json
-
-import requests
+from typing import Dict, Iterator, List, Protocol
+from urllib.parse import urlencode
 
 ODS_PORTAL_SEARCH_URL = "https://directory.spineservices.nhs.uk/ORD/2-0-0/organisations"
 NEXT_PAGE_HEADER = "Next-Page"
@@ -12,21 +13,47 @@ class OdsPortalException(Exception):
         self.status_code = status_code
 
 
+def normalised_query(params: Dict[str, str]) -> str:
+    return urlencode(sorted(params.items()))
+
+
+def ods_query_key(params: Dict[str, str]) -> str:
+    return hashlib.sha256(normalised_query(params).encode("utf-8")).hexdigest()
+
+
+class OdsClient(Protocol):
+    def fetch_organisation_data(self, params: Dict[str, str]) -> List[dict]:
+        ...
+
+
+class StreamingOdsClient(Protocol):
+    def iter_organisation_data(self, params: Dict[str, str]) -> Iterator[dict]:
+        ...
+
+
 class OdsPortalClient:
-    def __init__(self, http_client=requests, search_url=ODS_PORTAL_SEARCH_URL):
+    def __init__(self, http_client=None, search_url=ODS_PORTAL_SEARCH_URL):
         self._search_url = search_url
         self._http_client = http_client
 
+    def _get(self, *args):
+        if self._http_client is None:
+            # requests is slow to import, so wait until the first request
+            import requests
+
+            self._http_client = requests
+        return self._http_client.get(*args)
+
     def fetch_organisation_data(self, params):
-        response_data = list(self._iterate_organisation_data(params))
+        response_data = list(self.iter_organisation_data(params))
         return response_data
 
-    def _iterate_organisation_data(self, params):
-        response = self._http_client.get(self._search_url, params)
+    def iter_organisation_data(self, params):
+        response = self._get(self._search_url, params)
         yield from self._process_practice_data_response(response)
 
         while NEXT_PAGE_HEADER in response.headers:
-            response = self._http_client.get(response.headers[NEXT_PAGE_HEADER])
+            response = self._get(response.headers[NEXT_PAGE_HEADER])
             yield from self._process_practice_data_response(response)
 
     @classmethod
@@ -1,7 +1,12 @@
+import sys
 from dataclasses import dataclass
-from typing import List, Optional, Protocol
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Protocol
 
-from prmods.domain.ods_portal.ods_portal_client import OdsPortalClient
+if TYPE_CHECKING:
+    from prmods.domain.ods_portal.ods_snapshot import OdsSnapshot
+
+from prmods.domain.ods_portal.ods_portal_client import OdsClient, StreamingOdsClient
 
 
 @dataclass
@@ -59,9 +64,42 @@ class OdsDataSource(Protocol):
         ...
 
 
+class OrganisationDetailsCache:
+    """
+    Run-scoped flyweight cache, so that an organisation seen in several ODS responses is
+    represented by one OrganisationDetails object with an interned ODS code. An object is
+    only shared when the name matches the first one seen for that ODS code.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._organisations: Dict[str, OrganisationDetails] = {}
+        self.requested_count = 0
+        self.created_count = 0
+
+    def get(self, ods_code: str, name: str) -> OrganisationDetails:
+        with self._lock:
+            self.requested_count += 1
+            cached = self._organisations.get(ods_code)
+            if cached is not None and cached.name == name:
+                return cached
+            self.created_count += 1
+            organisation = OrganisationDetails(ods_code=sys.intern(ods_code), name=name)
+            if cached is None:
+                self._organisations[organisation.ods_code] = organisation
+            return organisation
+
+
 class OdsPortalDataFetcher:
-    def __init__(self, ods_client: OdsPortalClient):
+    def __init__(
+        self,
+        ods_client: OdsClient,
+        organisation_cache: Optional[OrganisationDetailsCache] = None,
+        snapshot: Optional["OdsSnapshot"] = None,
+    ):
         self._ods_client = ods_client
+        self.organisation_cache = organisation_cache or OrganisationDetailsCache()
+        self._snapshot = snapshot
 
     def fetch_all_practices(
         self, show_prison_practices_toggle: Optional[bool] = False
@@ -82,7 +120,93 @@ class OdsPortalDataFetcher:
 
     def _fetch_organisation_details(self, params):
         response = self._ods_client.fetch_organisation_data(params)
+        if self._snapshot is not None:
+            self._snapshot.write(params, response)
         return [
-            OrganisationDetails(name=organisation["Name"], ods_code=organisation["OrgId"])
+            self.organisation_cache.get(ods_code=organisation["OrgId"], name=organisation["Name"])
             for organisation in response
         ]
+
+
+class StreamingOdsDataSource:
+    """
+    Yields organisations page by page as the ODS Portal returns them. Nothing is cached,
+    so that a full query result is never held in memory.
+    """
+
+    def __init__(self, ods_client: StreamingOdsClient):
+        self._ods_client = ods_client
+
+    def iter_all_practices(
+        self, show_prison_practices_toggle: Optional[bool] = False
+    ) -> Iterator[OrganisationDetails]:
+        if show_prison_practices_toggle is True:
+            return self._iter_organisation_details(PRACTICE_SEARCH_PARAMS_WITH_MULTIPLE_ROLES)
+        return self._iter_organisation_details(PRACTICE_SEARCH_PARAMS_NON_PRISONS_DEPRECATED)
+
+    def iter_all_sicbls(self) -> Iterator[OrganisationDetails]:
+        return self._iter_organisation_details(SICBL_SEARCH_PARAMS)
+
+    def iter_practices_for_sicbl(self, sicbl_ods_code: str) -> Iterator[OrganisationDetails]:
+        return self._iter_organisation_details(
+            SICBL_PRACTICES_SEARCH_PARAMS | {"TargetOrgId": sicbl_ods_code}
+        )
+
+    def fetch_all_practices(
+        self, show_prison_practices_toggle: Optional[bool] = False
+    ) -> List[OrganisationDetails]:
+        return list(self.iter_all_practices(show_prison_practices_toggle))
+
+    def fetch_all_sicbls(self) -> List[OrganisationDetails]:
+        return list(self.iter_all_sicbls())
+
+    def fetch_practices_for_sicbl(self, sicbl_ods_code: str) -> List[OrganisationDetails]:
+        return list(self.iter_practices_for_sicbl(sicbl_ods_code))
+
+    def _iter_organisation_details(self, params: Dict[str, str]) -> Iterator[OrganisationDetails]:
+        for organisation in self._ods_client.iter_organisation_data(params):
+            yield OrganisationDetails(ods_code=organisation["OrgId"], name=organisation["Name"])
+
+
+class MemoizingOdsDataSource:
+    """
+    Serves each query from memory after its first fetch, so that several runs can share
+    one crawl of the ODS Portal.
+    """
+
+    def __init__(self, data_source: OdsDataSource):
+        self._data_source = data_source
+        self._lock = Lock()
+        self._practices: Dict[bool, List[OrganisationDetails]] = {}
+        self._sicbls: Optional[List[OrganisationDetails]] = None
+        self._practices_by_sicbl: Dict[str, List[OrganisationDetails]] = {}
+
+    def fetch_all_practices(
+        self, show_prison_practices_toggle: Optional[bool] = False
+    ) -> List[OrganisationDetails]:
+        toggle = show_prison_practices_toggle is True
+        with self._lock:
+            if toggle not in self._practices:
+                self._practices[toggle] = self._data_source.fetch_all_practices(
+                    show_prison_practices_toggle=toggle
+                )
+            return self._practices[toggle]
+
+    def fetch_all_sicbls(self) -> List[OrganisationDetails]:
+        with self._lock:
+            if self._sicbls is None:
+                self._sicbls = self._data_source.fetch_all_sicbls()
+            return self._sicbls
+
+    def fetch_practices_for_sicbl(self, sicbl_ods_code: str) -> List[OrganisationDetails]:
+        with self._lock:
+            if sicbl_ods_code not in self._practices_by_sicbl:
+                self._practices_by_sicbl[
+                    sicbl_ods_code
+                ] = self._data_source.fetch_practices_for_sicbl(sicbl_ods_code)
+            return self._practices_by_sicbl[sicbl_ods_code]
+
+    def crawl(self, show_prison_practices_toggle: Optional[bool] = False):
+        self.fetch_all_practices(show_prison_practices_toggle=show_prison_practices_toggle)
+        for sicbl in self.fetch_all_sicbls():
+            self.fetch_practices_for_sicbl(sicbl.ods_code)
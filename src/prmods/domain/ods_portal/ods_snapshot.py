@@ -0,0 +1,67 @@
+import gzip
+import json
+import logging
+from typing import Dict, List
+
+from prmods.domain.ods_portal.ods_portal_client import normalised_query, ods_query_key
+from prmods.domain.ods_portal.ods_portal_data_fetcher import OdsPortalDataFetcher
+from prmods.utils.io.s3 import S3DataManager
+
+logger = logging.getLogger(__name__)
+
+ODS_QUERY_METADATA_KEY = "ods-query"
+
+
+class OdsSnapshot:
+    """
+    Raw ODS Portal query results stored as one gzip compressed NDJSON object per query,
+    keyed by the query parameters, so that a run can be replayed without the ODS Portal.
+    """
+
+    def __init__(self, s3_manager: S3DataManager, prefix_uri: str):
+        self._s3_manager = s3_manager
+        self._prefix_uri = prefix_uri.rstrip("/")
+
+    def _object_uri(self, params: Dict[str, str]) -> str:
+        return f"{self._prefix_uri}/{ods_query_key(params)}.ndjson.gz"
+
+    def write(self, params: Dict[str, str], organisations: List[dict]):
+        lines = "".join(json.dumps(organisation) + "\n" for organisation in organisations)
+        self._s3_manager.write_bytes(
+            self._object_uri(params),
+            gzip.compress(lines.encode("utf-8")),
+            content_type="application/gzip",
+            metadata={ODS_QUERY_METADATA_KEY: normalised_query(params)},
+        )
+
+    def read(self, params: Dict[str, str]) -> List[dict]:
+        body = self._s3_manager.read_bytes(self._object_uri(params))
+        lines = gzip.decompress(body).decode("utf-8").splitlines()
+        return [json.loads(line) for line in lines if line]
+
+
+class SnapshotOdsClient:
+    def __init__(self, snapshot: OdsSnapshot):
+        self._snapshot = snapshot
+
+    def fetch_organisation_data(self, params: Dict[str, str]) -> List[dict]:
+        organisations = self._snapshot.read(params)
+        logger.info(
+            "Replayed ODS query from snapshot",
+            extra={
+                "event": "ODS_QUERY_REPLAYED_FROM_SNAPSHOT",
+                "query": normalised_query(params),
+                "organisation_count": len(organisations),
+            },
+        )
+        return organisations
+
+
+class ReplayOdsDataSource(OdsPortalDataFetcher):
+    """
+    Serves every query from a previously written snapshot, without calling the ODS Portal.
+    A query missing from the snapshot raises S3ObjectNotFound.
+    """
+
+    def __init__(self, snapshot: OdsSnapshot):
+        super().__init__(ods_client=SnapshotOdsClient(snapshot))
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Set
+
+from prmods.domain.ods_portal.asid_lookup import AsidLookup
+from prmods.domain.ods_portal.metadata_encoder import iter_encode_organisation_metadata_parts
+from prmods.domain.ods_portal.metadata_service import (
+    Gp2gpOrganisationMetadataService,
+    PracticeDetails,
+)
+from prmods.domain.ods_portal.ods_portal_data_fetcher import StreamingOdsDataSource
+
+
+def _collect_ods_codes(
+    practices: Iterable[PracticeDetails], ods_codes: Set[str]
+) -> Iterator[PracticeDetails]:
+    for practice in practices:
+        ods_codes.add(practice.ods_code)
+        yield practice
+
+
+def iter_encode_streamed_organisation_metadata(
+    service: Gp2gpOrganisationMetadataService,
+    data_source: StreamingOdsDataSource,
+    asid_lookup: AsidLookup,
+    generated_on: datetime,
+    year: int,
+    month: int,
+    show_prison_practices_toggle: Optional[bool] = False,
+) -> Iterator[str]:
+    """
+    Yields the organisation metadata JSON document while practices and SICBLs flow from
+    the ODS Portal through deduplication, enrichment and allocation one at a time. Apart
+    from the ASID lookup, only the ODS codes seen so far are kept: one set per query for
+    deduplication and the set of canonical practice codes used to allocate SICBLs. The
+    SICBL queries start once every practice has been written.
+    """
+    canonical_practice_ods_codes: Set[str] = set()
+    practices = service.iter_practices_with_asids(
+        data_source.iter_all_practices(show_prison_practices_toggle), asid_lookup
+    )
+    sicbls = service.iter_sicbl_practice_allocations(
+        data_source.iter_all_sicbls(),
+        data_source.iter_practices_for_sicbl,
+        canonical_practice_ods_codes,
+    )
+    return iter_encode_organisation_metadata_parts(
+        generated_on,
+        year,
+        month,
+        _collect_ods_codes(practices, canonical_practice_ods_codes),
+        sicbls,
+    )
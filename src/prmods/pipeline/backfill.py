@@ -0,0 +1,124 @@
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import replace
+from datetime import datetime
+from os import environ
+from typing import List
+
+from dateutil.relativedelta import relativedelta
+from dateutil.tz import tzutc
+
+from prmods.domain.ods_portal.ods_portal_data_fetcher import (
+    MemoizingOdsDataSource,
+    OdsPortalDataFetcher,
+)
+from prmods.pipeline.config import (
+    InvalidEnvironmentVariableValue,
+    MissingEnvironmentVariable,
+    OdsPortalConfig,
+)
+from prmods.pipeline.main import logger, setup_logger
+from prmods.pipeline.ods_client import create_ods_client
+from prmods.pipeline.ods_downloader import OdsDownloader
+
+module_logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL_WORKERS = 4
+
+
+def backfill_months(start_month: datetime, end_month: datetime) -> List[datetime]:
+    month = datetime(start_month.year, start_month.month, 1, tzinfo=tzutc())
+    last_month = datetime(end_month.year, end_month.month, 1, tzinfo=tzutc())
+    months = []
+    while month <= last_month:
+        months.append(month)
+        month += relativedelta(months=1)
+    return months
+
+
+class OdsBackfill:
+    """
+    Writes organisation metadata for a range of months from a single crawl of the ODS
+    Portal. Each month reads its own ASID lookup, with the usual fallback to the month
+    before, and records it in its own output metadata.
+    """
+
+    def __init__(self, config: OdsPortalConfig):
+        if config.backfill_start_month is None or config.backfill_end_month is None:
+            raise MissingEnvironmentVariable(
+                "Expected BACKFILL_START_MONTH and BACKFILL_END_MONTH to be set, exiting..."
+            )
+        # Each month would run its own SQS crawl instead of sharing a single ODS Portal crawl
+        if config.sicbl_crawl_queue_url is not None:
+            raise InvalidEnvironmentVariableValue(
+                "SICBL_CRAWL_QUEUE_URL cannot be used with ods-portal-backfill, exiting..."
+            )
+        self._config = config
+        self._resources = ExitStack()
+        self._ods_data_source = MemoizingOdsDataSource(
+            OdsPortalDataFetcher(create_ods_client(config, resources=self._resources))
+        )
+        self._months = backfill_months(config.backfill_start_month, config.backfill_end_month)
+        self._downloaders = [
+            OdsDownloader(replace(config, date_anchor=month), ods_data_source=self._ods_data_source)
+            for month in self._months
+        ]
+
+    def _max_workers(self) -> int:
+        # Each month's delta reads the previous month's output, so months must run in order
+        if self._config.write_metadata_delta:
+            return 1
+        return self._config.backfill_workers or DEFAULT_BACKFILL_WORKERS
+
+    def _run_month(self, month: datetime, downloader: OdsDownloader) -> bool:
+        month_label = f"{month.year}-{month.month}"
+        try:
+            downloader.run()
+        except Exception as ex:
+            module_logger.error(
+                f"Failed to backfill {month_label}: {ex}",
+                extra={"event": "BACKFILL_MONTH_FAILED", "month": month_label},
+            )
+            return False
+        module_logger.info(
+            f"Backfilled {month_label}",
+            extra={"event": "BACKFILL_MONTH_COMPLETED", "month": month_label},
+        )
+        return True
+
+    def run(self):
+        module_logger.info(
+            f"Crawling ODS once for {len(self._months)} months",
+            extra={"event": "BACKFILL_ODS_CRAWL_STARTED", "month_count": len(self._months)},
+        )
+        with self._resources:
+            self._ods_data_source.crawl(
+                show_prison_practices_toggle=self._config.show_prison_practices_toggle
+            )
+            with ThreadPoolExecutor(max_workers=self._max_workers()) as executor:
+                results = list(executor.map(self._run_month, self._months, self._downloaders))
+        if not all(results):
+            raise RuntimeError(f"Failed to backfill {results.count(False)} months")
+
+
+def main():
+    config = {}
+    queued_logging = None
+    try:
+        config = OdsPortalConfig.from_environment_variables(environ)
+        queued_logging = setup_logger(config)
+        OdsBackfill(config).run()
+    except Exception as ex:
+        if not logger.handlers:
+            setup_logger()
+        logger.error(str(ex), extra={"event": "FAILED_TO_RUN_BACKFILL", "config": config.__str__()})
+        sys.exit("Failed to run backfill, exiting...")
+    finally:
+        if queued_logging is not None:
+            queued_logging.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
+import json
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-
-from dateutil.parser import isoparse
+from typing import List, Optional
 
 from prmods.domain.ods_portal.ods_portal_client import ODS_PORTAL_SEARCH_URL
+from prmods.utils.io.compression import validate_content_encoding
+from prmods.utils.io.log_queue import BLOCK, validate_overflow_policy
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,14 @@ class EnvConfig:
     def read_optional_str(self, name: str, default: Optional[str] = None) -> str:
         return self._read_env(name, optional=True, default=default)
 
+    def read_optional_content_encoding(self, name: str) -> Optional[str]:
+        return self._read_env(name, optional=True, converter=validate_content_encoding)
+
+    def read_optional_log_queue_overflow_policy(self, name: str) -> str:
+        return self._read_env(
+            name, optional=True, default=BLOCK, converter=validate_overflow_policy
+        )
+
     def read_optional_int(self, name: str) -> Optional[int]:
         return self._read_env(name, optional=True, converter=int)
 
@@ -59,11 +68,41 @@ class EnvConfig:
             name, optional=True, default=default, converter=self._bool_string_converter
         )
 
+    @staticmethod
+    def _output_destinations_converter(string: str) -> List["OutputDestination"]:
+        try:
+            return [
+                OutputDestination(
+                    bucket=destination["bucket"],
+                    s3_endpoint_url=destination.get("s3_endpoint_url"),
+                )
+                for destination in json.loads(string)
+            ]
+        except (KeyError, TypeError, AttributeError):
+            raise ValueError(f"Invalid output destinations: {string}")
+
+    def read_optional_output_destinations(self, name: str) -> List["OutputDestination"]:
+        return self._read_env(
+            name, optional=True, default=[], converter=self._output_destinations_converter
+        )
+
     def read_int(self, name: str) -> int:
         return self._read_env(name, optional=False, converter=int)
 
+    @staticmethod
+    def _datetime_converter(string: str) -> datetime:
+        from dateutil.parser import isoparse
+
+        return isoparse(string)
+
     def read_optional_datetime(self, name: str) -> datetime:
-        return self._read_env(name, optional=True, converter=isoparse)
+        return self._read_env(name, optional=True, converter=self._datetime_converter)
+
+
+@dataclass(frozen=True)
+class OutputDestination:
+    bucket: str
+    s3_endpoint_url: Optional[str] = None
 
 
 @dataclass
@@ -75,6 +114,59 @@ class OdsPortalConfig:
     search_url: Optional[str]
     show_prison_practices_toggle: Optional[bool]
     s3_endpoint_url: Optional[str] = None
+    output_compression: Optional[str] = None
+    write_uncompressed_output: bool = True
+    write_parquet_output: bool = False
+    write_metadata_delta: bool = False
+    write_sicbl_shards: bool = False
+    shard_write_workers: Optional[int] = None
+    aggregate_observability_events: bool = False
+    observability_sample_size: Optional[int] = None
+    write_observability_events_file: bool = False
+    backfill_start_month: Optional[datetime] = None
+    backfill_end_month: Optional[datetime] = None
+    backfill_workers: Optional[int] = None
+    output_destinations: List[OutputDestination] = field(default_factory=list)
+    run_id: Optional[str] = None
+    checkpoint_location: Optional[str] = None
+    profiling_enabled: bool = False
+    profiling_tracemalloc: bool = False
+    profiling_output: Optional[str] = None
+    metrics_namespace: Optional[str] = None
+    stage_workers: Optional[int] = None
+    write_ods_snapshot: bool = False
+    replay_ods_snapshot: bool = False
+    ods_snapshot_id: Optional[str] = None
+    ods_cache_memory_entries: Optional[int] = None
+    ods_cache_memory_ttl_seconds: Optional[int] = None
+    ods_cache_directory: Optional[str] = None
+    ods_cache_disk_entries: Optional[int] = None
+    ods_cache_disk_ttl_seconds: Optional[int] = None
+    ods_cache_s3_prefix: Optional[str] = None
+    ods_cache_s3_entries: Optional[int] = None
+    ods_cache_s3_ttl_seconds: Optional[int] = None
+    sicbl_crawl_queue_url: Optional[str] = None
+    sqs_endpoint_url: Optional[str] = None
+    sicbl_crawl_workers: Optional[int] = None
+    sicbl_crawl_timeout_seconds: Optional[int] = None
+    sicbl_crawl_idle_polls: Optional[int] = None
+    asid_lookup_parse_workers: Optional[int] = None
+    streaming_pipeline: bool = False
+    hedge_ods_requests: bool = False
+    hedge_percentile: Optional[int] = None
+    hedge_max_percent: Optional[int] = None
+    adaptive_ods_concurrency: bool = False
+    ods_max_concurrency: Optional[int] = None
+    async_logging: bool = False
+    log_queue_size: Optional[int] = None
+    log_queue_overflow_policy: str = BLOCK
+
+    def __post_init__(self):
+        if self.write_observability_events_file and not self.aggregate_observability_events:
+            raise InvalidEnvironmentVariableValue(
+                "Expected environment variable AGGREGATE_OBSERVABILITY_EVENTS to be set with "
+                "WRITE_OBSERVABILITY_EVENTS_FILE, exiting..."
+            )
 
     def __str__(self):
         return str(self.__dict__)
@@ -93,4 +185,60 @@ class OdsPortalConfig:
                 "SHOW_PRISON_PRACTICES_TOGGLE", default=True
             ),
             s3_endpoint_url=env.read_optional_str("S3_ENDPOINT_URL"),
+            output_compression=env.read_optional_content_encoding("OUTPUT_COMPRESSION"),
+            write_uncompressed_output=env.read_optional_bool(
+                "WRITE_UNCOMPRESSED_OUTPUT", default=True
+            ),
+            write_parquet_output=env.read_optional_bool("WRITE_PARQUET_OUTPUT", default=False),
+            write_metadata_delta=env.read_optional_bool("WRITE_METADATA_DELTA", default=False),
+            write_sicbl_shards=env.read_optional_bool("WRITE_SICBL_SHARDS", default=False),
+            shard_write_workers=env.read_optional_int("SHARD_WRITE_WORKERS"),
+            aggregate_observability_events=env.read_optional_bool(
+                "AGGREGATE_OBSERVABILITY_EVENTS", default=False
+            ),
+            observability_sample_size=env.read_optional_int("OBSERVABILITY_SAMPLE_SIZE"),
+            write_observability_events_file=env.read_optional_bool(
+                "WRITE_OBSERVABILITY_EVENTS_FILE", default=False
+            ),
+            backfill_start_month=env.read_optional_datetime("BACKFILL_START_MONTH"),
+            backfill_end_month=env.read_optional_datetime("BACKFILL_END_MONTH"),
+            backfill_workers=env.read_optional_int("BACKFILL_WORKERS"),
+            output_destinations=env.read_optional_output_destinations("OUTPUT_DESTINATIONS"),
+            run_id=env.read_optional_str("RUN_ID"),
+            checkpoint_location=env.read_optional_str("CHECKPOINT_LOCATION"),
+            profiling_enabled=env.read_optional_bool("PROFILING_ENABLED", default=False),
+            profiling_tracemalloc=env.read_optional_bool("PROFILING_TRACEMALLOC", default=False),
+            profiling_output=env.read_optional_str("PROFILING_OUTPUT"),
+            metrics_namespace=env.read_optional_str("METRICS_NAMESPACE"),
+            stage_workers=env.read_optional_int("STAGE_WORKERS"),
+            write_ods_snapshot=env.read_optional_bool("WRITE_ODS_SNAPSHOT", default=False),
+            replay_ods_snapshot=env.read_optional_bool("REPLAY_ODS_SNAPSHOT", default=False),
+            ods_snapshot_id=env.read_optional_str("ODS_SNAPSHOT_ID"),
+            ods_cache_memory_entries=env.read_optional_int("ODS_CACHE_MEMORY_ENTRIES"),
+            ods_cache_memory_ttl_seconds=env.read_optional_int("ODS_CACHE_MEMORY_TTL_SECONDS"),
+            ods_cache_directory=env.read_optional_str("ODS_CACHE_DIRECTORY"),
+            ods_cache_disk_entries=env.read_optional_int("ODS_CACHE_DISK_ENTRIES"),
+            ods_cache_disk_ttl_seconds=env.read_optional_int("ODS_CACHE_DISK_TTL_SECONDS"),
+            ods_cache_s3_prefix=env.read_optional_str("ODS_CACHE_S3_PREFIX"),
+            ods_cache_s3_entries=env.read_optional_int("ODS_CACHE_S3_ENTRIES"),
+            ods_cache_s3_ttl_seconds=env.read_optional_int("ODS_CACHE_S3_TTL_SECONDS"),
+            sicbl_crawl_queue_url=env.read_optional_str("SICBL_CRAWL_QUEUE_URL"),
+            sqs_endpoint_url=env.read_optional_str("SQS_ENDPOINT_URL"),
+            sicbl_crawl_workers=env.read_optional_int("SICBL_CRAWL_WORKERS"),
+            sicbl_crawl_timeout_seconds=env.read_optional_int("SICBL_CRAWL_TIMEOUT_SECONDS"),
+            sicbl_crawl_idle_polls=env.read_optional_int("SICBL_CRAWL_IDLE_POLLS"),
+            asid_lookup_parse_workers=env.read_optional_int("ASID_LOOKUP_PARSE_WORKERS"),
+            streaming_pipeline=env.read_optional_bool("STREAMING_PIPELINE", default=False),
+            hedge_ods_requests=env.read_optional_bool("HEDGE_ODS_REQUESTS", default=False),
+            hedge_percentile=env.read_optional_int("HEDGE_PERCENTILE"),
+            hedge_max_percent=env.read_optional_int("HEDGE_MAX_PERCENT"),
+            adaptive_ods_concurrency=env.read_optional_bool(
+                "ADAPTIVE_ODS_CONCURRENCY", default=False
+            ),
+            ods_max_concurrency=env.read_optional_int("ODS_MAX_CONCURRENCY"),
+            async_logging=env.read_optional_bool("ASYNC_LOGGING", default=False),
+            log_queue_size=env.read_optional_int("LOG_QUEUE_SIZE"),
+            log_queue_overflow_policy=env.read_optional_log_queue_overflow_policy(
+                "LOG_QUEUE_OVERFLOW_POLICY"
+            ),
         )
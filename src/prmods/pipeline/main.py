@@ -1,31 +1,64 @@
 import logging
 import sys
 from os import environ
+from typing import Optional
 
 from prmods.pipeline.config import OdsPortalConfig
 from prmods.pipeline.ods_downloader import OdsDownloader
+from prmods.pipeline.profiling import create_run_profiler
+from prmods.pipeline.streaming_downloader import StreamingOdsDownloader
 from prmods.utils.io.json_formatter import JsonFormatter
+from prmods.utils.io.log_queue import DEFAULT_LOG_QUEUE_SIZE, QueuedLogging
 
 logger = logging.getLogger("prmods")
 
 
-def _setup_logger():
+def setup_logger(config: Optional[OdsPortalConfig] = None) -> Optional[QueuedLogging]:
+    """
+    Without a config, for example when the config is invalid, records are written
+    synchronously.
+    """
     logger.setLevel(logging.INFO)
-    formatter = JsonFormatter()
     handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    handler.setFormatter(JsonFormatter())
+    if config is None or not config.async_logging:
+        logger.addHandler(handler)
+        return None
+    queued_logging = QueuedLogging(
+        logger,
+        handler,
+        max_size=config.log_queue_size or DEFAULT_LOG_QUEUE_SIZE,
+        overflow_policy=config.log_queue_overflow_policy,
+    )
+    queued_logging.start()
+    return queued_logging
+
+
+def _run(config: OdsPortalConfig):
+    downloader_class = StreamingOdsDownloader if config.streaming_pipeline else OdsDownloader
+    if not config.profiling_enabled:
+        downloader_class(config).run()
+        return
+    profiler = create_run_profiler(config)
+    ods_downloader = downloader_class(config, stage_listeners=[profiler.record_stage_boundary])
+    profiler.profile(ods_downloader.run)
 
 
 def main():
     config = {}
+    queued_logging = None
     try:
-        _setup_logger()
         config = OdsPortalConfig.from_environment_variables(environ)
-        OdsDownloader(config).run()
+        queued_logging = setup_logger(config)
+        _run(config)
     except Exception as ex:
+        if not logger.handlers:
+            setup_logger()
         logger.error(str(ex), extra={"event": "FAILED_TO_RUN_MAIN", "config": config.__str__()})
         sys.exit("Failed to run main, exiting...")
+    finally:
+        if queued_logging is not None:
+            queued_logging.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+from prmods.domain.ods_portal.metadata_encoder import iter_encode_organisation_metadata
+from prmods.domain.ods_portal.metadata_service import OrganisationMetadata
+from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
+from prmods.utils.io.compression import CompressionResult, compress_text_chunks, file_extension
+from prmods.utils.io.s3 import S3DataManager
+
+logger = logging.getLogger(__name__)
+
+CONTENT_HASH_METADATA_KEY = "content-sha256"
+
+
+@dataclass
+class PublishTarget:
+    bucket: str
+    s3_manager: S3DataManager
+    uris: OdsDownloaderS3UriResolver
+
+
+class _SerialisedOdsMetadata:
+    """
+    Encodes and compresses the organisation metadata at most once, however many
+    targets ask for it.
+    """
+
+    def __init__(self, organisation_metadata: OrganisationMetadata, retain_encoded: bool):
+        self._organisation_metadata = organisation_metadata
+        self._retain_encoded = retain_encoded
+        self._lock = Lock()
+        self._encoded_chunks: Optional[List[str]] = None
+        self._encoded: Optional[str] = None
+        self._compressed: Optional[CompressionResult] = None
+
+    def _chunks(self) -> List[str]:
+        if self._encoded_chunks is None:
+            self._encoded_chunks = list(
+                iter_encode_organisation_metadata(self._organisation_metadata)
+            )
+        return self._encoded_chunks
+
+    def encoded(self) -> str:
+        with self._lock:
+            if self._encoded is None:
+                self._encoded = "".join(self._chunks())
+            return self._encoded
+
+    def compressed(self, content_encoding: str) -> CompressionResult:
+        with self._lock:
+            if self._compressed is None:
+                chunks: Iterable[str] = (
+                    self._chunks()
+                    if self._retain_encoded
+                    else iter_encode_organisation_metadata(self._organisation_metadata)
+                )
+                self._compressed = compress_text_chunks(chunks, content_encoding)
+            return self._compressed
+
+
+class OdsMetadataPublisher:
+    """
+    Uploads the organisation metadata document to every target concurrently, skipping
+    objects whose content hash is unchanged, and reports the outcome for each target.
+    The first target is the primary output bucket.
+    """
+
+    def __init__(
+        self,
+        targets: List[PublishTarget],
+        output_compression: Optional[str] = None,
+        write_uncompressed_output: bool = True,
+    ):
+        self._targets = targets
+        self._output_compression = output_compression
+        self._write_uncompressed_output = write_uncompressed_output
+
+    def _uncompressed_ods_metadata_uri(
+        self, uris: OdsDownloaderS3UriResolver, date_anchor: datetime
+    ) -> Optional[str]:
+        if self._output_compression and not self._write_uncompressed_output:
+            return None
+        return uris.ods_metadata(date_anchor)
+
+    def published_ods_metadata_uri(self, date_anchor: datetime) -> str:
+        uris = self._targets[0].uris
+        if self._output_compression and not self._write_uncompressed_output:
+            return uris.compressed_ods_metadata(
+                date_anchor, file_extension(self._output_compression)
+            )
+        return uris.ods_metadata(date_anchor)
+
+    @staticmethod
+    def _skip_if_unchanged(
+        target: PublishTarget, object_uri: Optional[str], metadata: Dict[str, str]
+    ) -> Optional[str]:
+        if object_uri is None:
+            return None
+        existing_metadata = target.s3_manager.read_object_metadata(object_uri) or {}
+        existing_hash = existing_metadata.get(CONTENT_HASH_METADATA_KEY)
+        if existing_hash != metadata[CONTENT_HASH_METADATA_KEY]:
+            return object_uri
+        logger.info(
+            "Organisation metadata unchanged, skipping upload to: " + object_uri,
+            extra={
+                "event": "METADATA_UNCHANGED_SKIPPED_UPLOAD",
+                "object_uri": object_uri,
+                "content_hash": existing_hash,
+            },
+        )
+        return None
+
+    def _publish_to(
+        self,
+        target: PublishTarget,
+        serialised: _SerialisedOdsMetadata,
+        date_anchor: datetime,
+        metadata: Dict[str, str],
+    ) -> List[str]:
+        uploaded_uris = []
+        if self._output_compression:
+            compressed_uri = self._skip_if_unchanged(
+                target,
+                target.uris.compressed_ods_metadata(
+                    date_anchor, file_extension(self._output_compression)
+                ),
+                metadata,
+            )
+            if compressed_uri:
+                target.s3_manager.write_compressed_json(
+                    compressed_uri, serialised.compressed(self._output_compression), metadata
+                )
+                uploaded_uris.append(compressed_uri)
+        uncompressed_uri = self._skip_if_unchanged(
+            target, self._uncompressed_ods_metadata_uri(target.uris, date_anchor), metadata
+        )
+        if uncompressed_uri:
+            target.s3_manager.write_encoded_json(uncompressed_uri, serialised.encoded(), metadata)
+            uploaded_uris.append(uncompressed_uri)
+        return uploaded_uris
+
+    def _try_publish_to(
+        self,
+        target: PublishTarget,
+        serialised: _SerialisedOdsMetadata,
+        date_anchor: datetime,
+        metadata: Dict[str, str],
+    ) -> bool:
+        try:
+            uploaded_uris = self._publish_to(target, serialised, date_anchor, metadata)
+        except Exception as ex:
+            logger.error(
+                f"Failed to publish organisation metadata to {target.bucket}: {ex}",
+                extra={"event": "ODS_METADATA_PUBLISH_FAILED", "bucket": target.bucket},
+            )
+            return False
+        logger.info(
+            f"Published organisation metadata to {target.bucket}",
+            extra={
+                "event": "ODS_METADATA_PUBLISHED",
+                "bucket": target.bucket,
+                "uploaded_object_uris": uploaded_uris,
+            },
+        )
+        return True
+
+    def publish(
+        self,
+        organisation_metadata: OrganisationMetadata,
+        date_anchor: datetime,
+        metadata: Dict[str, str],
+    ):
+        serialised = _SerialisedOdsMetadata(
+            organisation_metadata,
+            retain_encoded=self._write_uncompressed_output or not self._output_compression,
+        )
+        with ThreadPoolExecutor(max_workers=len(self._targets)) as executor:
+            results = list(
+                executor.map(
+                    lambda target: self._try_publish_to(target, serialised, date_anchor, metadata),
+                    self._targets,
+                )
+            )
+        failed_buckets = [
+            target.bucket for target, published in zip(self._targets, results) if not published
+        ]
+        if failed_buckets:
+            raise RuntimeError(
+                f"Failed to publish organisation metadata to: {', '.join(failed_buckets)}"
+            )
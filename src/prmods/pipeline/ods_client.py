@@ -0,0 +1,122 @@
+from contextlib import ExitStack
+from typing import List, Optional
+
+from prmods.domain.ods_portal.adaptive_concurrency import DEFAULT_MAX_CONCURRENCY
+from prmods.domain.ods_portal.checkpointing_client import CheckpointingOdsPortalClient
+from prmods.domain.ods_portal.hedged_http_client import (
+    DEFAULT_HEDGE_MAX_PERCENT,
+    DEFAULT_HEDGE_PERCENTILE,
+    HedgedHttpClient,
+    HedgedRequestStats,
+    LatencyTracker,
+)
+from prmods.domain.ods_portal.ods_cache import (
+    CacheTier,
+    DiskCacheTier,
+    MemoryCacheTier,
+    OdsCacheStats,
+    S3CacheTier,
+    TieredCacheOdsClient,
+)
+from prmods.domain.ods_portal.ods_portal_client import (
+    ODS_PORTAL_SEARCH_URL,
+    OdsClient,
+    OdsPortalClient,
+)
+from prmods.pipeline.config import MissingEnvironmentVariable, OdsPortalConfig
+from prmods.utils.io.json_store import JsonStore, LocalJsonStore, S3JsonStore
+from prmods.utils.io.s3 import S3_URI_SCHEME, S3DataManager
+from prmods.utils.io.s3_io_stats import S3IoStats
+
+DEFAULT_ODS_CACHE_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_ODS_CACHE_DISK_ENTRIES = 10000
+DEFAULT_ODS_CACHE_S3_ENTRIES = 10000
+# Room in the hedging pool for each request in flight and its hedge
+HEDGE_WORKERS_PER_REQUEST = 2
+
+
+def _create_checkpoint_store(
+    config: OdsPortalConfig, checkpoint_location: str, s3_io_stats: Optional[S3IoStats] = None
+) -> JsonStore:
+    if checkpoint_location.startswith(S3_URI_SCHEME):
+        s3_manager = S3DataManager(endpoint_url=config.s3_endpoint_url, io_stats=s3_io_stats)
+        return S3JsonStore(s3_manager, checkpoint_location)
+    return LocalJsonStore(checkpoint_location)
+
+
+def create_ods_cache_tiers(
+    config: OdsPortalConfig, s3_io_stats: Optional[S3IoStats] = None
+) -> List[CacheTier]:
+    tiers: List[CacheTier] = []
+    if config.ods_cache_memory_entries:
+        tiers.append(
+            MemoryCacheTier(
+                max_entries=config.ods_cache_memory_entries,
+                ttl_seconds=config.ods_cache_memory_ttl_seconds or DEFAULT_ODS_CACHE_TTL_SECONDS,
+            )
+        )
+    if config.ods_cache_directory:
+        tiers.append(
+            DiskCacheTier(
+                config.ods_cache_directory,
+                max_entries=config.ods_cache_disk_entries or DEFAULT_ODS_CACHE_DISK_ENTRIES,
+                ttl_seconds=config.ods_cache_disk_ttl_seconds or DEFAULT_ODS_CACHE_TTL_SECONDS,
+            )
+        )
+    if config.ods_cache_s3_prefix:
+        s3_manager = S3DataManager(endpoint_url=config.s3_endpoint_url, io_stats=s3_io_stats)
+        tiers.append(
+            S3CacheTier(
+                s3_manager,
+                config.ods_cache_s3_prefix,
+                max_entries=config.ods_cache_s3_entries or DEFAULT_ODS_CACHE_S3_ENTRIES,
+                ttl_seconds=config.ods_cache_s3_ttl_seconds or DEFAULT_ODS_CACHE_TTL_SECONDS,
+            )
+        )
+    return tiers
+
+
+def create_ods_portal_client(
+    config: OdsPortalConfig,
+    hedge_stats: Optional[HedgedRequestStats] = None,
+    resources: Optional[ExitStack] = None,
+) -> OdsPortalClient:
+    if not config.hedge_ods_requests:
+        return OdsPortalClient(search_url=config.search_url)
+    max_concurrency = config.ods_max_concurrency or DEFAULT_MAX_CONCURRENCY
+    http_client = HedgedHttpClient(
+        latency_tracker=LatencyTracker(
+            percentile=config.hedge_percentile or DEFAULT_HEDGE_PERCENTILE
+        ),
+        stats=hedge_stats,
+        max_percent=config.hedge_max_percent or DEFAULT_HEDGE_MAX_PERCENT,
+        max_workers=max_concurrency * HEDGE_WORKERS_PER_REQUEST,
+    )
+    if resources is not None:
+        resources.callback(http_client.close)
+    return OdsPortalClient(http_client=http_client, search_url=config.search_url)
+
+
+def create_ods_client(
+    config: OdsPortalConfig,
+    cache_stats: Optional[OdsCacheStats] = None,
+    hedge_stats: Optional[HedgedRequestStats] = None,
+    s3_io_stats: Optional[S3IoStats] = None,
+    resources: Optional[ExitStack] = None,
+) -> OdsClient:
+    ods_client: OdsClient = create_ods_portal_client(config, hedge_stats, resources)
+    cache_tiers = create_ods_cache_tiers(config, s3_io_stats)
+    if cache_tiers:
+        search_url = config.search_url or ODS_PORTAL_SEARCH_URL
+        ods_client = TieredCacheOdsClient(ods_client, cache_tiers, search_url, cache_stats)
+    if not config.checkpoint_location:
+        return ods_client
+    if not config.run_id:
+        raise MissingEnvironmentVariable(
+            "Expected environment variable RUN_ID to be set with CHECKPOINT_LOCATION, exiting..."
+        )
+    return CheckpointingOdsPortalClient(
+        ods_client,
+        _create_checkpoint_store(config, config.checkpoint_location, s3_io_stats),
+        config.run_id,
+    )
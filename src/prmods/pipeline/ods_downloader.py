@@ -1,28 +1,101 @@
 import logging
+from contextlib import ExitStack
 from dataclasses import asdict
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Sized, Tuple
+from uuid import uuid4
 
-import boto3
-from dateutil.relativedelta import relativedelta
-
-from prmods.domain.ods_portal.asid_lookup import AsidLookup
+from prmods.domain.ods_portal.adaptive_concurrency import (
+    DEFAULT_MAX_CONCURRENCY,
+    AdaptiveSicblPracticesFetcher,
+    AimdConcurrencyLimiter,
+)
+from prmods.domain.ods_portal.asid_lookup import AsidLookup, parse_spine_directory_chunks
+from prmods.domain.ods_portal.hedged_http_client import HedgedRequestStats
+from prmods.domain.ods_portal.metadata_delta import compute_metadata_delta
+from prmods.domain.ods_portal.metadata_encoder import content_hash
 from prmods.domain.ods_portal.metadata_service import (
+    DEFAULT_OBSERVABILITY_SAMPLE_SIZE,
+    AggregatingMetadataServiceObservabilityProbe,
     Gp2gpOrganisationMetadataService,
     MetadataServiceObservabilityProbe,
     OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+from prmods.domain.ods_portal.metadata_tables import organisation_metadata_tables
+from prmods.domain.ods_portal.ods_cache import OdsCacheStats
+from prmods.domain.ods_portal.ods_portal_data_fetcher import (
+    OdsDataSource,
+    OdsPortalDataFetcher,
+    OrganisationDetails,
+    OrganisationDetailsCache,
+)
+from prmods.domain.ods_portal.ods_snapshot import OdsSnapshot, ReplayOdsDataSource
+from prmods.pipeline.config import MissingEnvironmentVariable
+from prmods.pipeline.metadata_publisher import (
+    CONTENT_HASH_METADATA_KEY,
+    OdsMetadataPublisher,
+    PublishTarget,
 )
-from prmods.domain.ods_portal.ods_portal_client import OdsPortalClient
-from prmods.domain.ods_portal.ods_portal_data_fetcher import OdsPortalDataFetcher
+from prmods.pipeline.ods_client import create_ods_client
 from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
-from prmods.utils.io.s3 import S3DataManager
+from prmods.pipeline.sicbl_crawl import (
+    DEFAULT_SICBL_CRAWL_TIMEOUT_SECONDS,
+    SicblCrawlCoordinator,
+    create_sicbl_crawl_queue,
+)
+from prmods.pipeline.sicbl_shards import DEFAULT_SHARD_WRITE_WORKERS, SicblShardWriter
+from prmods.pipeline.stage_graph import DEFAULT_STAGE_WORKERS, Stage, StageGraph, StageGraphExecutor
+from prmods.pipeline.stage_spans import DEFAULT_METRICS_NAMESPACE, StageTimer
+from prmods.utils.io.s3 import S3DataManager, S3ObjectNotFound
+from prmods.utils.io.s3_io_stats import S3IoStats
 
 logger = logging.getLogger(__name__)
 
+READ_ASID_LOOKUP_STAGE = "READ_ASID_LOOKUP"
+FETCH_PRACTICES_STAGE = "FETCH_PRACTICES"
+FETCH_SICBLS_STAGE = "FETCH_SICBLS"
+FETCH_SICBL_PRACTICES_STAGE = "FETCH_SICBL_PRACTICES"
+ENRICH_PRACTICES_STAGE = "ENRICH_PRACTICES"
+ALLOCATE_SICBL_PRACTICES_STAGE = "ALLOCATE_SICBL_PRACTICES"
+BUILD_METADATA_STAGE = "BUILD_METADATA"
+WRITE_OUTPUTS_STAGE = "WRITE_OUTPUTS"
+
+
+def _previous_month(date_anchor: datetime) -> datetime:
+    from dateutil.relativedelta import relativedelta
+
+    return date_anchor - relativedelta(months=1)
+
+
+def _sicbl_crawl_id(run_id: Optional[str]) -> str:
+    # Results are keyed by crawl ID, so a rerun must not collect a previous crawl's results
+    if run_id:
+        return f"{run_id}-{uuid4().hex}"
+    return uuid4().hex
+
 
 class OdsDownloader:
-    def __init__(self, config):
-        self._s3_client = boto3.resource("s3", endpoint_url=config.s3_endpoint_url)
-        self._s3_manager = S3DataManager(self._s3_client)
+    def __init__(
+        self,
+        config,
+        ods_data_source: Optional[OdsDataSource] = None,
+        stage_listeners: Sequence[Callable[[str], None]] = (),
+    ):
+        self._stage_listeners = stage_listeners
+        # Closed at the end of the run, such as the pool that sends hedged ODS requests
+        self._resources = ExitStack()
+        self._stage_executor = StageGraphExecutor(
+            max_workers=config.stage_workers or DEFAULT_STAGE_WORKERS
+        )
+        self._stage_timer = StageTimer(
+            namespace=config.metrics_namespace or DEFAULT_METRICS_NAMESPACE
+        )
+        self._s3_io_stats = S3IoStats()
+        self._s3_manager = S3DataManager(
+            endpoint_url=config.s3_endpoint_url, io_stats=self._s3_io_stats
+        )
 
         self._config = config
         self._uris = OdsDownloaderS3UriResolver(
@@ -30,18 +103,126 @@ class OdsDownloader:
             ods_metadata_bucket=self._config.output_bucket,
         )
 
-        ods_client = OdsPortalClient(search_url=self._config.search_url)
-        ods_data_fetcher = OdsPortalDataFetcher(ods_client=ods_client)
-        probe = MetadataServiceObservabilityProbe()
+        self._publisher = OdsMetadataPublisher(
+            self._create_publish_targets(),
+            output_compression=self._config.output_compression,
+            write_uncompressed_output=self._config.write_uncompressed_output,
+        )
+
+        self._sicbl_shard_writer = SicblShardWriter(
+            self._s3_manager,
+            self._uris,
+            max_workers=self._config.shard_write_workers or DEFAULT_SHARD_WRITE_WORKERS,
+        )
+
+        self._organisation_cache: Optional[OrganisationDetailsCache] = None
+        self._ods_cache_stats = OdsCacheStats()
+        self._hedged_request_stats = HedgedRequestStats()
+        if ods_data_source is None:
+            ods_data_fetcher = self._create_ods_data_fetcher()
+            self._organisation_cache = ods_data_fetcher.organisation_cache
+            ods_data_source = ods_data_fetcher
+        self._ods_data_source = ods_data_source
+        self._probe = self._create_observability_probe()
         self._metadata_service = Gp2gpOrganisationMetadataService(
-            data_fetcher=ods_data_fetcher, observability_probe=probe
+            data_fetcher=ods_data_source, observability_probe=self._probe
         )
 
+        self._fetch_sicbl_practices = self._create_sicbl_practices_fetcher()
+
         self._output_metadata = {
             "date-anchor": self._config.date_anchor.isoformat(),
             "build-tag": self._config.build_tag,
         }
 
+    def _ods_snapshot(self, snapshot_id: str) -> OdsSnapshot:
+        snapshot_uri = self._uris.ods_snapshot(self._config.date_anchor, snapshot_id)
+        logger.info(
+            f"Using ODS snapshot {snapshot_id}",
+            extra={
+                "event": "USING_ODS_SNAPSHOT",
+                "snapshot_id": snapshot_id,
+                "snapshot_uri": snapshot_uri,
+                "replay": self._config.replay_ods_snapshot,
+            },
+        )
+        return OdsSnapshot(self._s3_manager, snapshot_uri)
+
+    def _create_ods_data_fetcher(self) -> OdsPortalDataFetcher:
+        if self._config.replay_ods_snapshot:
+            if not self._config.ods_snapshot_id:
+                raise MissingEnvironmentVariable(
+                    "Expected environment variable ODS_SNAPSHOT_ID to be set with "
+                    "REPLAY_ODS_SNAPSHOT, exiting..."
+                )
+            return ReplayOdsDataSource(self._ods_snapshot(self._config.ods_snapshot_id))
+        snapshot = None
+        if self._config.write_ods_snapshot:
+            snapshot = self._ods_snapshot(
+                self._config.ods_snapshot_id
+                or self._config.run_id
+                or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            )
+        return OdsPortalDataFetcher(
+            ods_client=create_ods_client(
+                self._config,
+                self._ods_cache_stats,
+                self._hedged_request_stats,
+                self._s3_io_stats,
+                self._resources,
+            ),
+            snapshot=snapshot,
+        )
+
+    def _create_sicbl_practices_fetcher(
+        self,
+    ) -> Callable[[List[OrganisationDetails]], Dict[str, List[OrganisationDetails]]]:
+        if self._config.sicbl_crawl_queue_url:
+            return self._create_sicbl_crawl_coordinator().fetch_sicbl_practices
+        if self._config.adaptive_ods_concurrency:
+            max_concurrency = self._config.ods_max_concurrency or DEFAULT_MAX_CONCURRENCY
+            adaptive_fetcher = AdaptiveSicblPracticesFetcher(
+                self._ods_data_source,
+                AimdConcurrencyLimiter(max_limit=max_concurrency),
+                max_workers=max_concurrency,
+            )
+            return adaptive_fetcher.fetch_sicbl_practices
+        return self._metadata_service.fetch_sicbl_practices
+
+    def _create_sicbl_crawl_coordinator(self) -> SicblCrawlCoordinator:
+        return SicblCrawlCoordinator(
+            create_sicbl_crawl_queue(self._config),
+            self._s3_manager,
+            self._uris,
+            self._config.date_anchor,
+            crawl_id=_sicbl_crawl_id(self._config.run_id),
+            timeout_seconds=(
+                self._config.sicbl_crawl_timeout_seconds or DEFAULT_SICBL_CRAWL_TIMEOUT_SECONDS
+            ),
+        )
+
+    def _create_publish_targets(self) -> List[PublishTarget]:
+        targets = [PublishTarget(self._config.output_bucket, self._s3_manager, self._uris)]
+        for destination in self._config.output_destinations:
+            s3_manager = S3DataManager(
+                endpoint_url=destination.s3_endpoint_url or self._config.s3_endpoint_url,
+                io_stats=self._s3_io_stats,
+            )
+            uris = OdsDownloaderS3UriResolver(
+                asid_lookup_bucket=self._config.mapping_bucket,
+                ods_metadata_bucket=destination.bucket,
+            )
+            targets.append(PublishTarget(destination.bucket, s3_manager, uris))
+        return targets
+
+    def _create_observability_probe(self) -> MetadataServiceObservabilityProbe:
+        if not self._config.aggregate_observability_events:
+            return MetadataServiceObservabilityProbe()
+        return AggregatingMetadataServiceObservabilityProbe(
+            sample_size=self._config.observability_sample_size or DEFAULT_OBSERVABILITY_SAMPLE_SIZE,
+            retain_all_ods_codes=self._config.write_observability_events_file,
+        )
+
     def _add_asid_lookup_month_to_metadata(self, asid_lookup_datetime: datetime):
         self._output_metadata[
             "asid-lookup-month"
@@ -49,16 +230,21 @@ class OdsDownloader:
 
     def _read_asid_lookup(self, date_anchor: datetime) -> AsidLookup:
         asid_lookup_s3_path = self._uris.asid_lookup(date_anchor)
+        if self._config.asid_lookup_parse_workers:
+            return parse_spine_directory_chunks(
+                self._s3_manager.read_gzip_text_chunks(asid_lookup_s3_path),
+                max_workers=self._config.asid_lookup_parse_workers,
+            )
         raw_asid_lookup = self._s3_manager.read_gzip_csv(asid_lookup_s3_path)
         return AsidLookup.from_spine_directory_format(raw_asid_lookup)
 
     def _read_previous_month_asid_lookup(self):
-        previous_month_datetime = self._config.date_anchor - relativedelta(months=1)
+        previous_month_datetime = _previous_month(self._config.date_anchor)
         self._add_asid_lookup_month_to_metadata(previous_month_datetime)
 
         try:
             return self._read_asid_lookup(previous_month_datetime)
-        except self._s3_client.meta.client.exceptions.NoSuchKey:
+        except S3ObjectNotFound:
             logger.error(
                 "ASID lookup files not found for both current and previous month, exiting...",
                 extra={
@@ -80,28 +266,145 @@ class OdsDownloader:
             self._add_asid_lookup_month_to_metadata(self._config.date_anchor)
             return self._read_asid_lookup(self._config.date_anchor)
 
-        except self._s3_client.meta.client.exceptions.NoSuchKey:
+        except S3ObjectNotFound:
             return self._read_previous_month_asid_lookup()
 
     def _write_ods_metadata(self, organisation_metadata: OrganisationMetadata):
-        metadata_output_s3_path = self._uris.ods_metadata(self._config.date_anchor)
-        self._s3_manager.write_json(
-            metadata_output_s3_path, asdict(organisation_metadata), self._output_metadata
-        )
+        metadata = {
+            **self._output_metadata,
+            CONTENT_HASH_METADATA_KEY: content_hash(organisation_metadata),
+        }
+        self._publisher.publish(organisation_metadata, self._config.date_anchor, metadata)
 
-    def run(self):
-        asid_lookup = self._read_most_recent_asid_lookup()
-        practice_metadata = self._metadata_service.retrieve_practices_with_asids(
-            asid_lookup=asid_lookup,
-            show_prison_practices_toggle=self._config.show_prison_practices_toggle,
+    def _write_ods_metadata_tables(self, organisation_metadata: OrganisationMetadata):
+        tables = organisation_metadata_tables(organisation_metadata)
+        for table_name, columns in tables.items():
+            table_s3_path = self._uris.ods_metadata_table(self._config.date_anchor, table_name)
+            self._s3_manager.write_parquet(table_s3_path, columns, self._output_metadata)
+
+    def _read_previous_month_ods_metadata(self) -> Optional[OrganisationMetadata]:
+        previous_month_datetime = _previous_month(self._config.date_anchor)
+        previous_metadata_s3_path = self._publisher.published_ods_metadata_uri(
+            previous_month_datetime
         )
-        sicbl_metadata = self._metadata_service.retrieve_sicbl_practice_allocations(
-            canonical_practice_list=practice_metadata
+        try:
+            return OrganisationMetadata.from_dict(
+                self._s3_manager.read_json(previous_metadata_s3_path)
+            )
+        except S3ObjectNotFound:
+            logger.warning(
+                "Previous month organisation metadata not found, skipping delta",
+                extra={
+                    "event": "PREVIOUS_MONTH_METADATA_NOT_FOUND",
+                    "object_uri": previous_metadata_s3_path,
+                },
+            )
+            return None
+
+    def _write_ods_metadata_delta(self, organisation_metadata: OrganisationMetadata):
+        previous_metadata = self._read_previous_month_ods_metadata()
+        if previous_metadata is None:
+            return
+        delta = compute_metadata_delta(previous_metadata, organisation_metadata)
+        delta_s3_path = self._uris.ods_metadata_delta(self._config.date_anchor)
+        self._s3_manager.write_json(delta_s3_path, asdict(delta), self._output_metadata)
+
+    def _write_observability_events(self):
+        if not isinstance(self._probe, AggregatingMetadataServiceObservabilityProbe):
+            return
+        observability_events_s3_path = self._uris.observability_events(self._config.date_anchor)
+        self._s3_manager.write_json(
+            observability_events_s3_path, self._probe.all_ods_codes(), self._output_metadata
         )
-        organisation_metadata = OrganisationMetadata.from_practice_and_sicbl_lists(
+
+    def _write_outputs(self, organisation_metadata: OrganisationMetadata):
+        self._write_ods_metadata(organisation_metadata)
+        if self._config.write_parquet_output:
+            self._write_ods_metadata_tables(organisation_metadata)
+        if self._config.write_metadata_delta:
+            self._write_ods_metadata_delta(organisation_metadata)
+        if self._config.write_sicbl_shards:
+            self._sicbl_shard_writer.write(
+                organisation_metadata, self._config.date_anchor, self._output_metadata
+            )
+        if self._config.write_observability_events_file:
+            self._write_observability_events()
+
+    def _timed_stage(self, name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+        def run_stage(*inputs):
+            with self._stage_timer.span(name) as stage_span:
+                result = function(*inputs)
+                stage_span.item_count = len(result) if isinstance(result, Sized) else 0
+            for listener in self._stage_listeners:
+                listener(name)
+            return result
+
+        return run_stage
+
+    def _build_organisation_metadata(
+        self, practice_metadata: List[PracticeDetails], sicbl_metadata: List[SicblDetails]
+    ) -> OrganisationMetadata:
+        return OrganisationMetadata.from_practice_and_sicbl_lists(
             practice_metadata,
             sicbl_metadata,
             self._config.date_anchor.year,
             self._config.date_anchor.month,
         )
-        self._write_ods_metadata(organisation_metadata)
+
+    def _stage_graph(self) -> StageGraph:
+        service = self._metadata_service
+        stages: List[Tuple[str, Callable[..., Any], Tuple[str, ...]]] = [
+            (READ_ASID_LOOKUP_STAGE, self._read_most_recent_asid_lookup, ()),
+            (
+                FETCH_PRACTICES_STAGE,
+                lambda: service.fetch_unique_practices(self._config.show_prison_practices_toggle),
+                (),
+            ),
+            (FETCH_SICBLS_STAGE, service.fetch_unique_sicbls, ()),
+            (FETCH_SICBL_PRACTICES_STAGE, self._fetch_sicbl_practices, (FETCH_SICBLS_STAGE,)),
+            (
+                ENRICH_PRACTICES_STAGE,
+                service.enrich_practices_with_asids,
+                (FETCH_PRACTICES_STAGE, READ_ASID_LOOKUP_STAGE),
+            ),
+            (
+                ALLOCATE_SICBL_PRACTICES_STAGE,
+                service.allocate_sicbl_practices,
+                (FETCH_SICBLS_STAGE, FETCH_SICBL_PRACTICES_STAGE, ENRICH_PRACTICES_STAGE),
+            ),
+            (
+                BUILD_METADATA_STAGE,
+                self._build_organisation_metadata,
+                (ENRICH_PRACTICES_STAGE, ALLOCATE_SICBL_PRACTICES_STAGE),
+            ),
+            (WRITE_OUTPUTS_STAGE, self._write_outputs, (BUILD_METADATA_STAGE,)),
+        ]
+        return StageGraph(
+            Stage(name, self._timed_stage(name, function), inputs)
+            for name, function, inputs in stages
+        )
+
+    def _record_ods_fetch_stats(self):
+        if self._organisation_cache is not None:
+            self._probe.record_organisation_details_dedup(
+                self._organisation_cache.requested_count,
+                self._organisation_cache.created_count,
+            )
+        ods_cache_hit_rates = self._ods_cache_stats.hit_rates()
+        if ods_cache_hit_rates:
+            self._probe.record_ods_cache_hit_rates(ods_cache_hit_rates)
+        if self._config.hedge_ods_requests:
+            self._probe.record_hedged_requests(
+                self._hedged_request_stats.requests_sent,
+                self._hedged_request_stats.hedges_fired,
+                self._hedged_request_stats.hedges_won,
+            )
+
+    def run(self):
+        try:
+            self._stage_executor.run(self._stage_graph())
+            self._record_ods_fetch_stats()
+        finally:
+            self._resources.close()
+            self._stage_timer.log_summary()
+            self._s3_io_stats.log_summary()
@@ -0,0 +1,150 @@
+import cProfile
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from prmods.pipeline.config import MissingEnvironmentVariable, OdsPortalConfig
+from prmods.utils.io.s3 import S3_URI_SCHEME, S3DataManager
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_TOP_ALLOCATIONS = 25
+PSTATS_ARTIFACT_NAME = "ods-downloader.pstats"
+
+
+def _format_allocation_report(stage: str, snapshot: tracemalloc.Snapshot, limit: int) -> str:
+    current_size, peak_size = tracemalloc.get_traced_memory()
+    lines = [
+        f"Top {limit} allocations after stage {stage}",
+        f"Traced memory: current {current_size / 1024:.1f} KiB, peak {peak_size / 1024:.1f} KiB",
+        "",
+    ]
+    for statistic in snapshot.statistics("lineno")[:limit]:
+        lines.append(str(statistic))
+    return "\n".join(lines) + "\n"
+
+
+class RunProfiler:
+    """
+    Profiles a run with cProfile and, optionally, tracemalloc snapshots taken at each
+    stage boundary. The artifacts are written to a local directory or an S3 prefix,
+    in a folder named after the time the run started.
+
+    cProfile only sees the thread that enabled it, so each thread started during the
+    run, such as a stage graph worker, gets its own profiler and the stats of all of
+    them are merged into the one pstats file.
+    """
+
+    def __init__(
+        self,
+        output_location: str,
+        trace_memory: bool = False,
+        top_allocations: int = DEFAULT_TOP_ALLOCATIONS,
+        s3_manager: Optional[S3DataManager] = None,
+    ):
+        started_at = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self._output_location = f"{output_location.rstrip('/')}/{started_at}"
+        self._trace_memory = trace_memory
+        self._top_allocations = top_allocations
+        self._s3_manager = s3_manager or S3DataManager()
+        self._allocation_reports: List[Tuple[str, str]] = []
+        self._thread_profilers_lock = threading.Lock()
+        self._thread_profilers: List[cProfile.Profile] = []
+
+    def _profile_thread(self, frame, event, arg):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # From Python 3.12 the run's profiler already sees every thread
+            sys.setprofile(None)
+            return
+        with self._thread_profilers_lock:
+            self._thread_profilers.append(profiler)
+
+    def record_stage_boundary(self, stage: str):
+        if not self._trace_memory:
+            return
+        snapshot = tracemalloc.take_snapshot()
+        report_name = f"tracemalloc-{len(self._allocation_reports) + 1:02d}-{stage}.txt"
+        self._allocation_reports.append(
+            (report_name, _format_allocation_report(stage, snapshot, self._top_allocations))
+        )
+
+    def profile(self, function: Callable[[], T]) -> T:
+        if self._trace_memory:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        threading.setprofile(self._profile_thread)
+        profiler.enable()
+        try:
+            return function()
+        finally:
+            profiler.disable()
+            threading.setprofile(None)  # type: ignore[arg-type]
+            if self._trace_memory:
+                tracemalloc.stop()
+            self._write_artifacts(profiler)
+
+    def _write_artifact(self, name: str, body: bytes, content_type: str) -> str:
+        location = f"{self._output_location}/{name}"
+        if location.startswith(S3_URI_SCHEME):
+            self._s3_manager.write_bytes(location, body, content_type, {})
+        else:
+            path = Path(location)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+        return location
+
+    def _merged_stats(self, profiler: cProfile.Profile) -> pstats.Stats:
+        stats = pstats.Stats(profiler)
+        with self._thread_profilers_lock:
+            thread_profilers = list(self._thread_profilers)
+        for thread_profiler in thread_profilers:
+            thread_profiler.create_stats()
+            if thread_profiler.stats:  # type: ignore[attr-defined]
+                stats.add(thread_profiler)
+        return stats
+
+    def _write_artifacts(self, profiler: cProfile.Profile):
+        stats = self._merged_stats(profiler)
+        artifacts = [
+            self._write_artifact(
+                PSTATS_ARTIFACT_NAME,
+                marshal.dumps(stats.stats),  # type: ignore[attr-defined]
+                "application/octet-stream",
+            )
+        ]
+        for report_name, report in self._allocation_reports:
+            artifacts.append(
+                self._write_artifact(report_name, report.encode("utf-8"), "text/plain")
+            )
+        logger.info(
+            "Profiling artifacts written to: " + self._output_location,
+            extra={
+                "event": "PROFILING_ARTIFACTS_WRITTEN",
+                "location": self._output_location,
+                "artifacts": artifacts,
+            },
+        )
+
+
+def create_run_profiler(config: OdsPortalConfig) -> RunProfiler:
+    if not config.profiling_output:
+        raise MissingEnvironmentVariable(
+            "Expected environment variable PROFILING_OUTPUT to be set with PROFILING_ENABLED, "
+            "exiting..."
+        )
+    return RunProfiler(
+        config.profiling_output,
+        trace_memory=config.profiling_tracemalloc,
+        s3_manager=S3DataManager(endpoint_url=config.s3_endpoint_url),
+    )
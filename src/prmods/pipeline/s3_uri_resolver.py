@@ -3,8 +3,18 @@ from datetime import datetime
 
 class OdsDownloaderS3UriResolver:
     _ORG_METADATA_VERSION = "v5"
+    # Intermediate objects live outside the published version prefix, so writing them
+    # does not notify consumers of the output bucket
+    _STAGING_DIRECTORY = "staging"
     _ORG_METADATA_FILE_NAME = "organisationMetadata.json"
+    _ORG_METADATA_DELTA_FILE_NAME = "organisationMetadataDelta.json"
+    _OBSERVABILITY_EVENTS_FILE_NAME = "observabilityEvents.json"
     _ASID_LOOKUP_FILE_NAME = "asidLookup.csv.gz"
+    _ORG_METADATA_TABLES_DIRECTORY = "tables"
+    _SICBL_SHARDS_DIRECTORY = "sicbls"
+    _SICBL_SHARD_INDEX_FILE_NAME = "index.json"
+    _ODS_SNAPSHOTS_DIRECTORY = "odsSnapshots"
+    _SICBL_CRAWL_DIRECTORY = "sicblCrawl"
 
     def __init__(self, asid_lookup_bucket: str, ods_metadata_bucket):
         self._asid_lookup_bucket = asid_lookup_bucket
@@ -30,3 +40,77 @@ class OdsDownloaderS3UriResolver:
             str(date_anchor.month),
             self._ORG_METADATA_FILE_NAME,
         )
+
+    def compressed_ods_metadata(self, date_anchor: datetime, file_extension: str) -> str:
+        return self.ods_metadata(date_anchor) + file_extension
+
+    def ods_metadata_table(self, date_anchor: datetime, table_name: str) -> str:
+        return self._s3_path(
+            self._ods_metadata_bucket,
+            self._ORG_METADATA_VERSION,
+            str(date_anchor.year),
+            str(date_anchor.month),
+            self._ORG_METADATA_TABLES_DIRECTORY,
+            f"{table_name}.parquet",
+        )
+
+    def ods_metadata_delta(self, date_anchor: datetime) -> str:
+        return self._s3_path(
+            self._ods_metadata_bucket,
+            self._ORG_METADATA_VERSION,
+            str(date_anchor.year),
+            str(date_anchor.month),
+            self._ORG_METADATA_DELTA_FILE_NAME,
+        )
+
+    def sicbl_shard(self, date_anchor: datetime, sicbl_ods_code: str) -> str:
+        return self._s3_path(
+            self._ods_metadata_bucket,
+            self._ORG_METADATA_VERSION,
+            str(date_anchor.year),
+            str(date_anchor.month),
+            self._SICBL_SHARDS_DIRECTORY,
+            f"{sicbl_ods_code}.json",
+        )
+
+    def sicbl_shard_index(self, date_anchor: datetime) -> str:
+        return self._s3_path(
+            self._ods_metadata_bucket,
+            self._ORG_METADATA_VERSION,
+            str(date_anchor.year),
+            str(date_anchor.month),
+            self._SICBL_SHARDS_DIRECTORY,
+            self._SICBL_SHARD_INDEX_FILE_NAME,
+        )
+
+    def observability_events(self, date_anchor: datetime) -> str:
+        return self._s3_path(
+            self._ods_metadata_bucket,
+            self._STAGING_DIRECTORY,
+            str(date_anchor.year),
+            str(date_anchor.month),
+            self._OBSERVABILITY_EVENTS_FILE_NAME,
+        )
+
+    def ods_snapshot(self, date_anchor: datetime, snapshot_id: str) -> str:
+        return self._s3_path(
+            self._ods_metadata_bucket,
+            self._STAGING_DIRECTORY,
+            str(date_anchor.year),
+            str(date_anchor.month),
+            self._ODS_SNAPSHOTS_DIRECTORY,
+            snapshot_id,
+        )
+
+    def sicbl_crawl_results(self, date_anchor: datetime, crawl_id: str) -> str:
+        return self._s3_path(
+            self._ods_metadata_bucket,
+            self._STAGING_DIRECTORY,
+            str(date_anchor.year),
+            str(date_anchor.month),
+            self._SICBL_CRAWL_DIRECTORY,
+            crawl_id,
+        )
+
+    def sicbl_crawl_result(self, date_anchor: datetime, crawl_id: str, sicbl_ods_code: str) -> str:
+        return self.sicbl_crawl_results(date_anchor, crawl_id) + f"/{sicbl_ods_code}.json"
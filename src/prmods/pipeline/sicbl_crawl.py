@@ -0,0 +1,208 @@
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Set
+
+from prmods.domain.ods_portal.ods_portal_data_fetcher import OdsDataSource, OrganisationDetails
+from prmods.pipeline.config import MissingEnvironmentVariable, OdsPortalConfig
+from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
+from prmods.utils.io.s3 import S3DataManager
+from prmods.utils.io.sqs import SQS_MAX_WAIT_SECONDS, SqsJsonQueue
+
+module_logger = logging.getLogger(__name__)
+
+DEFAULT_SICBL_CRAWL_TIMEOUT_SECONDS = 900
+DEFAULT_SICBL_CRAWL_IDLE_POLLS = 3
+SICBL_CRAWL_RESULT_POLL_SECONDS = 2
+
+
+class InvalidSicblCrawlMessage(Exception):
+    pass
+
+
+class SicblCrawlCoordinator:
+    """
+    Enqueues one message per SICBL allocation query and gathers the results that workers
+    write to S3, listing the crawl's prefix on each poll to find the new ones. Results
+    are keyed by crawl ID and SICBL, so a redelivered message overwrites a result with
+    the same practices instead of adding to it.
+    """
+
+    def __init__(
+        self,
+        queue: SqsJsonQueue,
+        s3_manager: S3DataManager,
+        uris: OdsDownloaderS3UriResolver,
+        date_anchor: datetime,
+        crawl_id: str,
+        timeout_seconds: float = DEFAULT_SICBL_CRAWL_TIMEOUT_SECONDS,
+        poll_seconds: float = SICBL_CRAWL_RESULT_POLL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._queue = queue
+        self._s3_manager = s3_manager
+        self._uris = uris
+        self._date_anchor = date_anchor
+        self._crawl_id = crawl_id
+        self._timeout_seconds = timeout_seconds
+        self._poll_seconds = poll_seconds
+        self._clock = clock
+        self._sleep = sleep
+
+    def _result_uri(self, sicbl_ods_code: str) -> str:
+        return self._uris.sicbl_crawl_result(self._date_anchor, self._crawl_id, sicbl_ods_code)
+
+    def enqueue(self, sicbl_ods_codes: List[str]):
+        self._queue.send_all(
+            {
+                "crawl_id": self._crawl_id,
+                "sicbl_ods_code": sicbl_ods_code,
+                "date_anchor": self._date_anchor.isoformat(),
+            }
+            for sicbl_ods_code in sicbl_ods_codes
+        )
+        module_logger.info(
+            f"Enqueued {len(sicbl_ods_codes)} SICBL allocation queries",
+            extra={
+                "event": "SICBL_CRAWL_ENQUEUED",
+                "crawl_id": self._crawl_id,
+                "sicbl_count": len(sicbl_ods_codes),
+            },
+        )
+
+    def _collect_results(
+        self, pending: Set[str], results: Dict[str, List[OrganisationDetails]]
+    ) -> Set[str]:
+        pending_result_uris = {
+            self._result_uri(sicbl_ods_code): sicbl_ods_code for sicbl_ods_code in pending
+        }
+        written_result_uris = self._s3_manager.list_object_uris(
+            self._uris.sicbl_crawl_results(self._date_anchor, self._crawl_id) + "/"
+        )
+        for result_uri in sorted(pending_result_uris.keys() & set(written_result_uris)):
+            practices = self._s3_manager.read_json(result_uri)["practices"]
+            results[pending_result_uris[result_uri]] = [
+                OrganisationDetails(**practice) for practice in practices
+            ]
+        return pending - results.keys()
+
+    def gather(self, sicbl_ods_codes: List[str]) -> Dict[str, List[OrganisationDetails]]:
+        deadline = self._clock() + self._timeout_seconds
+        results: Dict[str, List[OrganisationDetails]] = {}
+        pending = self._collect_results(set(sicbl_ods_codes), results)
+        while pending:
+            if self._clock() > deadline:
+                raise TimeoutError(
+                    f"Timed out waiting for {len(pending)} SICBL crawl results: "
+                    + ", ".join(sorted(pending))
+                )
+            self._sleep(self._poll_seconds)
+            pending = self._collect_results(pending, results)
+        return {sicbl_ods_code: results[sicbl_ods_code] for sicbl_ods_code in sicbl_ods_codes}
+
+    def fetch_sicbl_practices(
+        self, sicbls: Iterable[OrganisationDetails]
+    ) -> Dict[str, List[OrganisationDetails]]:
+        sicbl_ods_codes = list(dict.fromkeys(sicbl.ods_code for sicbl in sicbls))
+        self.enqueue(sicbl_ods_codes)
+        return self.gather(sicbl_ods_codes)
+
+
+class SicblCrawlWorker:
+    """
+    Fetches the practices for each SICBL message on the queue and writes them to the
+    crawl result URI for the message's crawl ID and SICBL. A message is deleted only
+    once its result is written, so a failed query is retried when SQS redelivers it,
+    and a redelivered message whose result already exists is deleted without querying
+    ODS again. A message without a valid crawl ID, SICBL and date anchor can never
+    succeed, so it is logged and deleted. The worker stops after idle_polls empty polls
+    in a row, or never if idle_polls is 0.
+    """
+
+    def __init__(
+        self,
+        queue: SqsJsonQueue,
+        data_source: OdsDataSource,
+        s3_manager: S3DataManager,
+        uris: OdsDownloaderS3UriResolver,
+        idle_polls: int = DEFAULT_SICBL_CRAWL_IDLE_POLLS,
+        wait_seconds: int = SQS_MAX_WAIT_SECONDS,
+    ):
+        self._queue = queue
+        self._data_source = data_source
+        self._s3_manager = s3_manager
+        self._uris = uris
+        self._idle_polls = idle_polls
+        self._wait_seconds = wait_seconds
+
+    def _result_uri(self, message: dict) -> str:
+        try:
+            return self._uris.sicbl_crawl_result(
+                datetime.fromisoformat(message["date_anchor"]),
+                message["crawl_id"],
+                message["sicbl_ods_code"],
+            )
+        except (KeyError, TypeError, ValueError) as ex:
+            raise InvalidSicblCrawlMessage(f"Invalid SICBL crawl message {message}: {ex}") from ex
+
+    def process(self, message: dict):
+        result_uri = self._result_uri(message)
+        sicbl_ods_code = message["sicbl_ods_code"]
+        if self._s3_manager.read_object_metadata(result_uri) is not None:
+            module_logger.info(
+                f"SICBL crawl result already written for {sicbl_ods_code}",
+                extra={
+                    "event": "SICBL_CRAWL_DUPLICATE_SKIPPED",
+                    "crawl_id": message["crawl_id"],
+                    "sicbl_ods_code": sicbl_ods_code,
+                },
+            )
+            return
+        practices = self._data_source.fetch_practices_for_sicbl(sicbl_ods_code)
+        self._s3_manager.write_json(
+            result_uri,
+            {
+                "sicbl_ods_code": sicbl_ods_code,
+                "practices": [asdict(practice) for practice in practices],
+            },
+            {"crawl-id": message["crawl_id"]},
+        )
+
+    def _process_and_delete(self, message: dict, receipt_handle: str):
+        try:
+            self.process(message)
+        except InvalidSicblCrawlMessage as ex:
+            # Redelivering a malformed message cannot succeed, so drop it straight away
+            module_logger.error(
+                str(ex),
+                extra={"event": "SICBL_CRAWL_MESSAGE_INVALID", "sicbl_crawl_message": message},
+            )
+        except Exception as ex:
+            module_logger.error(
+                f"Failed to crawl SICBL {message.get('sicbl_ods_code')}: {ex}",
+                extra={
+                    "event": "SICBL_CRAWL_MESSAGE_FAILED",
+                    "crawl_id": message.get("crawl_id"),
+                    "sicbl_ods_code": message.get("sicbl_ods_code"),
+                },
+            )
+            return
+        self._queue.delete(receipt_handle)
+
+    def run(self):
+        idle_polls = 0
+        while not self._idle_polls or idle_polls < self._idle_polls:
+            messages = self._queue.receive(wait_seconds=self._wait_seconds)
+            idle_polls = 0 if messages else idle_polls + 1
+            for message, receipt_handle in messages:
+                self._process_and_delete(message, receipt_handle)
+
+
+def create_sicbl_crawl_queue(config: OdsPortalConfig) -> SqsJsonQueue:
+    if not config.sicbl_crawl_queue_url:
+        raise MissingEnvironmentVariable(
+            "Expected environment variable SICBL_CRAWL_QUEUE_URL was not set, exiting..."
+        )
+    return SqsJsonQueue(config.sicbl_crawl_queue_url, endpoint_url=config.sqs_endpoint_url)
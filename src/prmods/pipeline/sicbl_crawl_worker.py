@@ -0,0 +1,74 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from os import environ
+
+from prmods.domain.ods_portal.ods_portal_data_fetcher import OdsPortalDataFetcher
+from prmods.pipeline.config import OdsPortalConfig
+from prmods.pipeline.main import logger, setup_logger
+from prmods.pipeline.ods_client import create_ods_client
+from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
+from prmods.pipeline.sicbl_crawl import (
+    DEFAULT_SICBL_CRAWL_IDLE_POLLS,
+    SicblCrawlWorker,
+    create_sicbl_crawl_queue,
+)
+from prmods.utils.io.s3 import S3DataManager
+from prmods.utils.io.s3_io_stats import S3IoStats
+
+DEFAULT_SICBL_CRAWL_WORKERS = 4
+
+
+def run_sicbl_crawl_workers(config: OdsPortalConfig):
+    queue = create_sicbl_crawl_queue(config)
+    s3_io_stats = S3IoStats()
+    resources = ExitStack()
+    data_source = OdsPortalDataFetcher(
+        create_ods_client(config, s3_io_stats=s3_io_stats, resources=resources)
+    )
+    s3_manager = S3DataManager(endpoint_url=config.s3_endpoint_url, io_stats=s3_io_stats)
+    uris = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=config.mapping_bucket, ods_metadata_bucket=config.output_bucket
+    )
+    idle_polls = (
+        DEFAULT_SICBL_CRAWL_IDLE_POLLS
+        if config.sicbl_crawl_idle_polls is None
+        else config.sicbl_crawl_idle_polls
+    )
+    workers = config.sicbl_crawl_workers or DEFAULT_SICBL_CRAWL_WORKERS
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    SicblCrawlWorker(queue, data_source, s3_manager, uris, idle_polls).run
+                )
+                for _ in range(workers)
+            ]
+        for future in futures:
+            future.result()
+    finally:
+        resources.close()
+        s3_io_stats.log_summary()
+
+
+def main():
+    config = {}
+    queued_logging = None
+    try:
+        config = OdsPortalConfig.from_environment_variables(environ)
+        queued_logging = setup_logger(config)
+        run_sicbl_crawl_workers(config)
+    except Exception as ex:
+        if not logger.handlers:
+            setup_logger()
+        logger.error(
+            str(ex), extra={"event": "FAILED_TO_RUN_SICBL_CRAWL_WORKER", "config": config.__str__()}
+        )
+        sys.exit("Failed to run SICBL crawl worker, exiting...")
+    finally:
+        if queued_logging is not None:
+            queued_logging.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict
+
+from prmods.domain.ods_portal.metadata_encoder import encode_sicbl_shard
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
+from prmods.utils.io.s3 import S3DataManager
+
+DEFAULT_SHARD_WRITE_WORKERS = 8
+
+
+class SicblShardWriter:
+    """
+    Writes one object per SICBL containing its practices and their ASIDs, followed by
+    an index object listing every shard with its size and SHA-256 hash.
+    """
+
+    def __init__(
+        self,
+        s3_manager: S3DataManager,
+        uris: OdsDownloaderS3UriResolver,
+        max_workers: int = DEFAULT_SHARD_WRITE_WORKERS,
+    ):
+        self._s3_manager = s3_manager
+        self._uris = uris
+        self._max_workers = max_workers
+
+    def _write_shard(
+        self,
+        organisation_metadata: OrganisationMetadata,
+        sicbl: SicblDetails,
+        practices_by_ods_code: Dict[str, PracticeDetails],
+        date_anchor: datetime,
+        metadata: Dict[str, str],
+    ) -> dict:
+        shard_s3_path = self._uris.sicbl_shard(date_anchor, sicbl.ods_code)
+        body = encode_sicbl_shard(
+            organisation_metadata,
+            sicbl,
+            (practices_by_ods_code[ods_code] for ods_code in sicbl.practices),
+        )
+        self._s3_manager.write_encoded_json(shard_s3_path, body, metadata)
+        encoded_body = body.encode("utf-8")
+        return {
+            "ods_code": sicbl.ods_code,
+            "object_uri": shard_s3_path,
+            "size_bytes": len(encoded_body),
+            "sha256": hashlib.sha256(encoded_body).hexdigest(),
+        }
+
+    def write(
+        self,
+        organisation_metadata: OrganisationMetadata,
+        date_anchor: datetime,
+        metadata: Dict[str, str],
+    ):
+        practices_by_ods_code = {
+            practice.ods_code: practice for practice in organisation_metadata.practices
+        }
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            shards = list(
+                executor.map(
+                    lambda sicbl: self._write_shard(
+                        organisation_metadata, sicbl, practices_by_ods_code, date_anchor, metadata
+                    ),
+                    organisation_metadata.sicbls,
+                )
+            )
+        index = {
+            "generated_on": organisation_metadata.generated_on,
+            "year": organisation_metadata.year,
+            "month": organisation_metadata.month,
+            "shards": shards,
+        }
+        self._s3_manager.write_json(self._uris.sicbl_shard_index(date_anchor), index, metadata)
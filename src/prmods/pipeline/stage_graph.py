@@ -0,0 +1,182 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+module_logger = logging.getLogger(__name__)
+
+DEFAULT_STAGE_WORKERS = 4
+
+
+class InvalidStageGraph(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A named step whose function is called with the results of its input stages, in
+    the order they are listed.
+    """
+
+    name: str
+    function: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    started: float
+    finished: float
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass
+class StageGraphResult:
+    results: Dict[str, Any]
+    timings: Dict[str, StageTiming] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_seconds: float = 0.0
+
+
+class StageGraph:
+    def __init__(self, stages: Iterable[Stage]):
+        self._stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self._stages:
+                raise InvalidStageGraph(f"Stage {stage.name} is declared more than once")
+            self._stages[stage.name] = stage
+        for stage in self._stages.values():
+            unknown_inputs = [name for name in stage.inputs if name not in self._stages]
+            if unknown_inputs:
+                raise InvalidStageGraph(f"Stage {stage.name} has unknown inputs {unknown_inputs}")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        resolved: Set[str] = set()
+        remaining = dict(self._stages)
+        while remaining:
+            ready = [name for name, stage in remaining.items() if resolved.issuperset(stage.inputs)]
+            if not ready:
+                raise InvalidStageGraph(f"Stages {sorted(remaining)} depend on each other")
+            resolved.update(ready)
+            for name in ready:
+                del remaining[name]
+
+    @property
+    def stages(self) -> Sequence[Stage]:
+        return list(self._stages.values())
+
+    def stage(self, name: str) -> Stage:
+        return self._stages[name]
+
+
+def critical_path(graph: StageGraph, timings: Dict[str, StageTiming]) -> Tuple[List[str], float]:
+    """
+    Returns the chain of dependent stages with the largest total duration, which bounds
+    how fast the graph can run however many workers it has.
+    """
+    path_seconds: Dict[str, float] = {}
+    previous_stage: Dict[str, Optional[str]] = {}
+
+    def longest_path_to(name: str) -> float:
+        if name not in path_seconds:
+            inputs = graph.stage(name).inputs
+            slowest_input = max(inputs, key=longest_path_to, default=None)
+            previous_stage[name] = slowest_input
+            input_seconds = path_seconds[slowest_input] if slowest_input else 0.0
+            path_seconds[name] = input_seconds + timings[name].seconds
+        return path_seconds[name]
+
+    if not timings:
+        return [], 0.0
+    last_stage = max(timings, key=longest_path_to)
+    path = []
+    stage: Optional[str] = last_stage
+    while stage is not None:
+        path.append(stage)
+        stage = previous_stage[stage]
+    return list(reversed(path)), path_seconds[last_stage]
+
+
+class StageGraphExecutor:
+    """
+    Runs each stage on a thread pool as soon as all of its inputs are ready. If a stage
+    fails, no further stages are started and the first failure is raised once the
+    running stages finish.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_STAGE_WORKERS, logger: Logger = module_logger):
+        self._max_workers = max_workers
+        self._logger = logger
+
+    def _run_stage(self, stage: Stage, results: Dict[str, Any]) -> Tuple[Any, StageTiming]:
+        started = time.perf_counter()
+        result = stage.function(*(results[name] for name in stage.inputs))
+        return result, StageTiming(started, time.perf_counter())
+
+    def _submit_ready_stages(
+        self,
+        executor: ThreadPoolExecutor,
+        waiting: List[Stage],
+        results: Dict[str, Any],
+        running: Dict[Future, Stage],
+    ):
+        ready = [stage for stage in waiting if all(name in results for name in stage.inputs)]
+        for stage in ready:
+            waiting.remove(stage)
+            running[executor.submit(self._run_stage, stage, dict(results))] = stage
+
+    @staticmethod
+    def _collect_completed_stages(
+        running: Dict[Future, Stage], results: Dict[str, Any], timings: Dict[str, StageTiming]
+    ) -> Optional[Exception]:
+        failure = None
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            stage = running.pop(future)
+            try:
+                results[stage.name], timings[stage.name] = future.result()
+            except Exception as error:
+                failure = failure or error
+        return failure
+
+    def _report_critical_path(self, graph: StageGraph, result: StageGraphResult):
+        result.critical_path, result.critical_path_seconds = critical_path(graph, result.timings)
+        self._logger.info(
+            f"Critical path took {result.critical_path_seconds:.3f}s: "
+            + " -> ".join(result.critical_path),
+            extra={
+                "event": "STAGE_GRAPH_CRITICAL_PATH",
+                "critical_path": result.critical_path,
+                "critical_path_seconds": result.critical_path_seconds,
+                "stage_seconds": {name: timing.seconds for name, timing in result.timings.items()},
+            },
+        )
+
+    def run(self, graph: StageGraph) -> StageGraphResult:
+        result = StageGraphResult(results={})
+        waiting = list(graph.stages)
+        running: Dict[Future, Stage] = {}
+        failure: Optional[Exception] = None
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while True:
+                if failure is None:
+                    self._submit_ready_stages(executor, waiting, result.results, running)
+                if not running:
+                    break
+                completed_failure = self._collect_completed_stages(
+                    running, result.results, result.timings
+                )
+                failure = failure or completed_failure
+
+        if failure is not None:
+            raise failure
+        self._report_critical_path(graph, result)
+        return result
@@ -0,0 +1,111 @@
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from logging import Logger
+from typing import Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+module_logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_NAMESPACE = "prm-gp2gp-ods-downloader"
+
+STAGE_METRICS = [
+    {"Name": "wall_seconds", "Unit": "Seconds"},
+    {"Name": "cpu_seconds", "Unit": "Seconds"},
+    {"Name": "peak_rss_delta_bytes", "Unit": "Bytes"},
+    {"Name": "item_count", "Unit": "Count"},
+]
+
+
+def peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class StageSpan:
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_delta_bytes: int = 0
+    item_count: int = 0
+
+
+def _embedded_metrics(namespace: str, dimensions: List[List[str]]) -> dict:
+    return {
+        "Timestamp": int(time.time() * 1000),
+        "CloudWatchMetrics": [
+            {"Namespace": namespace, "Dimensions": dimensions, "Metrics": STAGE_METRICS}
+        ],
+    }
+
+
+class StageTimer:
+    """
+    Records wall time, CPU time, peak RSS growth and an item count for each stage of a
+    run. Each completed stage is logged as a RUN_STAGE_COMPLETED event, carrying the same
+    values in CloudWatch Embedded Metric Format under the "_aws" key.
+
+    Stages may run concurrently, so a stage's CPU time is that of the thread running it.
+    Peak RSS is only known for the whole process, so its growth during a stage can
+    include memory allocated by stages running alongside it.
+    """
+
+    def __init__(self, logger: Logger = module_logger, namespace: str = DEFAULT_METRICS_NAMESPACE):
+        self._logger = logger
+        self._namespace = namespace
+        self._spans: List[StageSpan] = []
+        self._run_started: Optional[float] = None
+        self._run_cpu_started = 0.0
+        self._run_peak_rss_started = 0
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[StageSpan]:
+        if self._run_started is None:
+            self._run_started = time.perf_counter()
+            self._run_cpu_started = time.process_time()
+            self._run_peak_rss_started = peak_rss_bytes()
+        stage_span = StageSpan(stage)
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        peak_rss_started = peak_rss_bytes()
+        yield stage_span
+        stage_span.wall_seconds = time.perf_counter() - wall_started
+        stage_span.cpu_seconds = time.thread_time() - cpu_started
+        stage_span.peak_rss_delta_bytes = peak_rss_bytes() - peak_rss_started
+        self._spans.append(stage_span)
+        self._logger.info(
+            f"Completed stage {stage} in {stage_span.wall_seconds:.3f}s",
+            extra={
+                "event": "RUN_STAGE_COMPLETED",
+                **asdict(stage_span),
+                "_aws": _embedded_metrics(self._namespace, [["stage"]]),
+            },
+        )
+
+    def spans(self) -> List[StageSpan]:
+        return list(self._spans)
+
+    def log_summary(self):
+        if self._run_started is None:
+            return
+        wall_seconds = time.perf_counter() - self._run_started
+        self._logger.info(
+            f"Completed {len(self._spans)} stages in {wall_seconds:.3f}s",
+            extra={
+                "event": "RUN_SUMMARY",
+                "wall_seconds": wall_seconds,
+                "cpu_seconds": time.process_time() - self._run_cpu_started,
+                "peak_rss_delta_bytes": peak_rss_bytes() - self._run_peak_rss_started,
+                "item_count": sum(stage_span.item_count for stage_span in self._spans),
+                "stages": [asdict(stage_span) for stage_span in self._spans],
+                "_aws": _embedded_metrics(self._namespace, [[]]),
+            },
+        )
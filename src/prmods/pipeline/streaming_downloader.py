@@ -0,0 +1,140 @@
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from tempfile import SpooledTemporaryFile
+from typing import Callable, Dict, List, Optional, Sequence
+
+from prmods.domain.ods_portal.asid_lookup import AsidLookup
+from prmods.domain.ods_portal.hedged_http_client import HedgedRequestStats
+from prmods.domain.ods_portal.ods_portal_data_fetcher import StreamingOdsDataSource
+from prmods.domain.ods_portal.streaming_metadata import iter_encode_streamed_organisation_metadata
+from prmods.pipeline.config import InvalidEnvironmentVariableValue, OdsPortalConfig
+from prmods.pipeline.ods_client import create_ods_portal_client
+from prmods.pipeline.ods_downloader import READ_ASID_LOOKUP_STAGE, OdsDownloader
+from prmods.utils.io.compression import create_compressor, file_extension
+from prmods.utils.io.s3 import S3DataManager
+
+STREAM_ORGANISATION_METADATA_STAGE = "STREAM_ORGANISATION_METADATA"
+
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+def unsupported_streaming_options(config: OdsPortalConfig) -> List[str]:
+    options = {
+        "WRITE_PARQUET_OUTPUT": config.write_parquet_output,
+        "WRITE_METADATA_DELTA": config.write_metadata_delta,
+        "WRITE_SICBL_SHARDS": config.write_sicbl_shards,
+        "WRITE_OBSERVABILITY_EVENTS_FILE": config.write_observability_events_file,
+        "OUTPUT_DESTINATIONS": bool(config.output_destinations),
+        "SICBL_CRAWL_QUEUE_URL": bool(config.sicbl_crawl_queue_url),
+        "WRITE_ODS_SNAPSHOT": config.write_ods_snapshot,
+        "REPLAY_ODS_SNAPSHOT": config.replay_ods_snapshot,
+        "CHECKPOINT_LOCATION": bool(config.checkpoint_location),
+        "ODS_CACHE_MEMORY_ENTRIES": bool(config.ods_cache_memory_entries),
+        "ODS_CACHE_DIRECTORY": bool(config.ods_cache_directory),
+        "ODS_CACHE_S3_PREFIX": bool(config.ods_cache_s3_prefix),
+        "ADAPTIVE_ODS_CONCURRENCY": config.adaptive_ods_concurrency,
+    }
+    return [name for name, enabled in options.items() if enabled]
+
+
+class _SpooledOutput:
+    """
+    Collects one output object in memory up to SPOOL_MAX_BYTES and on local disk beyond
+    that, compressing it as it is written when a content encoding is given.
+    """
+
+    def __init__(self, object_uri: str, content_encoding: Optional[str] = None):
+        self.object_uri = object_uri
+        self._content_encoding = content_encoding
+        self._compressor = create_compressor(content_encoding) if content_encoding else None
+        self._file = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+
+    def write(self, data: bytes):
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._file.write(data)
+
+    def upload(self, s3_manager: S3DataManager, metadata: Dict[str, str]):
+        if self._compressor is not None:
+            self._file.write(self._compressor.flush())
+        self._file.seek(0)
+        with self._file:
+            s3_manager.write_file(
+                self.object_uri,
+                self._file,
+                content_type="application/json",
+                metadata=metadata,
+                content_encoding=self._content_encoding,
+            )
+
+
+class StreamingOdsDownloader(OdsDownloader):
+    """
+    Writes the organisation metadata as organisations stream from the ODS Portal, without
+    building the practice and SICBL lists. Outputs that need the whole document are not
+    supported, and the content hash used to skip unchanged uploads is not recorded.
+    """
+
+    def __init__(
+        self, config: OdsPortalConfig, stage_listeners: Sequence[Callable[[str], None]] = ()
+    ):
+        unsupported_options = unsupported_streaming_options(config)
+        if unsupported_options:
+            raise InvalidEnvironmentVariableValue(
+                "STREAMING_PIPELINE cannot be used with: " + ", ".join(unsupported_options)
+            )
+        hedged_request_stats = HedgedRequestStats()
+        ods_client_resources = ExitStack()
+        self._streaming_data_source = StreamingOdsDataSource(
+            create_ods_portal_client(config, hedged_request_stats, ods_client_resources)
+        )
+        super().__init__(
+            config, ods_data_source=self._streaming_data_source, stage_listeners=stage_listeners
+        )
+        self._hedged_request_stats = hedged_request_stats
+        self._resources.enter_context(ods_client_resources)
+
+    def _create_outputs(self) -> List[_SpooledOutput]:
+        date_anchor = self._config.date_anchor
+        content_encoding = self._config.output_compression
+        outputs = []
+        if not content_encoding or self._config.write_uncompressed_output:
+            outputs.append(_SpooledOutput(self._uris.ods_metadata(date_anchor)))
+        if content_encoding:
+            compressed_uri = self._uris.compressed_ods_metadata(
+                date_anchor, file_extension(content_encoding)
+            )
+            outputs.append(_SpooledOutput(compressed_uri, content_encoding))
+        return outputs
+
+    def _stream_ods_metadata(self, asid_lookup: AsidLookup):
+        outputs = self._create_outputs()
+        chunks = iter_encode_streamed_organisation_metadata(
+            self._metadata_service,
+            self._streaming_data_source,
+            asid_lookup,
+            generated_on=datetime.now(timezone.utc),
+            year=self._config.date_anchor.year,
+            month=self._config.date_anchor.month,
+            show_prison_practices_toggle=self._config.show_prison_practices_toggle,
+        )
+        for chunk in chunks:
+            encoded_chunk = chunk.encode("utf-8")
+            for output in outputs:
+                output.write(encoded_chunk)
+        for output in outputs:
+            output.upload(self._s3_manager, self._output_metadata)
+
+    def run(self):
+        try:
+            asid_lookup = self._timed_stage(
+                READ_ASID_LOOKUP_STAGE, self._read_most_recent_asid_lookup
+            )()
+            self._timed_stage(STREAM_ORGANISATION_METADATA_STAGE, self._stream_ods_metadata)(
+                asid_lookup
+            )
+            self._record_ods_fetch_stats()
+        finally:
+            self._resources.close()
+            self._stage_timer.log_summary()
+            self._s3_io_stats.log_summary()
@@ -0,0 +1,43 @@
+from typing import IO, Iterator
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def _end_of_last_record(block: str) -> int:
+    """
+    Returns the index just past the last line break that is outside a quoted CSV field,
+    or 0 when there is none. The block must start at the beginning of a record.
+    """
+    end_of_last_record = 0
+    inside_quotes = False
+    position = 0
+    for line in block.split("\n")[:-1]:
+        position += len(line) + 1
+        # Escaped quotes come in pairs, so only an odd count opens or closes a field
+        inside_quotes ^= line.count('"') % 2 == 1
+        if not inside_quotes:
+            end_of_last_record = position
+    return end_of_last_record
+
+
+def iter_line_aligned_chunks(
+    text_stream: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Reads the stream in blocks of about chunk_size characters, each ending at a line break
+    outside any quoted CSV field, so that no record is split across two chunks.
+    """
+    remainder = ""
+    while True:
+        block = text_stream.read(chunk_size)
+        if not block:
+            break
+        block = remainder + block
+        end_of_last_record = _end_of_last_record(block)
+        if end_of_last_record == 0:
+            remainder = block
+            continue
+        remainder = block[end_of_last_record:]
+        yield block[:end_of_last_record]
+    if remainder:
+        yield remainder
@@ -0,0 +1,87 @@
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterable
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+_FILE_EXTENSIONS = {GZIP: ".gz", ZSTD: ".zst"}
+
+
+class UnsupportedCompression(Exception):
+    pass
+
+
+@dataclass
+class CompressionResult:
+    body: bytes
+    content_encoding: str
+    uncompressed_size: int
+    compression_seconds: float
+
+    @property
+    def compressed_size(self) -> int:
+        return len(self.body)
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.uncompressed_size / self.compressed_size
+
+
+def validate_content_encoding(content_encoding: str) -> str:
+    if content_encoding not in _FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported content encoding: {content_encoding}")
+    return content_encoding
+
+
+def file_extension(content_encoding: str) -> str:
+    return _FILE_EXTENSIONS[validate_content_encoding(content_encoding)]
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise UnsupportedCompression(
+            "zstd compression requires the zstandard package, install gp2gp-ods-downloader[zstd]"
+        )
+    return zstandard
+
+
+def create_compressor(content_encoding: str):
+    if validate_content_encoding(content_encoding) == GZIP:
+        return zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    return _import_zstandard().ZstdCompressor().compressobj()
+
+
+def decompress(body: bytes, content_encoding: str) -> bytes:
+    if validate_content_encoding(content_encoding) == GZIP:
+        return zlib.decompress(body, wbits=zlib.MAX_WBITS | 16)
+    return _import_zstandard().ZstdDecompressor().decompressobj().decompress(body)
+
+
+def compress_text_chunks(chunks: Iterable[str], content_encoding: str) -> CompressionResult:
+    """
+    Compresses text as it is produced, so that the full uncompressed document
+    never has to be built up front.
+    """
+    compressor = create_compressor(content_encoding)
+    compressed_parts = []
+    uncompressed_size = 0
+    compression_seconds = 0.0
+    for chunk in chunks:
+        encoded_chunk = chunk.encode("utf-8")
+        uncompressed_size += len(encoded_chunk)
+        start = time.perf_counter()
+        compressed_parts.append(compressor.compress(encoded_chunk))
+        compression_seconds += time.perf_counter() - start
+    start = time.perf_counter()
+    compressed_parts.append(compressor.flush())
+    compression_seconds += time.perf_counter() - start
+    return CompressionResult(
+        body=b"".join(compressed_parts),
+        content_encoding=content_encoding,
+        uncompressed_size=uncompressed_size,
+        compression_seconds=compression_seconds,
+    )
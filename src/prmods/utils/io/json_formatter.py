@@ -1,22 +1,49 @@
 import json
+import math
 from datetime import datetime
 from logging import Formatter, LogRecord, makeLogRecord
+from typing import Tuple
 
-DEFAULT_LOG_RECORD_ATTRS = vars(makeLogRecord({})).keys()
+DEFAULT_LOG_RECORD_ATTRS = frozenset(vars(makeLogRecord({})).keys())
+
+# Equivalent to json.dumps with default arguments, without re-checking the arguments per call
+_json_dumps = json.JSONEncoder().encode
+
+
+def _split_timestamp(created: float) -> Tuple[int, int]:
+    # Rounds to whole seconds and microseconds the same way as datetime.utcfromtimestamp
+    fraction, seconds = math.modf(created)
+    microseconds = round(fraction * 1e6)
+    if microseconds >= 1000000:
+        return int(seconds) + 1, microseconds - 1000000
+    if microseconds < 0:
+        return int(seconds) - 1, microseconds + 1000000
+    return int(seconds), microseconds
 
 
 class JsonFormatter(Formatter):
+    def __init__(self):
+        super().__init__()
+        self._cached_time: Tuple[int, str] = (0, datetime.utcfromtimestamp(0).isoformat())
+
+    def _format_time(self, created: float) -> str:
+        seconds, microseconds = _split_timestamp(created)
+        cached_seconds, formatted_seconds = self._cached_time
+        if seconds != cached_seconds:
+            formatted_seconds = datetime.utcfromtimestamp(seconds).isoformat()
+            self._cached_time = (seconds, formatted_seconds)
+        if microseconds:
+            return f"{formatted_seconds}.{microseconds:06d}"
+        return formatted_seconds
+
     def format(self, record: LogRecord) -> str:
-        return json.dumps(
-            {
-                name: value
-                for (name, value) in vars(record).items()
-                if name not in DEFAULT_LOG_RECORD_ATTRS
-            }
-            | {
-                "level": record.levelname,
-                "message": record.msg,
-                "module": record.module,
-                "time": datetime.utcfromtimestamp(record.created).isoformat(),
-            }
-        )
+        fields = {
+            name: value
+            for (name, value) in record.__dict__.items()
+            if name not in DEFAULT_LOG_RECORD_ATTRS
+        }
+        fields["level"] = record.levelname
+        fields["message"] = record.msg
+        fields["module"] = record.module
+        fields["time"] = self._format_time(record.created)
+        return _json_dumps(fields)
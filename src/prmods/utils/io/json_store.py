@@ -0,0 +1,49 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+from prmods.utils.io.s3 import S3DataManager
+
+
+class JsonStore(Protocol):
+    def read(self, key: str) -> Optional[Any]:
+        ...
+
+    def write(self, key: str, data: Any):
+        ...
+
+
+class LocalJsonStore:
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+
+    def read(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._directory / key, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write(self, key: str, data: Any):
+        path = self._directory / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(path.name + ".tmp")
+        with open(temporary_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
+
+
+class S3JsonStore:
+    def __init__(self, s3_manager: S3DataManager, prefix_uri: str):
+        self._s3_manager = s3_manager
+        self._prefix_uri = prefix_uri.rstrip("/")
+
+    def _object_uri(self, key: str) -> str:
+        return f"{self._prefix_uri}/{key}"
+
+    def read(self, key: str) -> Optional[Any]:
+        return self._s3_manager.read_optional_json(self._object_uri(key))
+
+    def write(self, key: str, data: Any):
+        self._s3_manager.write_json(self._object_uri(key), data, {})
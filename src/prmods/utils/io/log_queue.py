@@ -0,0 +1,88 @@
+from logging import Handler, Logger, LogRecord
+from logging.handlers import QueueHandler, QueueListener
+from queue import Empty, Full, Queue
+
+BLOCK = "block"
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+OVERFLOW_POLICIES = {BLOCK, DROP_NEWEST, DROP_OLDEST}
+
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+
+def validate_overflow_policy(overflow_policy: str) -> str:
+    if overflow_policy not in OVERFLOW_POLICIES:
+        raise ValueError(f"Unsupported log queue overflow policy: {overflow_policy}")
+    return overflow_policy
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without formatting them, so that formatting
+    and writing happen on the listener's thread. When the queue is full the record
+    is handled according to the overflow policy.
+    """
+
+    def __init__(self, queue: Queue, overflow_policy: str = BLOCK):
+        super().__init__(queue)
+        self._queue = queue
+        self._overflow_policy = validate_overflow_policy(overflow_policy)
+        self.dropped_records = 0
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
+
+    def _discard_oldest(self):
+        try:
+            self._queue.get_nowait()
+            self.dropped_records += 1
+        except Empty:
+            pass
+
+    def enqueue(self, record: LogRecord):
+        if self._overflow_policy == BLOCK:
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except Full:
+            if self._overflow_policy == DROP_OLDEST:
+                self._discard_oldest()
+                self.enqueue(record)
+            else:
+                self.dropped_records += 1
+
+
+class _DrainingQueueListener(QueueListener):
+    def __init__(self, queue: Queue, handler: Handler):
+        super().__init__(queue, handler, respect_handler_level=True)
+        self._queue = queue
+
+    def enqueue_sentinel(self):
+        # Blocks rather than raising when the queue is full, the listener is still draining it.
+        self._queue.put(None)
+
+
+class QueuedLogging:
+    """Routes a logger's records through a bounded queue to a handler on a background thread."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        handler: Handler,
+        max_size: int = DEFAULT_LOG_QUEUE_SIZE,
+        overflow_policy: str = BLOCK,
+    ):
+        self._logger = logger
+        log_queue: Queue = Queue(maxsize=max_size)
+        self.queue_handler = BoundedQueueHandler(log_queue, overflow_policy)
+        self._listener = _DrainingQueueListener(log_queue, handler)
+
+    def start(self):
+        self._logger.addHandler(self.queue_handler)
+        self._listener.start()
+
+    def stop(self):
+        """Detaches from the logger and waits until every queued record has been written."""
+        self._logger.removeHandler(self.queue_handler)
+        self._listener.stop()
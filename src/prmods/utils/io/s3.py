@@ -3,11 +3,42 @@ import gzip
 import json
 import logging
 from datetime import datetime
-from typing import Dict
+from io import BytesIO
+from threading import Lock
+from typing import IO, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from prmods.utils.io.chunks import DEFAULT_CHUNK_SIZE, iter_line_aligned_chunks
+from prmods.utils.io.compression import CompressionResult, decompress
+from prmods.utils.io.s3_io_stats import S3IoStats
+
 logger = logging.getLogger(__name__)
 
+S3_URI_SCHEME = "s3://"
+
+# DeleteObjects accepts at most this many keys per request
+S3_MAX_DELETE_KEYS = 1000
+
+_NOT_FOUND_ERROR_CODES = {"404", "NoSuchKey", "NotFound"}
+
+_client_creation_lock = Lock()
+
+
+class S3ObjectNotFound(Exception):
+    pass
+
+
+def create_s3_client(endpoint_url: Optional[str] = None, io_stats: Optional[S3IoStats] = None):
+    # Importing boto3 and building a client are slow, so both wait until S3 is first used.
+    # The default boto3 session is not thread safe, so clients are created one at a time.
+    import boto3
+
+    with _client_creation_lock:
+        client = boto3.client("s3", endpoint_url=endpoint_url)
+    if io_stats is not None:
+        io_stats.instrument(client)
+    return client
+
 
 def _serialize_datetime(obj):
     if isinstance(obj, datetime):
@@ -16,36 +47,235 @@ def _serialize_datetime(obj):
 
 
 class S3DataManager:
-    def __init__(self, client):
+    def __init__(
+        self,
+        client=None,
+        endpoint_url: Optional[str] = None,
+        io_stats: Optional[S3IoStats] = None,
+    ):
         self._client = client
+        self._endpoint_url = endpoint_url
+        self._io_stats = io_stats
+        self._client_lock = Lock()
+        if client is not None and io_stats is not None:
+            io_stats.instrument(client)
+
+    @property
+    def _s3(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = create_s3_client(self._endpoint_url, self._io_stats)
+        return self._client
 
-    def _object_from_uri(self, uri: str):
+    @staticmethod
+    def _bucket_and_key(uri: str) -> Tuple[str, str]:
         object_url = urlparse(uri)
-        s3_bucket = object_url.netloc
-        s3_key = object_url.path.lstrip("/")
-        return self._client.Object(s3_bucket, s3_key)
+        return object_url.netloc, object_url.path.lstrip("/")
+
+    @staticmethod
+    def _is_not_found(error) -> bool:
+        return error.response["Error"]["Code"] in _NOT_FOUND_ERROR_CODES
+
+    def _get_object(self, object_uri: str) -> dict:
+        bucket, key = self._bucket_and_key(object_uri)
+        try:
+            return self._s3.get_object(Bucket=bucket, Key=key)
+        except self._s3.exceptions.ClientError as error:
+            if self._is_not_found(error):
+                raise S3ObjectNotFound(f"S3 object not found: {object_uri}") from error
+            raise
+
+    def _put_object(self, object_uri: str, **kwargs):
+        bucket, key = self._bucket_and_key(object_uri)
+        self._s3.put_object(Bucket=bucket, Key=key, **kwargs)
 
     def write_json(self, object_uri: str, data: dict, metadata: Dict[str, str]):
+        body = json.dumps(data, default=_serialize_datetime)
+        self.write_encoded_json(object_uri, body, metadata)
+
+    def write_encoded_json(self, object_uri: str, body: str, metadata: Dict[str, str]):
         logger.info(
             "Attempting to upload: " + object_uri,
             extra={"event": "ATTEMPTING_UPLOAD_JSON_TO_S3", "object_uri": object_uri},
         )
-        s3_object = self._object_from_uri(object_uri)
-        body = json.dumps(data, default=_serialize_datetime)
-        s3_object.put(Body=body, ContentType="application/json", Metadata=metadata)
+        self._put_object(object_uri, Body=body, ContentType="application/json", Metadata=metadata)
         logger.info(
             "Successfully uploaded to: " + object_uri,
             extra={"event": "UPLOADED_JSON_TO_S3", "object_uri": object_uri},
         )
 
+    def write_compressed_json(
+        self, object_uri: str, compressed: CompressionResult, metadata: Dict[str, str]
+    ):
+        logger.info(
+            "Attempting to upload: " + object_uri,
+            extra={"event": "ATTEMPTING_UPLOAD_JSON_TO_S3", "object_uri": object_uri},
+        )
+        self._put_object(
+            object_uri,
+            Body=compressed.body,
+            ContentType="application/json",
+            ContentEncoding=compressed.content_encoding,
+            Metadata=metadata,
+        )
+        logger.info(
+            "Successfully uploaded to: " + object_uri,
+            extra={
+                "event": "UPLOADED_COMPRESSED_JSON_TO_S3",
+                "object_uri": object_uri,
+                "content_encoding": compressed.content_encoding,
+                "uncompressed_size": compressed.uncompressed_size,
+                "compressed_size": compressed.compressed_size,
+                "compression_ratio": round(compressed.compression_ratio, 2),
+                "compression_seconds": round(compressed.compression_seconds, 4),
+            },
+        )
+
+    def write_bytes(
+        self, object_uri: str, body: bytes, content_type: str, metadata: Dict[str, str]
+    ):
+        logger.info(
+            "Attempting to upload: " + object_uri,
+            extra={"event": "ATTEMPTING_UPLOAD_FILE_TO_S3", "object_uri": object_uri},
+        )
+        self._put_object(object_uri, Body=body, ContentType=content_type, Metadata=metadata)
+        logger.info(
+            "Successfully uploaded to: " + object_uri,
+            extra={"event": "UPLOADED_FILE_TO_S3", "object_uri": object_uri},
+        )
+
+    def write_file(
+        self,
+        object_uri: str,
+        body: IO[bytes],
+        content_type: str,
+        metadata: Dict[str, str],
+        content_encoding: Optional[str] = None,
+    ):
+        logger.info(
+            "Attempting to upload: " + object_uri,
+            extra={"event": "ATTEMPTING_UPLOAD_FILE_TO_S3", "object_uri": object_uri},
+        )
+        content_encoding_args = {"ContentEncoding": content_encoding} if content_encoding else {}
+        self._put_object(
+            object_uri,
+            Body=body,
+            ContentType=content_type,
+            Metadata=metadata,
+            **content_encoding_args,
+        )
+        logger.info(
+            "Successfully uploaded to: " + object_uri,
+            extra={"event": "UPLOADED_FILE_TO_S3", "object_uri": object_uri},
+        )
+
+    def write_parquet(self, object_uri: str, columns: Dict[str, List], metadata: Dict[str, str]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "Writing parquet requires the pyarrow package, "
+                "install gp2gp-ods-downloader[parquet]"
+            )
+
+        logger.info(
+            "Attempting to upload: " + object_uri,
+            extra={"event": "ATTEMPTING_UPLOAD_PARQUET_TO_S3", "object_uri": object_uri},
+        )
+        body = BytesIO()
+        pyarrow.parquet.write_table(pyarrow.table(columns), body)
+        self._put_object(
+            object_uri,
+            Body=body.getvalue(),
+            ContentType="application/vnd.apache.parquet",
+            Metadata=metadata,
+        )
+        logger.info(
+            "Successfully uploaded to: " + object_uri,
+            extra={"event": "UPLOADED_PARQUET_TO_S3", "object_uri": object_uri},
+        )
+
+    def read_json(self, object_uri: str):
+        logger.info(
+            "Reading file from: " + object_uri,
+            extra={"event": "READING_FILE_FROM_S3", "object_uri": object_uri},
+        )
+        response = self._get_object(object_uri)
+        body = response["Body"].read()
+        content_encoding = response.get("ContentEncoding")
+        if content_encoding:
+            body = decompress(body, content_encoding)
+        return json.loads(body)
+
+    def read_bytes(self, object_uri: str) -> bytes:
+        logger.info(
+            "Reading file from: " + object_uri,
+            extra={"event": "READING_FILE_FROM_S3", "object_uri": object_uri},
+        )
+        return self._get_object(object_uri)["Body"].read()
+
+    def read_optional_json(self, object_uri: str):
+        try:
+            return self.read_json(object_uri)
+        except S3ObjectNotFound:
+            return None
+
+    def read_object_metadata(self, object_uri: str) -> Optional[Dict[str, str]]:
+        bucket, key = self._bucket_and_key(object_uri)
+        try:
+            response = self._s3.head_object(Bucket=bucket, Key=key)
+        except self._s3.exceptions.ClientError as error:
+            if self._is_not_found(error):
+                return None
+            raise
+        return response["Metadata"]
+
+    def list_object_uris(self, prefix_uri: str, oldest_first: bool = False) -> List[str]:
+        bucket, prefix = self._bucket_and_key(prefix_uri)
+        paginator = self._s3.get_paginator("list_objects_v2")
+        s3_objects = [
+            s3_object
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+            for s3_object in page.get("Contents", [])
+        ]
+        if oldest_first:
+            s3_objects.sort(key=lambda s3_object: s3_object["LastModified"])
+        return [f"s3://{bucket}/{s3_object['Key']}" for s3_object in s3_objects]
+
+    def delete_objects(self, object_uris: List[str]):
+        keys_by_bucket: Dict[str, List[str]] = {}
+        for object_uri in object_uris:
+            bucket, key = self._bucket_and_key(object_uri)
+            keys_by_bucket.setdefault(bucket, []).append(key)
+        for bucket, keys in keys_by_bucket.items():
+            for start in range(0, len(keys), S3_MAX_DELETE_KEYS):
+                end = start + S3_MAX_DELETE_KEYS
+                batch = keys[start:end]
+                self._s3.delete_objects(
+                    Bucket=bucket,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+
     def read_gzip_csv(self, object_uri: str):
         logger.info(
             "Reading file from: " + object_uri,
             extra={"event": "READING_FILE_FROM_S3", "object_uri": object_uri},
         )
-        s3_object = self._object_from_uri(object_uri)
-        response = s3_object.get()
+        response = self._get_object(object_uri)
         body = response["Body"]
         with gzip.open(body, mode="rt") as f:
             input_csv = csv.DictReader(f)
             yield from input_csv
+
+    def read_gzip_text_chunks(
+        self, object_uri: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[str]:
+        logger.info(
+            "Reading file from: " + object_uri,
+            extra={"event": "READING_FILE_FROM_S3", "object_uri": object_uri},
+        )
+        response = self._get_object(object_uri)
+        with gzip.open(response["Body"], mode="rt") as f:
+            yield from iter_line_aligned_chunks(f, chunk_size)
@@ -0,0 +1,172 @@
+import logging
+import time
+from dataclasses import asdict, dataclass
+from logging import Logger
+from threading import Lock
+from typing import Dict, Optional
+
+module_logger = logging.getLogger(__name__)
+
+# S3 Standard request prices in eu-west-2, in US dollars per 1000 requests. Transfer
+# between S3 and compute in the same region is free, so requests are the only cost.
+WRITE_REQUEST_PRICE_PER_1000 = 0.0053
+READ_REQUEST_PRICE_PER_1000 = 0.00042
+
+# Operations billed at the PUT, COPY, POST and LIST rate
+WRITE_PRICED_OPERATIONS = {
+    "PutObject",
+    "CopyObject",
+    "CreateMultipartUpload",
+    "UploadPart",
+    "UploadPartCopy",
+    "CompleteMultipartUpload",
+    "ListObjects",
+    "ListObjectsV2",
+    "ListObjectVersions",
+    "ListMultipartUploads",
+}
+
+# Operations that are not billed
+FREE_OPERATIONS = {"DeleteObject", "DeleteObjects", "AbortMultipartUpload"}
+
+_CONTEXT_KEY = "s3_io_stats"
+
+
+@dataclass
+class S3OperationStats:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    seconds: float = 0.0
+
+
+def request_price_per_1000(operation: str) -> float:
+    if operation in FREE_OPERATIONS:
+        return 0.0
+    if operation in WRITE_PRICED_OPERATIONS:
+        return WRITE_REQUEST_PRICE_PER_1000
+    return READ_REQUEST_PRICE_PER_1000
+
+
+def _body_size(body) -> int:
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if hasattr(body, "seek") and hasattr(body, "tell"):
+        position = body.tell()
+        end = body.seek(0, 2)
+        body.seek(position)
+        return end - position
+    return 0
+
+
+class S3IoStats:
+    """
+    Counts the requests, retries, errors, bytes and time of every call made by the S3
+    clients it instruments, by operation, using botocore's before-call and after-call
+    events. Each retry is another billed request, so retries are included in the request
+    count used for the cost estimate. Calls overlap when made from several threads, so
+    throughput is measured over the time from the first call starting to the last call
+    finishing, rather than over the sum of the calls' durations.
+    """
+
+    def __init__(self, logger: Logger = module_logger):
+        self._logger = logger
+        self._lock = Lock()
+        self._operations: Dict[str, S3OperationStats] = {}
+        self._first_call_started: Optional[float] = None
+        self._last_call_finished: Optional[float] = None
+
+    def instrument(self, client):
+        events = client.meta.events
+        events.register("before-call.s3", self._before_call)
+        events.register("after-call.s3", self._after_call)
+        events.register("after-call-error.s3", self._after_call_error)
+        return client
+
+    def _before_call(self, model, params, context, **kwargs):
+        context[_CONTEXT_KEY] = {
+            "operation": model.name,
+            "bytes_sent": _body_size(params.get("body")),
+            "started": time.perf_counter(),
+        }
+
+    def _after_call(self, http_response, parsed, model, context, **kwargs):
+        call = context.pop(_CONTEXT_KEY, None)
+        if call is None:
+            return
+        retries = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        # A HEAD response reports the object's length without sending its body
+        bytes_received = 0
+        if model.name != "HeadObject":
+            bytes_received = int(http_response.headers.get("content-length") or 0)
+        self._record(call, retries, http_response.status_code >= 300, bytes_received)
+
+    def _after_call_error(self, context, **kwargs):
+        call = context.pop(_CONTEXT_KEY, None)
+        if call is not None:
+            self._record(call, retries=0, failed=True, bytes_received=0)
+
+    def _record(self, call: dict, retries: int, failed: bool, bytes_received: int):
+        finished = time.perf_counter()
+        seconds = finished - call["started"]
+        with self._lock:
+            if self._first_call_started is None or call["started"] < self._first_call_started:
+                self._first_call_started = call["started"]
+            if self._last_call_finished is None or finished > self._last_call_finished:
+                self._last_call_finished = finished
+            stats = self._operations.setdefault(call["operation"], S3OperationStats())
+            stats.requests += 1 + retries
+            stats.retries += retries
+            stats.errors += int(failed)
+            stats.bytes_sent += call["bytes_sent"]
+            stats.bytes_received += bytes_received
+            stats.seconds += seconds
+
+    def operation_stats(self) -> Dict[str, S3OperationStats]:
+        with self._lock:
+            return {
+                operation: S3OperationStats(**asdict(stats))
+                for operation, stats in self._operations.items()
+            }
+
+    def estimated_request_cost(self) -> float:
+        return sum(
+            stats.requests * request_price_per_1000(operation) / 1000
+            for operation, stats in self.operation_stats().items()
+        )
+
+    def wall_seconds(self) -> float:
+        with self._lock:
+            if self._first_call_started is None or self._last_call_finished is None:
+                return 0.0
+            return self._last_call_finished - self._first_call_started
+
+    def log_summary(self):
+        operations = self.operation_stats()
+        if not operations:
+            return
+        wall_seconds = self.wall_seconds()
+        total = S3OperationStats()
+        for stats in operations.values():
+            for name, value in asdict(stats).items():
+                setattr(total, name, getattr(total, name) + value)
+        bytes_transferred = total.bytes_sent + total.bytes_received
+        estimated_cost = self.estimated_request_cost()
+        self._logger.info(
+            f"Made {total.requests} S3 requests costing an estimated ${estimated_cost:.6f}",
+            extra={
+                "event": "S3_IO_SUMMARY",
+                **asdict(total),
+                "seconds": round(total.seconds, 3),
+                "wall_seconds": round(wall_seconds, 3),
+                "bytes_per_second": round(bytes_transferred / wall_seconds) if wall_seconds else 0,
+                "estimated_request_cost_usd": round(estimated_cost, 6),
+                "operations": {
+                    operation: asdict(stats) for operation, stats in sorted(operations.items())
+                },
+            },
+        )
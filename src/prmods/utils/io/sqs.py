@@ -0,0 +1,62 @@
+import json
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+
+_client_creation_lock = Lock()
+
+SQS_MAX_BATCH_SIZE = 10
+SQS_MAX_WAIT_SECONDS = 20
+
+
+def create_sqs_client(endpoint_url: Optional[str] = None):
+    import boto3
+
+    with _client_creation_lock:
+        return boto3.client("sqs", endpoint_url=endpoint_url)
+
+
+class SqsJsonQueue:
+    def __init__(self, queue_url: str, client=None, endpoint_url: Optional[str] = None):
+        self._queue_url = queue_url
+        self._client = client
+        self._endpoint_url = endpoint_url
+        self._client_lock = Lock()
+
+    @property
+    def _sqs(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = create_sqs_client(self._endpoint_url)
+        return self._client
+
+    def send_all(self, messages: Iterable[dict]):
+        batch: List[dict] = []
+        for message in messages:
+            batch.append({"Id": str(len(batch)), "MessageBody": json.dumps(message)})
+            if len(batch) == SQS_MAX_BATCH_SIZE:
+                self._send_batch(batch)
+                batch = []
+        if batch:
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: List[dict]):
+        response = self._sqs.send_message_batch(QueueUrl=self._queue_url, Entries=batch)
+        if response.get("Failed"):
+            raise RuntimeError(f"Failed to send {len(response['Failed'])} messages to SQS")
+
+    def receive(
+        self, max_messages: int = SQS_MAX_BATCH_SIZE, wait_seconds: int = SQS_MAX_WAIT_SECONDS
+    ) -> List[Tuple[dict, str]]:
+        response = self._sqs.receive_message(
+            QueueUrl=self._queue_url,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=wait_seconds,
+        )
+        return [
+            (json.loads(message["Body"]), message["ReceiptHandle"])
+            for message in response.get("Messages", [])
+        ]
+
+    def delete(self, receipt_handle: str):
+        self._sqs.delete_message(QueueUrl=self._queue_url, ReceiptHandle=receipt_handle)
@@ -1,10 +1,11 @@
+import gzip
 import json
 import logging
 import sys
 from io import BytesIO
 from os import environ
 from threading import Thread
-from typing import Optional
+from typing import List, Optional
 from unittest import mock
 from unittest.mock import ANY
 
@@ -14,6 +15,7 @@ from moto.server import DomainDispatcherApplication, create_backend_app
 from werkzeug import Request, Response
 from werkzeug.serving import make_server
 
+from prmods.pipeline import backfill, metadata_publisher
 from prmods.pipeline.main import logger, main
 from tests.builders.file import build_gzip_csv
 
@@ -106,8 +108,12 @@ class ThreadedServer:
         self._thread.join()
 
 
+fake_ods_requests: List[dict] = []
+
+
 @Request.application
 def fake_ods_application(request):
+    fake_ods_requests.append(dict(request.args))
     primary_role = request.args.get("PrimaryRoleId")
     target_org_id = request.args.get("TargetOrgId")
     return Response(
@@ -236,6 +242,7 @@ def test_uploads_ods_metadata_when_date_anchor_month_asid_lookup_is_available_pr
             "date-anchor": "2020-01-30T18:44:49+00:00",
             "asid-lookup-month": "2020-1",
             "build-tag": "61ad1e1c",
+            "content-sha256": ANY,
         }
         actual_s3_metadata = _read_s3_metadata(output_bucket, output_path)
 
@@ -285,6 +292,7 @@ def test_uploads_ods_metadata_when_date_anchor_month_asid_lookup_is_available():
             "date-anchor": "2020-01-30T18:44:49+00:00",
             "asid-lookup-month": "2020-1",
             "build-tag": "61ad1e1c",
+            "content-sha256": ANY,
         }
         actual_s3_metadata = _read_s3_metadata(output_bucket, output_path)
 
@@ -336,6 +344,7 @@ def test_uploads_ods_metadata_when_date_anchor_month_asid_lookup_is_not_availabl
             "date-anchor": "2020-02-27T18:44:49+00:00",
             "asid-lookup-month": "2020-1",
             "build-tag": "61ad1e1c",
+            "content-sha256": ANY,
         }
         actual_s3_metadata = _read_s3_metadata(output_bucket, output_path)
 
@@ -353,6 +362,369 @@ def test_uploads_ods_metadata_when_date_anchor_month_asid_lookup_is_not_availabl
         environ.clear()
 
 
+def test_uploads_gzip_compressed_ods_metadata_alongside_uncompressed_ods_metadata():
+    _disable_werkzeug_logging()
+
+    fake_s3, fake_ods_portal, s3_client = _setup()
+    fake_s3.start()
+    fake_ods_portal.start()
+
+    year = 2020
+    month = 1
+
+    input_bucket = _build_fake_s3_bucket(S3_INPUT_ASID_LOOKUP_BUCKET_NAME, s3_client)
+    input_asid_csv = _build_input_asid_csv()
+    input_bucket.upload_fileobj(input_asid_csv, f"{year}/{month}/asidLookup.csv.gz")
+
+    output_bucket = _build_fake_s3_bucket(S3_OUTPUT_ODS_METADATA_BUCKET_NAME, s3_client)
+
+    try:
+        environ["DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
+        environ["OUTPUT_COMPRESSION"] = "gzip"
+
+        main()
+
+        output_path = f"v5/{year}/{month}/organisationMetadata.json"
+        compressed_output = output_bucket.Object(f"{output_path}.gz").get()
+        uncompressed_output = output_bucket.Object(output_path).get()
+
+        assert compressed_output["ContentEncoding"] == "gzip"
+        assert compressed_output["ContentType"] == "application/json"
+        assert (
+            gzip.decompress(compressed_output["Body"].read()) == uncompressed_output["Body"].read()
+        )
+        assert compressed_output["Metadata"] == uncompressed_output["Metadata"]
+
+    finally:
+        input_bucket.objects.all().delete()
+        input_bucket.delete()
+
+        output_bucket.objects.all().delete()
+        output_bucket.delete()
+
+        fake_ods_portal.stop()
+        fake_s3.stop()
+        environ.clear()
+
+
+def test_streams_gzip_compressed_and_uncompressed_ods_metadata():
+    _disable_werkzeug_logging()
+
+    fake_s3, fake_ods_portal, s3_client = _setup()
+    fake_s3.start()
+    fake_ods_portal.start()
+
+    year = 2020
+    month = 1
+
+    input_bucket = _build_fake_s3_bucket(S3_INPUT_ASID_LOOKUP_BUCKET_NAME, s3_client)
+    input_asid_csv = _build_input_asid_csv()
+    input_bucket.upload_fileobj(input_asid_csv, f"{year}/{month}/asidLookup.csv.gz")
+
+    output_bucket = _build_fake_s3_bucket(S3_OUTPUT_ODS_METADATA_BUCKET_NAME, s3_client)
+
+    try:
+        environ["DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
+        environ["OUTPUT_COMPRESSION"] = "gzip"
+        environ["STREAMING_PIPELINE"] = "True"
+
+        main()
+
+        output_path = f"v5/{year}/{month}/organisationMetadata.json"
+        actual = _read_s3_json_file(output_bucket, output_path)
+        compressed_output = output_bucket.Object(f"{output_path}.gz").get()
+
+        assert actual["practices"] == EXPECTED_PRACTICES
+        assert actual["sicbls"] == EXPECTED_SICBLS
+        assert compressed_output["ContentEncoding"] == "gzip"
+        assert json.loads(gzip.decompress(compressed_output["Body"].read())) == actual
+        assert _read_s3_metadata(output_bucket, output_path) == {
+            "date-anchor": "2020-01-30T18:44:49+00:00",
+            "asid-lookup-month": "2020-1",
+            "build-tag": "61ad1e1c",
+        }
+
+    finally:
+        input_bucket.objects.all().delete()
+        input_bucket.delete()
+
+        output_bucket.objects.all().delete()
+        output_bucket.delete()
+
+        fake_ods_portal.stop()
+        fake_s3.stop()
+        environ.clear()
+
+
+def test_skips_upload_when_ods_metadata_is_unchanged():
+    _disable_werkzeug_logging()
+
+    fake_s3, fake_ods_portal, s3_client = _setup()
+    fake_s3.start()
+    fake_ods_portal.start()
+
+    year = 2020
+    month = 1
+
+    input_bucket = _build_fake_s3_bucket(S3_INPUT_ASID_LOOKUP_BUCKET_NAME, s3_client)
+    input_asid_csv = _build_input_asid_csv()
+    input_bucket.upload_fileobj(input_asid_csv, f"{year}/{month}/asidLookup.csv.gz")
+
+    output_bucket = _build_fake_s3_bucket(S3_OUTPUT_ODS_METADATA_BUCKET_NAME, s3_client)
+
+    try:
+        environ["DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
+        output_path = f"v5/{year}/{month}/organisationMetadata.json"
+
+        main()
+        first_run_output = _read_s3_json_file(output_bucket, output_path)
+
+        with mock.patch.object(metadata_publisher.logger, "info") as mock_log_info:
+            main()
+        second_run_output = _read_s3_json_file(output_bucket, output_path)
+
+        mock_log_info.assert_any_call(
+            ANY,
+            extra={
+                "event": "METADATA_UNCHANGED_SKIPPED_UPLOAD",
+                "object_uri": f"s3://{S3_OUTPUT_ODS_METADATA_BUCKET_NAME}/{output_path}",
+                "content_hash": _read_s3_metadata(output_bucket, output_path)["content-sha256"],
+            },
+        )
+        assert second_run_output["generated_on"] == first_run_output["generated_on"]
+
+    finally:
+        input_bucket.objects.all().delete()
+        input_bucket.delete()
+
+        output_bucket.objects.all().delete()
+        output_bucket.delete()
+
+        fake_ods_portal.stop()
+        fake_s3.stop()
+        environ.clear()
+
+
+def test_uploads_ods_metadata_delta_against_previous_month():
+    _disable_werkzeug_logging()
+
+    fake_s3, fake_ods_portal, s3_client = _setup()
+    fake_s3.start()
+    fake_ods_portal.start()
+
+    year = 2020
+    month = 2
+
+    input_bucket = _build_fake_s3_bucket(S3_INPUT_ASID_LOOKUP_BUCKET_NAME, s3_client)
+    input_asid_csv = _build_input_asid_csv()
+    input_bucket.upload_fileobj(input_asid_csv, f"{year}/{month}/asidLookup.csv.gz")
+
+    output_bucket = _build_fake_s3_bucket(S3_OUTPUT_ODS_METADATA_BUCKET_NAME, s3_client)
+    previous_month_metadata = {
+        "generated_on": "2020-01-30T18:44:49+00:00",
+        "year": year,
+        "month": 1,
+        "practices": [
+            {"ods_code": "A12345", "name": "Test GP", "asids": ["000011357014"]},
+            {"ods_code": "B12345", "name": "Test GP 2", "asids": ["000022357014"]},
+            {"ods_code": "Z12345", "name": "Closed GP", "asids": ["000099357014"]},
+        ],
+        "sicbls": [
+            {"ods_code": "12A", "name": "Test SICBL", "practices": ["A12345", "B12345"]},
+        ],
+    }
+    output_bucket.Object(f"v5/{year}/1/organisationMetadata.json").put(
+        Body=json.dumps(previous_month_metadata)
+    )
+
+    try:
+        environ["DATE_ANCHOR"] = "2020-02-27T18:44:49Z"
+        environ["WRITE_METADATA_DELTA"] = "True"
+
+        main()
+
+        actual = _read_s3_json_file(
+            output_bucket, f"v5/{year}/{month}/organisationMetadataDelta.json"
+        )
+
+        assert (actual["previous_year"], actual["previous_month"]) == (year, 1)
+        assert (actual["year"], actual["month"]) == (year, month)
+        assert [practice["ods_code"] for practice in actual["added_practices"]] == [
+            "C12345",
+            "P12346",
+            "P12347",
+        ]
+        assert actual["removed_practices"] == [
+            {"ods_code": "Z12345", "name": "Closed GP", "asids": ["000099357014"]}
+        ]
+        assert actual["asid_changes"] == []
+        assert actual["sicbl_changes"] == [
+            {"ods_code": "B12345", "previous_sicbls": ["12A"], "current_sicbls": ["14C"]}
+        ]
+        assert _read_s3_metadata(
+            output_bucket, f"v5/{year}/{month}/organisationMetadataDelta.json"
+        ) == {
+            "date-anchor": "2020-02-27T18:44:49+00:00",
+            "asid-lookup-month": "2020-2",
+            "build-tag": "61ad1e1c",
+        }
+
+    finally:
+        input_bucket.objects.all().delete()
+        input_bucket.delete()
+
+        output_bucket.objects.all().delete()
+        output_bucket.delete()
+
+        fake_ods_portal.stop()
+        fake_s3.stop()
+        environ.clear()
+
+
+def test_writes_observability_events_file_to_staging():
+    _disable_werkzeug_logging()
+
+    fake_s3, fake_ods_portal, s3_client = _setup()
+    fake_s3.start()
+    fake_ods_portal.start()
+
+    year = 2020
+    month = 1
+
+    input_bucket = _build_fake_s3_bucket(S3_INPUT_ASID_LOOKUP_BUCKET_NAME, s3_client)
+    input_asid_csv = _build_input_asid_csv()
+    input_bucket.upload_fileobj(input_asid_csv, f"{year}/{month}/asidLookup.csv.gz")
+
+    output_bucket = _build_fake_s3_bucket(S3_OUTPUT_ODS_METADATA_BUCKET_NAME, s3_client)
+
+    try:
+        environ["DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
+        environ["AGGREGATE_OBSERVABILITY_EVENTS"] = "True"
+        environ["WRITE_OBSERVABILITY_EVENTS_FILE"] = "True"
+
+        main()
+
+        actual = _read_s3_json_file(
+            output_bucket, f"staging/{year}/{month}/observabilityEvents.json"
+        )
+        published_keys = [obj.key for obj in output_bucket.objects.filter(Prefix="v5/")]
+
+        assert actual == {"DUPLICATE_ODS_CODE_FOUND": ["B12345"]}
+        assert f"v5/{year}/{month}/observabilityEvents.json" not in published_keys
+
+    finally:
+        input_bucket.objects.all().delete()
+        input_bucket.delete()
+
+        output_bucket.objects.all().delete()
+        output_bucket.delete()
+
+        fake_ods_portal.stop()
+        fake_s3.stop()
+        environ.clear()
+
+
+def test_backfills_each_month_from_a_single_ods_crawl():
+    _disable_werkzeug_logging()
+
+    fake_s3, fake_ods_portal, s3_client = _setup()
+    fake_s3.start()
+    fake_ods_portal.start()
+
+    year = 2020
+
+    input_bucket = _build_fake_s3_bucket(S3_INPUT_ASID_LOOKUP_BUCKET_NAME, s3_client)
+    input_asid_csv = _build_input_asid_csv()
+    input_bucket.upload_fileobj(input_asid_csv, f"{year}/1/asidLookup.csv.gz")
+
+    output_bucket = _build_fake_s3_bucket(S3_OUTPUT_ODS_METADATA_BUCKET_NAME, s3_client)
+
+    try:
+        environ["BACKFILL_START_MONTH"] = "2020-01"
+        environ["BACKFILL_END_MONTH"] = "2020-02"
+        fake_ods_requests.clear()
+
+        backfill.main()
+
+        for month in [1, 2]:
+            output_path = f"v5/{year}/{month}/organisationMetadata.json"
+            actual = _read_s3_json_file(output_bucket, output_path)
+
+            assert (actual["year"], actual["month"]) == (year, month)
+            assert actual["practices"] == EXPECTED_PRACTICES
+            assert actual["sicbls"] == EXPECTED_SICBLS
+            assert _read_s3_metadata(output_bucket, output_path) == {
+                "date-anchor": f"2020-0{month}-01T00:00:00+00:00",
+                "asid-lookup-month": "2020-1",
+                "build-tag": "61ad1e1c",
+                "content-sha256": ANY,
+            }
+
+        assert len(fake_ods_requests) == 5
+
+    finally:
+        input_bucket.objects.all().delete()
+        input_bucket.delete()
+
+        output_bucket.objects.all().delete()
+        output_bucket.delete()
+
+        fake_ods_portal.stop()
+        fake_s3.stop()
+        environ.clear()
+
+
+def test_replays_ods_snapshot_without_calling_ods_portal():
+    _disable_werkzeug_logging()
+
+    fake_s3, fake_ods_portal, s3_client = _setup()
+    fake_s3.start()
+    fake_ods_portal.start()
+
+    year = 2020
+    month = 1
+
+    input_bucket = _build_fake_s3_bucket(S3_INPUT_ASID_LOOKUP_BUCKET_NAME, s3_client)
+    input_asid_csv = _build_input_asid_csv()
+    input_bucket.upload_fileobj(input_asid_csv, f"{year}/{month}/asidLookup.csv.gz")
+
+    output_bucket = _build_fake_s3_bucket(S3_OUTPUT_ODS_METADATA_BUCKET_NAME, s3_client)
+    output_path = f"v5/{year}/{month}/organisationMetadata.json"
+
+    try:
+        environ["DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
+        environ["WRITE_ODS_SNAPSHOT"] = "True"
+        environ["ODS_SNAPSHOT_ID"] = "snapshot-1"
+
+        main()
+
+        written = _read_s3_json_file(output_bucket, output_path)
+        output_bucket.Object(output_path).delete()
+
+        del environ["WRITE_ODS_SNAPSHOT"]
+        environ["REPLAY_ODS_SNAPSHOT"] = "True"
+        fake_ods_requests.clear()
+
+        main()
+
+        replayed = _read_s3_json_file(output_bucket, output_path)
+
+        assert replayed["practices"] == written["practices"] == EXPECTED_PRACTICES
+        assert replayed["sicbls"] == written["sicbls"] == EXPECTED_SICBLS
+        assert fake_ods_requests == []
+
+    finally:
+        input_bucket.objects.all().delete()
+        input_bucket.delete()
+
+        output_bucket.objects.all().delete()
+        output_bucket.delete()
+
+        fake_ods_portal.stop()
+        fake_s3.stop()
+        environ.clear()
+
+
 def test_exception_in_main():
     with mock.patch.object(sys, "exit") as exitSpy:
         with mock.patch.object(logger, "error") as mock_log_error:
@@ -0,0 +1,287 @@
+import json
+import time
+from threading import Lock, Thread
+from typing import Callable, List
+from unittest.mock import Mock
+
+import pytest
+from werkzeug import Request, Response
+from werkzeug.serving import make_server
+
+from prmods.domain.ods_portal.adaptive_concurrency import (
+    CONCURRENCY_DECREASED,
+    CONCURRENCY_INCREASED,
+    AdaptiveSicblPracticesFetcher,
+    AimdConcurrencyLimiter,
+)
+from prmods.domain.ods_portal.ods_portal_client import OdsPortalClient, OdsPortalException
+from prmods.domain.ods_portal.ods_portal_data_fetcher import (
+    OdsPortalDataFetcher,
+    OrganisationDetails,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeOdsPortal:
+    """
+    Answers SICBL practice queries after a programmed latency, which may depend on the
+    number of requests in flight, and with 429 when more than capacity are in flight.
+    """
+
+    def __init__(self, latency_seconds: Callable[[int], float], capacity: int = 1000):
+        self._latency_seconds = latency_seconds
+        self._capacity = capacity
+        self._lock = Lock()
+        self._in_flight = 0
+        self.max_in_flight = 0
+        self.throttled_count = 0
+        self._server = make_server(
+            "127.0.0.1", 0, Request.application(self._respond), threaded=True
+        )
+        self._thread = Thread(target=self._server.serve_forever)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def _respond(self, request: Request) -> Response:
+        with self._lock:
+            self._in_flight += 1
+            in_flight = self._in_flight
+            self.max_in_flight = max(self.max_in_flight, in_flight)
+        try:
+            if in_flight > self._capacity:
+                with self._lock:
+                    self.throttled_count += 1
+                return Response(status=429)
+            time.sleep(self._latency_seconds(in_flight))
+            sicbl_ods_code = request.args["TargetOrgId"]
+            organisations = [{"OrgId": f"{sicbl_ods_code}-P", "Name": "A Practice"}]
+            return Response(
+                json.dumps({"Organisations": organisations}), mimetype="application/json"
+            )
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._thread.join()
+
+
+def _logged_events(logger: Mock) -> List[str]:
+    return [call.kwargs["extra"]["event"] for call in logger.info.call_args_list]
+
+
+def _complete(limiter: AimdConcurrencyLimiter, clock: FakeClock, latency_seconds: float):
+    with limiter.slot():
+        clock.now += latency_seconds
+
+
+def _throttle(limiter: AimdConcurrencyLimiter, status_code: int = 429):
+    with pytest.raises(OdsPortalException):
+        with limiter.slot():
+            raise OdsPortalException("Unable to fetch organisation data", status_code)
+
+
+def _sicbls(count: int) -> List[OrganisationDetails]:
+    return [OrganisationDetails(ods_code=f"S{index:02}", name="A SICBL") for index in range(count)]
+
+
+def test_limiter_increases_limit_by_one_per_round_of_healthy_responses():
+    clock = FakeClock()
+    logger = Mock()
+    limiter = AimdConcurrencyLimiter(initial_limit=2, clock=clock, logger=logger)
+
+    for _ in range(3):
+        _complete(limiter, clock, 0.1)
+
+    assert limiter.limit == 3
+    assert _logged_events(logger) == [CONCURRENCY_INCREASED]
+
+
+def test_limiter_does_not_exceed_max_limit():
+    clock = FakeClock()
+    limiter = AimdConcurrencyLimiter(initial_limit=2, max_limit=3, clock=clock, logger=Mock())
+
+    for _ in range(20):
+        _complete(limiter, clock, 0.1)
+
+    assert limiter.limit == 3
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 503])
+def test_limiter_halves_limit_when_ods_throttles(status_code):
+    logger = Mock()
+    limiter = AimdConcurrencyLimiter(initial_limit=8, logger=logger)
+
+    _throttle(limiter, status_code)
+
+    assert limiter.limit == 4
+    assert _logged_events(logger) == [CONCURRENCY_DECREASED]
+    assert logger.info.call_args.kwargs["extra"]["reason"] == f"ODS returned {status_code}"
+
+
+def test_limiter_keeps_limit_on_other_errors():
+    limiter = AimdConcurrencyLimiter(initial_limit=8, logger=Mock())
+
+    _throttle(limiter, 404)
+
+    assert limiter.limit == 8
+
+
+def test_limiter_does_not_go_below_min_limit():
+    limiter = AimdConcurrencyLimiter(initial_limit=2, min_limit=1, logger=Mock())
+
+    for _ in range(3):
+        _throttle(limiter)
+
+    assert limiter.limit == 1
+
+
+def test_limiter_halves_limit_on_latency_spike():
+    clock = FakeClock()
+    logger = Mock()
+    limiter = AimdConcurrencyLimiter(
+        initial_limit=8, max_limit=8, latency_spike_factor=3.0, clock=clock, logger=logger
+    )
+
+    for _ in range(5):
+        _complete(limiter, clock, 0.1)
+    _complete(limiter, clock, 0.5)
+
+    assert limiter.limit == 4
+    assert logger.info.call_args.kwargs["extra"]["reason"] == "latency spike"
+
+
+def test_limiter_grows_again_after_latency_shifts_to_a_new_level():
+    clock = FakeClock()
+    logger = Mock()
+    limiter = AimdConcurrencyLimiter(
+        initial_limit=8, max_limit=8, latency_spike_factor=3.0, clock=clock, logger=logger
+    )
+
+    for _ in range(10):
+        _complete(limiter, clock, 0.1)
+    for _ in range(20):
+        _complete(limiter, clock, 1.0)
+
+    assert _logged_events(logger).count(CONCURRENCY_DECREASED) == 2
+    assert _logged_events(logger)[-1] == CONCURRENCY_INCREASED
+    assert limiter.limit > 2
+
+
+def test_limiter_decreases_once_for_requests_started_at_the_same_limit():
+    limiter = AimdConcurrencyLimiter(initial_limit=8, logger=Mock())
+
+    with pytest.raises(OdsPortalException):
+        with limiter.slot():
+            _throttle(limiter)
+            raise OdsPortalException("Unable to fetch organisation data", 429)
+
+    assert limiter.limit == 4
+
+
+def test_adaptive_fetcher_fetches_practices_for_each_sicbl():
+    with FakeOdsPortal(latency_seconds=lambda in_flight: 0.01) as portal:
+        data_source = OdsPortalDataFetcher(OdsPortalClient(search_url=portal.url))
+        limiter = AimdConcurrencyLimiter(initial_limit=2, max_limit=8, logger=Mock())
+        fetcher = AdaptiveSicblPracticesFetcher(data_source, limiter, max_workers=8)
+
+        sicbl_practices = fetcher.fetch_sicbl_practices(_sicbls(30))
+
+    assert sicbl_practices == {
+        f"S{index:02}": [OrganisationDetails(ods_code=f"S{index:02}-P", name="A Practice")]
+        for index in range(30)
+    }
+    assert limiter.limit > 2
+    assert portal.max_in_flight <= 8
+
+
+def test_adaptive_fetcher_backs_off_and_retries_when_server_throttles():
+    logger = Mock()
+    with FakeOdsPortal(latency_seconds=lambda in_flight: 0.02, capacity=3) as portal:
+        data_source = OdsPortalDataFetcher(OdsPortalClient(search_url=portal.url))
+        limiter = AimdConcurrencyLimiter(initial_limit=8, max_limit=16, logger=logger)
+        fetcher = AdaptiveSicblPracticesFetcher(
+            data_source, limiter, max_workers=16, backoff_seconds=0.01
+        )
+
+        sicbl_practices = fetcher.fetch_sicbl_practices(_sicbls(30))
+
+    assert len(sicbl_practices) == 30
+    assert portal.throttled_count > 0
+    assert CONCURRENCY_DECREASED in _logged_events(logger)
+
+
+def test_adaptive_fetcher_backs_off_when_latency_rises_with_load():
+    logger = Mock()
+    with FakeOdsPortal(latency_seconds=lambda in_flight: 0.01 if in_flight <= 2 else 0.2) as portal:
+        data_source = OdsPortalDataFetcher(OdsPortalClient(search_url=portal.url))
+        limiter = AimdConcurrencyLimiter(initial_limit=2, max_limit=8, logger=logger)
+        fetcher = AdaptiveSicblPracticesFetcher(data_source, limiter, max_workers=8)
+
+        sicbl_practices = fetcher.fetch_sicbl_practices(_sicbls(30))
+
+    assert len(sicbl_practices) == 30
+    decreases = [
+        call.kwargs["extra"]["reason"]
+        for call in logger.info.call_args_list
+        if call.kwargs["extra"]["event"] == CONCURRENCY_DECREASED
+    ]
+    assert "latency spike" in decreases
+
+
+def test_adaptive_fetcher_raises_when_query_keeps_failing():
+    data_source = Mock()
+    data_source.fetch_practices_for_sicbl.side_effect = OdsPortalException("Unavailable", 503)
+    limiter = AimdConcurrencyLimiter(logger=Mock())
+    fetcher = AdaptiveSicblPracticesFetcher(data_source, limiter, max_attempts=3, sleep=Mock())
+
+    with pytest.raises(OdsPortalException):
+        fetcher.fetch_sicbl_practices(_sicbls(1))
+
+    assert data_source.fetch_practices_for_sicbl.call_count == 3
+
+
+def test_adaptive_fetcher_backs_off_exponentially_before_retrying_throttled_query():
+    data_source = Mock()
+    data_source.fetch_practices_for_sicbl.side_effect = [
+        OdsPortalException("Too many requests", 429),
+        OdsPortalException("Too many requests", 429),
+        [],
+    ]
+    sleep = Mock()
+    limiter = AimdConcurrencyLimiter(logger=Mock())
+    fetcher = AdaptiveSicblPracticesFetcher(data_source, limiter, backoff_seconds=1.0, sleep=sleep)
+
+    assert fetcher.fetch_sicbl_practices(_sicbls(1)) == {"S00": []}
+
+    first_backoff, second_backoff = [call.args[0] for call in sleep.call_args_list]
+    assert 0 <= first_backoff <= 1.0
+    assert 0 <= second_backoff <= 2.0
+
+
+def test_adaptive_fetcher_does_not_retry_other_errors():
+    data_source = Mock()
+    data_source.fetch_practices_for_sicbl.side_effect = OdsPortalException("Not found", 404)
+    sleep = Mock()
+    limiter = AimdConcurrencyLimiter(logger=Mock())
+    fetcher = AdaptiveSicblPracticesFetcher(data_source, limiter, sleep=sleep)
+
+    with pytest.raises(OdsPortalException):
+        fetcher.fetch_sicbl_practices(_sicbls(1))
+
+    assert data_source.fetch_practices_for_sicbl.call_count == 1
+    sleep.assert_not_called()
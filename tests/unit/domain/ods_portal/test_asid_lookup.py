@@ -1,4 +1,17 @@
-from prmods.domain.ods_portal.asid_lookup import AsidLookup, OdsAsid
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pytest
+
+from prmods.domain.ods_portal.asid_lookup import (
+    AsidLookup,
+    InvalidSpineDirectoryExtract,
+    OdsAsid,
+    _map_in_order,
+    _parse_spine_directory_chunk,
+    parse_spine_directory_chunks,
+)
+from prmods.utils.io.chunks import iter_line_aligned_chunks
 
 
 def test_get_asids_returns_correct_asids_given_one_mapping():
@@ -100,3 +113,73 @@ def test_build_asid_lookup_from_spine_directory_format():
 
     assert actual_asids == expected_asids
     assert actual_is_in_mapping == expected_is_in_mapping
+
+
+def test_parse_spine_directory_chunks_keeps_asid_order_across_chunks():
+    chunks = [
+        "ASID,NACS,OrgName\n000011357014,A12345,Test GP\n",
+        "000022357014,B12345,Test GP 2\n000033357014,A12345,Test GP\n",
+        '123433357014,A12345,"Test GP, Branch"\n000044357014,B12345,Test GP 2',
+    ]
+
+    asid_lookup = parse_spine_directory_chunks(chunks, max_workers=2)
+
+    assert asid_lookup.get_asids("A12345") == ["000011357014", "000033357014", "123433357014"]
+    assert asid_lookup.get_asids("B12345") == ["000022357014", "000044357014"]
+    assert len(asid_lookup) == 2
+
+
+def test_parse_spine_directory_chunks_keeps_quoted_newlines_within_a_row():
+    chunks = iter_line_aligned_chunks(
+        StringIO(
+            'ASID,NACS,OrgName\n000011357014,A12345,"Test GP\nBranch"\n000022357014,B12345,GP\n'
+        ),
+        chunk_size=8,
+    )
+
+    asid_lookup = parse_spine_directory_chunks(chunks, max_workers=2)
+
+    assert asid_lookup.get_asids("A12345") == ["000011357014"]
+    assert asid_lookup.get_asids("B12345") == ["000022357014"]
+    assert len(asid_lookup) == 2
+
+
+def test_parse_spine_directory_chunk_skips_and_logs_short_rows(caplog):
+    chunk = "000011357014,A12345,Test GP\n000022357014\n\n000033357014,A12345,Test GP\n"
+
+    partial_mapping = _parse_spine_directory_chunk(1, 0, chunk)
+
+    assert partial_mapping == {"A12345": ["000011357014", "000033357014"]}
+    assert [record.event for record in caplog.records] == ["SKIPPED_SHORT_SPINE_DIRECTORY_ROW"]
+
+
+@pytest.mark.parametrize(
+    "chunks, message",
+    [
+        ([], "Spine directory extract is empty"),
+        ([""], "Spine directory extract is empty"),
+        (["ASID,OrgName\n000011357014,Test GP\n"], "missing columns: NACS"),
+    ],
+)
+def test_parse_spine_directory_chunks_raises_when_extract_has_no_header(chunks, message):
+    with pytest.raises(InvalidSpineDirectoryExtract, match=message):
+        parse_spine_directory_chunks(chunks, max_workers=1)
+
+
+def test_map_in_order_limits_items_submitted_ahead_of_results():
+    items_read = []
+
+    def items():
+        for item in range(10):
+            items_read.append(item)
+            yield item
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = _map_in_order(executor, lambda item: item * 2, items(), max_in_flight=3)
+        first_result = next(results)
+        items_read_before_first_result = len(items_read)
+        remaining_results = list(results)
+
+    assert first_result == 0
+    assert items_read_before_first_result == 3
+    assert remaining_results == [item * 2 for item in range(1, 10)]
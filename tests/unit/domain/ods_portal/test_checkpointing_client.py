@@ -0,0 +1,56 @@
+from unittest.mock import Mock
+
+import pytest
+
+from prmods.domain.ods_portal.checkpointing_client import CheckpointingOdsPortalClient
+from prmods.domain.ods_portal.ods_portal_client import OdsPortalException, ods_query_key
+from prmods.utils.io.json_store import LocalJsonStore
+from tests.builders.ods_portal import build_ods_organisation_data_response
+
+SICBL_12A_PARAMS = {"TargetOrgId": "12A", "RelTypeId": "RE4", "Limit": "1000"}
+SICBL_13B_PARAMS = {"TargetOrgId": "13B", "RelTypeId": "RE4", "Limit": "1000"}
+
+
+def test_ods_query_key_does_not_depend_on_parameter_order():
+    assert ods_query_key({"a": "1", "b": "2"}) == ods_query_key({"b": "2", "a": "1"})
+    assert ods_query_key({"a": "1"}) != ods_query_key({"a": "2"})
+
+
+def test_restarted_run_only_fetches_queries_that_are_left(tmp_path):
+    practice = build_ods_organisation_data_response(name="GP Practice", org_id="A12345")
+    failing_ods_client = Mock()
+    failing_ods_client.fetch_organisation_data.side_effect = [
+        [practice],
+        OdsPortalException("Unable to fetch organisation data", 500),
+    ]
+    first_attempt = CheckpointingOdsPortalClient(
+        failing_ods_client, LocalJsonStore(str(tmp_path)), run_id="run-1"
+    )
+    first_attempt.fetch_organisation_data(SICBL_12A_PARAMS)
+    with pytest.raises(OdsPortalException):
+        first_attempt.fetch_organisation_data(SICBL_13B_PARAMS)
+
+    ods_client = Mock()
+    ods_client.fetch_organisation_data.return_value = []
+    second_attempt = CheckpointingOdsPortalClient(
+        ods_client, LocalJsonStore(str(tmp_path)), run_id="run-1"
+    )
+
+    assert second_attempt.fetch_organisation_data(SICBL_12A_PARAMS) == [practice]
+    assert second_attempt.fetch_organisation_data(SICBL_13B_PARAMS) == []
+    ods_client.fetch_organisation_data.assert_called_once_with(SICBL_13B_PARAMS)
+
+
+def test_does_not_reuse_checkpoints_from_a_different_run(tmp_path):
+    ods_client = Mock()
+    ods_client.fetch_organisation_data.return_value = []
+    store = LocalJsonStore(str(tmp_path))
+
+    CheckpointingOdsPortalClient(ods_client, store, run_id="run-1").fetch_organisation_data(
+        SICBL_12A_PARAMS
+    )
+    CheckpointingOdsPortalClient(ods_client, store, run_id="run-2").fetch_organisation_data(
+        SICBL_12A_PARAMS
+    )
+
+    assert ods_client.fetch_organisation_data.call_count == 2
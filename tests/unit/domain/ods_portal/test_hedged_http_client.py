@@ -0,0 +1,187 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Timer
+from unittest.mock import Mock
+
+import pytest
+
+from prmods.domain.ods_portal.hedged_http_client import (
+    HedgedHttpClient,
+    HedgedRequestStats,
+    LatencyTracker,
+)
+
+
+class FakeHttpClient:
+    """Answers each call with the next programmed response once its event is set."""
+
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self.calls = 0
+
+    def get(self, *args):
+        release, response = self._responses[self.calls]
+        self.calls += 1
+        release.wait(timeout=5)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _released() -> Event:
+    event = Event()
+    event.set()
+    return event
+
+
+def test_latency_tracker_uses_initial_threshold_until_enough_samples():
+    tracker = LatencyTracker(percentile=95, initial_threshold_seconds=2.0, min_samples=3)
+
+    tracker.record(0.1)
+    tracker.record(0.2)
+
+    assert tracker.threshold_seconds() == 2.0
+
+
+def test_latency_tracker_returns_percentile_of_recent_latencies():
+    tracker = LatencyTracker(percentile=95, min_samples=1, window_size=100)
+
+    for latency in range(200):
+        tracker.record(latency / 1000)
+
+    assert tracker.threshold_seconds() == 0.194
+
+
+def test_returns_primary_response_without_hedging_when_fast():
+    primary_response = Mock()
+    http_client = FakeHttpClient((_released(), primary_response))
+    client = HedgedHttpClient(http_client, LatencyTracker(initial_threshold_seconds=1.0))
+
+    assert client.get("https://ods") is primary_response
+    assert (client.stats.requests_sent, client.stats.hedges_fired) == (1, 0)
+
+
+def test_hedge_wins_when_primary_is_slow():
+    slow_primary = Event()
+    hedge_response = Mock(status_code=200)
+    http_client = FakeHttpClient(
+        (slow_primary, Mock(status_code=200)), (_released(), hedge_response)
+    )
+    client = HedgedHttpClient(
+        http_client, LatencyTracker(initial_threshold_seconds=0.01), max_percent=100
+    )
+
+    actual = client.get("https://ods")
+    slow_primary.set()
+
+    assert actual is hedge_response
+    assert (client.stats.requests_sent, client.stats.hedges_fired) == (1, 1)
+    assert client.stats.hedges_won == 1
+
+
+def test_uses_primary_response_when_hedge_fails():
+    primary_released = Event()
+    primary_response = Mock(status_code=200)
+    http_client = FakeHttpClient(
+        (primary_released, primary_response), (_released(), RuntimeError("connection reset"))
+    )
+    client = HedgedHttpClient(
+        http_client, LatencyTracker(initial_threshold_seconds=0.01), max_percent=100
+    )
+
+    Timer(0.1, primary_released.set).start()
+    actual = client.get("https://ods")
+
+    assert actual is primary_response
+    assert (client.stats.hedges_fired, client.stats.hedges_won) == (1, 0)
+
+
+def test_waits_for_slow_success_when_other_request_returns_error_first():
+    primary_released = Event()
+    primary_response = Mock(status_code=200)
+    http_client = FakeHttpClient(
+        (primary_released, primary_response), (_released(), Mock(status_code=500))
+    )
+    client = HedgedHttpClient(
+        http_client, LatencyTracker(initial_threshold_seconds=0.01), max_percent=100
+    )
+
+    Timer(0.1, primary_released.set).start()
+    actual = client.get("https://ods")
+
+    assert actual is primary_response
+    assert (client.stats.hedges_fired, client.stats.hedges_won) == (1, 0)
+
+
+def test_returns_primary_response_when_neither_request_succeeds():
+    primary_released = Event()
+    primary_response = Mock(status_code=503)
+    http_client = FakeHttpClient(
+        (primary_released, primary_response), (_released(), Mock(status_code=500))
+    )
+    client = HedgedHttpClient(
+        http_client, LatencyTracker(initial_threshold_seconds=0.01), max_percent=100
+    )
+
+    Timer(0.1, primary_released.set).start()
+    actual = client.get("https://ods")
+
+    assert actual is primary_response
+
+
+def test_does_not_hedge_beyond_cap():
+    slow_primary = Event()
+    primary_response = Mock()
+    http_client = FakeHttpClient((slow_primary, primary_response))
+    client = HedgedHttpClient(
+        http_client, LatencyTracker(initial_threshold_seconds=0.01), max_percent=10
+    )
+
+    Timer(0.05, slow_primary.set).start()
+
+    assert client.get("https://ods") is primary_response
+    assert (client.stats.requests_sent, client.stats.hedges_fired) == (1, 0)
+
+
+def test_raises_when_primary_fails_before_threshold():
+    http_client = FakeHttpClient((_released(), RuntimeError("primary failed")))
+    client = HedgedHttpClient(http_client, LatencyTracker(initial_threshold_seconds=1.0))
+
+    with pytest.raises(RuntimeError, match="primary failed"):
+        client.get("https://ods")
+
+
+def test_does_not_count_time_queued_for_a_pool_thread_towards_threshold():
+    http_client = Mock()
+    http_client.get.side_effect = lambda *args: time.sleep(0.1)
+    client = HedgedHttpClient(
+        http_client,
+        LatencyTracker(initial_threshold_seconds=0.2),
+        max_percent=100,
+        max_workers=1,
+    )
+
+    with ThreadPoolExecutor(max_workers=3) as callers:
+        for _ in range(3):
+            callers.submit(client.get, "https://ods")
+
+    assert (client.stats.requests_sent, client.stats.hedges_fired) == (3, 0)
+
+
+def test_cannot_send_requests_once_closed():
+    client = HedgedHttpClient(FakeHttpClient((_released(), Mock())))
+
+    client.close()
+
+    with pytest.raises(RuntimeError):
+        client.get("https://ods")
+
+
+def test_hedged_request_stats_caps_hedges_at_percent_of_requests():
+    stats = HedgedRequestStats()
+    for _ in range(20):
+        stats.record_request()
+
+    fired = [stats.try_fire_hedge(max_percent=10) for _ in range(3)]
+
+    assert fired == [True, True, False]
@@ -0,0 +1,99 @@
+from datetime import datetime
+from typing import List
+
+from prmods.domain.ods_portal.metadata_delta import (
+    PracticeAsidChange,
+    PracticeSicblChange,
+    compute_metadata_delta,
+)
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+
+
+def _build_metadata(
+    month: int, practices: List[PracticeDetails], sicbls: List[SicblDetails]
+) -> OrganisationMetadata:
+    return OrganisationMetadata(
+        generated_on=datetime(2020, month, 1),
+        year=2020,
+        month=month,
+        practices=practices,
+        sicbls=sicbls,
+    )
+
+
+def test_returns_empty_delta_given_identical_metadata():
+    practices = [PracticeDetails(ods_code="A12345", name="GP Practice", asids=["111"])]
+    sicbls = [SicblDetails(ods_code="12A", name="SICBL", practices=["A12345"])]
+
+    actual = compute_metadata_delta(
+        _build_metadata(1, practices, sicbls), _build_metadata(2, practices, sicbls)
+    )
+
+    assert actual.added_practices == []
+    assert actual.removed_practices == []
+    assert actual.asid_changes == []
+    assert actual.sicbl_changes == []
+    assert (actual.previous_year, actual.previous_month) == (2020, 1)
+    assert (actual.year, actual.month) == (2020, 2)
+
+
+def test_returns_added_and_removed_practices():
+    retained_practice = PracticeDetails(ods_code="A12345", name="GP Practice", asids=["111"])
+    closed_practice = PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["222"])
+    new_practice = PracticeDetails(ods_code="C12345", name="GP Practice 3", asids=["333"])
+
+    actual = compute_metadata_delta(
+        _build_metadata(1, [retained_practice, closed_practice], []),
+        _build_metadata(2, [new_practice, retained_practice], []),
+    )
+
+    assert actual.added_practices == [new_practice]
+    assert actual.removed_practices == [closed_practice]
+
+
+def test_returns_asid_changes_for_retained_practices():
+    previous_practices = [
+        PracticeDetails(ods_code="A12345", name="GP Practice", asids=["111", "222"]),
+        PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["333"]),
+    ]
+    current_practices = [
+        PracticeDetails(ods_code="A12345", name="GP Practice", asids=["222", "444"]),
+        PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["333"]),
+    ]
+
+    actual = compute_metadata_delta(
+        _build_metadata(1, previous_practices, []), _build_metadata(2, current_practices, [])
+    )
+
+    expected = [PracticeAsidChange(ods_code="A12345", added_asids=["444"], removed_asids=["111"])]
+
+    assert actual.asid_changes == expected
+
+
+def test_returns_practices_moving_between_sicbls():
+    practices = [
+        PracticeDetails(ods_code="A12345", name="GP Practice", asids=["111"]),
+        PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["222"]),
+    ]
+    previous_sicbls = [
+        SicblDetails(ods_code="12A", name="SICBL", practices=["A12345", "B12345"]),
+    ]
+    current_sicbls = [
+        SicblDetails(ods_code="12A", name="SICBL", practices=["B12345"]),
+        SicblDetails(ods_code="34B", name="SICBL 2", practices=["A12345"]),
+    ]
+
+    actual = compute_metadata_delta(
+        _build_metadata(1, practices, previous_sicbls),
+        _build_metadata(2, practices, current_sicbls),
+    )
+
+    expected = [
+        PracticeSicblChange(ods_code="A12345", previous_sicbls=["12A"], current_sicbls=["34B"])
+    ]
+
+    assert actual.sicbl_changes == expected
@@ -0,0 +1,125 @@
+import json
+from dataclasses import asdict
+from datetime import datetime
+
+from dateutil.tz import tzutc
+
+from prmods.domain.ods_portal.metadata_encoder import (
+    content_hash,
+    encode_organisation_metadata,
+    iter_encode_organisation_metadata,
+)
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+from prmods.utils.io.s3 import _serialize_datetime
+
+
+def _legacy_encode(metadata: OrganisationMetadata) -> str:
+    return json.dumps(asdict(metadata), default=_serialize_datetime)
+
+
+def test_encodes_metadata_identically_to_asdict_and_json_dumps():
+    metadata = OrganisationMetadata(
+        generated_on=datetime(2020, 1, 30, 18, 44, 49, 123456, tzinfo=tzutc()),
+        year=2020,
+        month=1,
+        practices=[
+            PracticeDetails(ods_code="A12345", name="GP Practice", asids=["123456781234"]),
+            PracticeDetails(ods_code="B12345", name="Ysbyty Ŵy", asids=[]),
+            PracticeDetails(ods_code="C12345", name='"Quoted"\\Practice\n', asids=["1", "2", "3"]),
+        ],
+        sicbls=[
+            SicblDetails(ods_code="12A", name="SICBL", practices=["A12345", "C12345"]),
+            SicblDetails(ods_code="34B", name="SICBL 2", practices=[]),
+        ],
+    )
+
+    expected = _legacy_encode(metadata)
+    actual = encode_organisation_metadata(metadata)
+
+    assert actual == expected
+
+
+def test_encodes_metadata_without_practices_or_sicbls_identically_to_json_dumps():
+    metadata = OrganisationMetadata(
+        generated_on=datetime(2019, 6, 2, 23, 0, 42), year=2019, month=6, practices=[], sicbls=[]
+    )
+
+    expected = _legacy_encode(metadata)
+    actual = encode_organisation_metadata(metadata)
+
+    assert actual == expected
+
+
+def test_iter_encode_yields_chunks_of_the_same_document():
+    metadata = OrganisationMetadata.from_practice_and_sicbl_lists(
+        practices=[PracticeDetails(ods_code="A12345", name="GP Practice", asids=["1"])],
+        sicbls=[SicblDetails(ods_code="12A", name="SICBL", practices=["A12345"])],
+        year=2020,
+        month=2,
+    )
+
+    chunks = list(iter_encode_organisation_metadata(metadata))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == _legacy_encode(metadata)
+
+
+def _build_metadata(generated_on: datetime, practices, sicbls) -> OrganisationMetadata:
+    return OrganisationMetadata(
+        generated_on=generated_on, year=2020, month=1, practices=practices, sicbls=sicbls
+    )
+
+
+def test_content_hash_ignores_ordering_and_generated_on():
+    metadata = _build_metadata(
+        datetime(2020, 1, 30),
+        practices=[
+            PracticeDetails(ods_code="A12345", name="GP Practice", asids=["1", "2"]),
+            PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["3"]),
+        ],
+        sicbls=[
+            SicblDetails(ods_code="12A", name="SICBL", practices=["A12345", "B12345"]),
+            SicblDetails(ods_code="34B", name="SICBL 2", practices=["B12345"]),
+        ],
+    )
+    reordered_metadata = _build_metadata(
+        datetime(2020, 2, 1),
+        practices=[
+            PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["3"]),
+            PracticeDetails(ods_code="A12345", name="GP Practice", asids=["1", "2"]),
+        ],
+        sicbls=[
+            SicblDetails(ods_code="34B", name="SICBL 2", practices=["B12345"]),
+            SicblDetails(ods_code="12A", name="SICBL", practices=["B12345", "A12345"]),
+        ],
+    )
+
+    assert content_hash(metadata) == content_hash(reordered_metadata)
+
+
+def test_content_hash_changes_when_content_changes():
+    practices = [PracticeDetails(ods_code="A12345", name="GP Practice", asids=["1"])]
+    changed_practices = [PracticeDetails(ods_code="A12345", name="GP Practice", asids=["2"])]
+
+    metadata = _build_metadata(datetime(2020, 1, 30), practices=practices, sicbls=[])
+    changed_metadata = _build_metadata(
+        datetime(2020, 1, 30), practices=changed_practices, sicbls=[]
+    )
+
+    assert content_hash(metadata) != content_hash(changed_metadata)
+
+
+def test_content_hash_changes_when_asid_order_changes():
+    practices = [PracticeDetails(ods_code="A12345", name="GP Practice", asids=["1", "2"])]
+    reordered_practices = [PracticeDetails(ods_code="A12345", name="GP Practice", asids=["2", "1"])]
+
+    metadata = _build_metadata(datetime(2020, 1, 30), practices=practices, sicbls=[])
+    reordered_metadata = _build_metadata(
+        datetime(2020, 1, 30), practices=reordered_practices, sicbls=[]
+    )
+
+    assert content_hash(metadata) != content_hash(reordered_metadata)
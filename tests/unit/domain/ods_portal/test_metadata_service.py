@@ -130,7 +130,9 @@ def test_skips_practice_and_warns_when_ods_not_in_asid_mapping():
 
     actual = metadata_service.retrieve_practices_with_asids(asid_lookup)
 
-    mock_observability_probe.record_asids_not_found.assert_called_once_with("A12345")
+    mock_observability_probe.record_asids_not_found.assert_called_once_with(
+        "A12345", "PRACTICES_WITH_ASIDS"
+    )
 
     assert actual == expected
 
@@ -152,11 +154,27 @@ def test_returns_unique_practices():
 
     actual = metadata_service.retrieve_practices_with_asids(asid_lookup)
 
-    mock_observability_probe.record_duplicate_organisation.assert_called_once_with("A12345")
+    mock_observability_probe.record_duplicate_organisation.assert_called_once_with(
+        "A12345", "PRACTICES_WITH_ASIDS"
+    )
 
     assert actual == expected
 
 
+def test_records_stage_completed_after_retrieving_practices():
+    mock_data_fetcher = Mock()
+    mock_observability_probe = Mock()
+    mock_data_fetcher.fetch_all_practices.return_value = []
+
+    metadata_service = Gp2gpOrganisationMetadataService(
+        data_fetcher=mock_data_fetcher, observability_probe=mock_observability_probe
+    )
+
+    metadata_service.retrieve_practices_with_asids(AsidLookup([]))
+
+    mock_observability_probe.record_stage_completed.assert_called_once_with("PRACTICES_WITH_ASIDS")
+
+
 @dataclass
 class SICBLPracticeAllocation:
     sicbl: OrganisationDetails
@@ -273,7 +291,9 @@ def test_returns_unique_sicbls():
 
     actual = metadata_service.retrieve_sicbl_practice_allocations(canonical_practice_list)
 
-    mock_observability_probe.record_duplicate_organisation.assert_called_once_with("X12")
+    mock_observability_probe.record_duplicate_organisation.assert_called_once_with(
+        "X12", "SICBL_PRACTICE_ALLOCATIONS"
+    )
 
     assert actual == expected
 
@@ -304,3 +324,36 @@ def test_filters_out_sicbl_practice_that_are_not_in_the_canonical_list():
     )
 
     assert actual == expected
+
+
+def test_allocates_previously_fetched_sicbl_practices_without_fetching_again():
+    mock_data_fetcher = Mock()
+    mock_observability_probe = Mock()
+    sicbls = [
+        OrganisationDetails(ods_code="X12", name="SICBL"),
+        OrganisationDetails(ods_code="Y34", name="Empty SICBL"),
+    ]
+    sicbl_practices = {
+        "X12": [
+            OrganisationDetails(ods_code="A12345", name="GP Practice"),
+            OrganisationDetails(ods_code="A12346", name="Other Practice"),
+        ],
+        "Y34": [],
+    }
+    canonical_practice_list = [
+        PracticeDetails(ods_code="A12345", name="GP Practice", asids=["123456781234"])
+    ]
+
+    metadata_service = Gp2gpOrganisationMetadataService(mock_data_fetcher, mock_observability_probe)
+
+    expected = [SicblDetails(ods_code="X12", name="SICBL", practices=["A12345"])]
+
+    actual = metadata_service.allocate_sicbl_practices(
+        sicbls, sicbl_practices, canonical_practice_list
+    )
+
+    assert actual == expected
+    mock_data_fetcher.fetch_practices_for_sicbl.assert_not_called()
+    mock_observability_probe.record_stage_completed.assert_called_once_with(
+        "SICBL_PRACTICE_ALLOCATIONS"
+    )
@@ -0,0 +1,49 @@
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+from prmods.domain.ods_portal.metadata_tables import organisation_metadata_tables
+
+
+def _build_metadata():
+    return OrganisationMetadata.from_practice_and_sicbl_lists(
+        practices=[
+            PracticeDetails(ods_code="A12345", name="GP Practice", asids=["111", "222"]),
+            PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["333"]),
+        ],
+        sicbls=[
+            SicblDetails(ods_code="12A", name="SICBL", practices=["A12345", "B12345"]),
+            SicblDetails(ods_code="34B", name="SICBL 2", practices=["B12345"]),
+        ],
+        year=2020,
+        month=1,
+    )
+
+
+def test_returns_practices_table():
+    expected = {"ods_code": ["A12345", "B12345"], "name": ["GP Practice", "GP Practice 2"]}
+
+    actual = organisation_metadata_tables(_build_metadata())["practices"]
+
+    assert actual == expected
+
+
+def test_returns_one_practice_asids_row_per_asid():
+    expected = {"ods_code": ["A12345", "A12345", "B12345"], "asid": ["111", "222", "333"]}
+
+    actual = organisation_metadata_tables(_build_metadata())["practice_asids"]
+
+    assert actual == expected
+
+
+def test_returns_one_sicbl_practices_row_per_allocation():
+    expected = {
+        "sicbl_ods_code": ["12A", "12A", "34B"],
+        "sicbl_name": ["SICBL", "SICBL", "SICBL 2"],
+        "practice_ods_code": ["A12345", "B12345", "B12345"],
+    }
+
+    actual = organisation_metadata_tables(_build_metadata())["sicbl_practices"]
+
+    assert actual == expected
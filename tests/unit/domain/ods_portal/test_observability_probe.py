@@ -1,6 +1,9 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
-from prmods.domain.ods_portal.metadata_service import MetadataServiceObservabilityProbe
+from prmods.domain.ods_portal.metadata_service import (
+    AggregatingMetadataServiceObservabilityProbe,
+    MetadataServiceObservabilityProbe,
+)
 
 
 def test_probe_should_log_warning_given_missing_ods_code():
@@ -19,9 +22,151 @@ def test_probe_should_log_warning_given_duplicate_organisation():
     mock_logger = Mock()
     probe = MetadataServiceObservabilityProbe(mock_logger)
 
-    probe.record_duplicate_organisation("X45")
+    probe.record_duplicate_organisation("X45", "PRACTICES_WITH_ASIDS")
 
     mock_logger.warning.assert_called_once_with(
         "Duplicate ODS code found: X45",
         extra={"event": "DUPLICATE_ODS_CODE_FOUND", "ods_code": "X45"},
     )
+
+
+def test_aggregating_probe_should_not_log_individual_events():
+    mock_logger = Mock()
+    probe = AggregatingMetadataServiceObservabilityProbe(mock_logger)
+
+    probe.record_asids_not_found("ABC123")
+    probe.record_duplicate_organisation("X45", "PRACTICES_WITH_ASIDS")
+
+    mock_logger.warning.assert_not_called()
+
+
+def test_aggregating_probe_should_log_one_summary_per_event_when_stage_completes():
+    mock_logger = Mock()
+    probe = AggregatingMetadataServiceObservabilityProbe(mock_logger, sample_size=2)
+
+    probe.record_asids_not_found("ABC123")
+    probe.record_asids_not_found("ABC124")
+    probe.record_asids_not_found("ABC125")
+    probe.record_duplicate_organisation("X45", "PRACTICES_WITH_ASIDS")
+    probe.record_stage_completed("PRACTICES_WITH_ASIDS")
+
+    mock_logger.warning.assert_has_calls(
+        [
+            call(
+                "ASIDS_NOT_FOUND recorded for 3 ODS codes during PRACTICES_WITH_ASIDS",
+                extra={
+                    "event": "ASIDS_NOT_FOUND_SUMMARY",
+                    "stage": "PRACTICES_WITH_ASIDS",
+                    "count": 3,
+                    "sample_ods_codes": ["ABC123", "ABC124"],
+                },
+            ),
+            call(
+                "DUPLICATE_ODS_CODE_FOUND recorded for 1 ODS codes during PRACTICES_WITH_ASIDS",
+                extra={
+                    "event": "DUPLICATE_ODS_CODE_FOUND_SUMMARY",
+                    "stage": "PRACTICES_WITH_ASIDS",
+                    "count": 1,
+                    "sample_ods_codes": ["X45"],
+                },
+            ),
+        ]
+    )
+    assert mock_logger.warning.call_count == 2
+
+
+def test_aggregating_probe_should_reset_counts_after_stage_completes():
+    mock_logger = Mock()
+    probe = AggregatingMetadataServiceObservabilityProbe(mock_logger)
+
+    probe.record_asids_not_found("ABC123")
+    probe.record_stage_completed("PRACTICES_WITH_ASIDS")
+    probe.record_stage_completed("SICBL_PRACTICE_ALLOCATIONS")
+
+    assert mock_logger.warning.call_count == 1
+
+
+def test_aggregating_probe_should_keep_counts_per_stage():
+    mock_logger = Mock()
+    probe = AggregatingMetadataServiceObservabilityProbe(mock_logger)
+
+    probe.record_duplicate_organisation("X45", "SICBL_PRACTICE_ALLOCATIONS")
+    probe.record_asids_not_found("ABC123", "PRACTICES_WITH_ASIDS")
+    probe.record_stage_completed("PRACTICES_WITH_ASIDS")
+
+    assert mock_logger.warning.call_args.kwargs["extra"]["event"] == "ASIDS_NOT_FOUND_SUMMARY"
+    assert mock_logger.warning.call_count == 1
+
+    probe.record_stage_completed("SICBL_PRACTICE_ALLOCATIONS")
+
+    assert mock_logger.warning.call_args.kwargs["extra"] == {
+        "event": "DUPLICATE_ODS_CODE_FOUND_SUMMARY",
+        "stage": "SICBL_PRACTICE_ALLOCATIONS",
+        "count": 1,
+        "sample_ods_codes": ["X45"],
+    }
+
+
+def test_aggregating_probe_should_retain_all_ods_codes_when_enabled():
+    probe = AggregatingMetadataServiceObservabilityProbe(
+        Mock(), sample_size=1, retain_all_ods_codes=True
+    )
+
+    probe.record_asids_not_found("ABC123")
+    probe.record_asids_not_found("ABC124")
+    probe.record_stage_completed("PRACTICES_WITH_ASIDS")
+    probe.record_duplicate_organisation("X45", "PRACTICES_WITH_ASIDS")
+
+    expected = {"ASIDS_NOT_FOUND": ["ABC123", "ABC124"], "DUPLICATE_ODS_CODE_FOUND": ["X45"]}
+
+    assert probe.all_ods_codes() == expected
+
+
+def test_probe_should_log_organisation_details_dedup_ratio():
+    mock_logger = Mock()
+    probe = MetadataServiceObservabilityProbe(mock_logger)
+
+    probe.record_organisation_details_dedup(requested_count=300, created_count=120)
+
+    mock_logger.info.assert_called_once_with(
+        "300 organisations from ODS shared 120 objects",
+        extra={
+            "event": "ORGANISATION_DETAILS_DEDUP",
+            "requested_count": 300,
+            "created_count": 120,
+            "dedup_ratio": 2.5,
+        },
+    )
+
+
+def test_probe_should_log_ods_cache_hit_rates():
+    mock_logger = Mock()
+    probe = MetadataServiceObservabilityProbe(mock_logger)
+    hit_rates = {
+        "memory": {"lookups": 4, "hits": 1, "hit_rate": 0.25},
+        "s3": {"lookups": 3, "hits": 3, "hit_rate": 1.0},
+    }
+
+    probe.record_ods_cache_hit_rates(hit_rates)
+
+    mock_logger.info.assert_called_once_with(
+        "ODS query cache hit rates: memory 0.25, s3 1.0",
+        extra={"event": "ODS_CACHE_HIT_RATES", "tiers": hit_rates},
+    )
+
+
+def test_probe_should_log_hedged_request_counts():
+    mock_logger = Mock()
+    probe = MetadataServiceObservabilityProbe(mock_logger)
+
+    probe.record_hedged_requests(requests_sent=120, hedges_fired=8, hedges_won=5)
+
+    mock_logger.info.assert_called_once_with(
+        "8 of 120 ODS requests were hedged, 5 hedges won",
+        extra={
+            "event": "ODS_REQUEST_HEDGING",
+            "requests_sent": 120,
+            "hedges_fired": 8,
+            "hedges_won": 5,
+        },
+    )
@@ -0,0 +1,160 @@
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import boto3
+from moto import mock_s3
+
+from prmods.domain.ods_portal.ods_cache import (
+    DiskCacheTier,
+    MemoryCacheTier,
+    S3CacheTier,
+    TieredCacheOdsClient,
+    ods_cache_key,
+)
+from prmods.utils.io.s3 import S3DataManager
+from prmods.utils.io.s3_io_stats import S3IoStats
+from tests.builders.ods_portal import build_ods_organisation_data_response
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+A_QUERY = {"RelTypeId": "RE4", "RelStatus": "active", "Limit": "1000", "TargetOrgId": "12A"}
+SEARCH_URL = "https://ods.test/organisations"
+A_QUERY_KEY = ods_cache_key(SEARCH_URL, A_QUERY)
+ORGANISATIONS = [build_ods_organisation_data_response(name="GP Practice", org_id="A12345")]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_tier_evicts_least_recently_used_entry():
+    tier = MemoryCacheTier(max_entries=2, ttl_seconds=60)
+
+    tier.put("a", [{"OrgId": "A"}])
+    tier.put("b", [{"OrgId": "B"}])
+    tier.get("a")
+    tier.put("c", [{"OrgId": "C"}])
+
+    assert tier.get("a") == [{"OrgId": "A"}]
+    assert tier.get("b") is None
+    assert tier.get("c") == [{"OrgId": "C"}]
+
+
+def test_memory_tier_expires_entries_after_ttl():
+    clock = FakeClock()
+    tier = MemoryCacheTier(max_entries=2, ttl_seconds=60, clock=clock)
+
+    tier.put("a", ORGANISATIONS)
+    clock.now += 61
+
+    assert tier.get("a") is None
+
+
+def test_disk_tier_keeps_most_recent_entries_and_expires_after_ttl(tmp_path):
+    clock = FakeClock()
+    tier = DiskCacheTier(str(tmp_path), max_entries=1, ttl_seconds=60, clock=clock)
+
+    tier.put("a", [{"OrgId": "A"}])
+    tier.put("b", [{"OrgId": "B"}])
+
+    assert [path.name for path in tmp_path.iterdir()] == ["b.json"]
+    assert tier.get("b") == [{"OrgId": "B"}]
+    clock.now += 61
+    assert tier.get("b") is None
+
+
+def test_disk_tier_lists_directory_only_on_first_write(tmp_path):
+    with patch.object(Path, "glob", autospec=True, side_effect=Path.glob) as glob:
+        tier = DiskCacheTier(str(tmp_path), max_entries=2, ttl_seconds=60)
+        for key in ["a", "b", "c"]:
+            tier.put(key, ORGANISATIONS)
+
+    glob.assert_called_once()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.json", "c.json"]
+
+
+def test_disk_tier_removes_oldest_entries_from_previous_runs(tmp_path):
+    DiskCacheTier(str(tmp_path), max_entries=10, ttl_seconds=60).put("a", ORGANISATIONS)
+
+    DiskCacheTier(str(tmp_path), max_entries=1, ttl_seconds=60).put("b", ORGANISATIONS)
+
+    assert [path.name for path in tmp_path.iterdir()] == ["b.json"]
+
+
+@mock_s3
+def test_s3_tier_reads_entries_written_by_another_run():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="shared")
+    s3_manager = S3DataManager(conn.meta.client)
+
+    S3CacheTier(s3_manager, "s3://shared/ods-cache", max_entries=10, ttl_seconds=60).put(
+        "a", ORGANISATIONS
+    )
+
+    tier = S3CacheTier(s3_manager, "s3://shared/ods-cache", max_entries=10, ttl_seconds=60)
+    assert tier.get("a") == ORGANISATIONS
+
+
+@mock_s3
+def test_s3_tier_deletes_entries_beyond_max_entries():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="shared")
+    io_stats = S3IoStats()
+    s3_manager = S3DataManager(conn.meta.client, io_stats=io_stats)
+    tier = S3CacheTier(s3_manager, "s3://shared/ods-cache/", max_entries=2, ttl_seconds=60)
+
+    for key in ["a", "b", "c"]:
+        tier.put(key, ORGANISATIONS)
+
+    assert sorted(s3_object.key for s3_object in bucket.objects.all()) == [
+        "ods-cache/b.json",
+        "ods-cache/c.json",
+    ]
+    assert io_stats.operation_stats()["ListObjectsV2"].requests == 1
+
+
+def test_client_fetches_from_ods_and_fills_every_tier_on_miss(tmp_path):
+    mock_ods_client = Mock()
+    mock_ods_client.fetch_organisation_data.return_value = ORGANISATIONS
+    memory_tier = MemoryCacheTier(max_entries=10, ttl_seconds=60)
+    disk_tier = DiskCacheTier(str(tmp_path), max_entries=10, ttl_seconds=60)
+
+    client = TieredCacheOdsClient(mock_ods_client, [memory_tier, disk_tier], SEARCH_URL)
+
+    assert client.fetch_organisation_data(A_QUERY) == ORGANISATIONS
+    assert memory_tier.get(A_QUERY_KEY) == ORGANISATIONS
+    assert disk_tier.get(A_QUERY_KEY) == ORGANISATIONS
+
+
+def test_client_serves_from_slower_tier_and_fills_faster_tiers(tmp_path):
+    mock_ods_client = Mock()
+    memory_tier = MemoryCacheTier(max_entries=10, ttl_seconds=60)
+    disk_tier = DiskCacheTier(str(tmp_path), max_entries=10, ttl_seconds=60)
+    disk_tier.put(A_QUERY_KEY, ORGANISATIONS)
+
+    client = TieredCacheOdsClient(mock_ods_client, [memory_tier, disk_tier], SEARCH_URL)
+
+    assert client.fetch_organisation_data(dict(reversed(A_QUERY.items()))) == ORGANISATIONS
+    assert client.fetch_organisation_data(A_QUERY) == ORGANISATIONS
+    mock_ods_client.fetch_organisation_data.assert_not_called()
+    assert client.stats.hit_rates() == {
+        "memory": {"lookups": 2, "hits": 1, "hit_rate": 0.5},
+        "disk": {"lookups": 1, "hits": 1, "hit_rate": 1.0},
+    }
+
+
+def test_client_does_not_share_cached_results_between_portal_urls():
+    mock_ods_client = Mock()
+    mock_ods_client.fetch_organisation_data.return_value = ORGANISATIONS
+    memory_tier = MemoryCacheTier(max_entries=10, ttl_seconds=60)
+    TieredCacheOdsClient(mock_ods_client, [memory_tier], SEARCH_URL).fetch_organisation_data(
+        A_QUERY
+    )
+
+    client = TieredCacheOdsClient(mock_ods_client, [memory_tier], "https://other.test/orgs")
+    client.fetch_organisation_data(A_QUERY)
+
+    assert mock_ods_client.fetch_organisation_data.call_count == 2
@@ -1,6 +1,7 @@
 from unittest.mock import Mock
 
 from prmods.domain.ods_portal.ods_portal_data_fetcher import (
+    MemoizingOdsDataSource,
     OdsPortalDataFetcher,
     OrganisationDetails,
 )
@@ -104,3 +105,52 @@ def test_fetch_practices_for_sicbl_returns_a_list_of_organisation_details():
     mock_ods_client.fetch_organisation_data.assert_called_once_with(
         {"RelTypeId": "RE4", "RelStatus": "active", "Limit": "1000", "TargetOrgId": "12A"}
     )
+
+
+def test_memoizing_data_source_crawl_fetches_each_query_once():
+    mock_data_source = Mock()
+    mock_data_source.fetch_all_practices.return_value = [
+        OrganisationDetails(name="GP Practice", ods_code="A12345")
+    ]
+    mock_data_source.fetch_all_sicbls.return_value = [
+        OrganisationDetails(name="SICBL", ods_code="12A"),
+        OrganisationDetails(name="SICBL 2", ods_code="13B"),
+    ]
+    mock_data_source.fetch_practices_for_sicbl.return_value = [
+        OrganisationDetails(name="GP Practice", ods_code="A12345")
+    ]
+
+    data_source = MemoizingOdsDataSource(mock_data_source)
+    data_source.crawl(show_prison_practices_toggle=True)
+    data_source.fetch_all_practices(show_prison_practices_toggle=True)
+    data_source.fetch_all_sicbls()
+    actual = data_source.fetch_practices_for_sicbl("13B")
+
+    assert actual == [OrganisationDetails(name="GP Practice", ods_code="A12345")]
+    mock_data_source.fetch_all_practices.assert_called_once_with(show_prison_practices_toggle=True)
+    mock_data_source.fetch_all_sicbls.assert_called_once_with()
+    assert mock_data_source.fetch_practices_for_sicbl.call_count == 2
+
+
+def test_practice_seen_in_several_queries_is_one_shared_object():
+    mock_ods_client = Mock()
+    mock_ods_client.fetch_organisation_data.side_effect = [
+        [
+            build_ods_organisation_data_response(name="GP Practice", org_id="A12345"),
+            build_ods_organisation_data_response(name="GP Practice 2", org_id="B12345"),
+        ],
+        [build_ods_organisation_data_response(name="GP Practice", org_id="A12345")],
+        [build_ods_organisation_data_response(name="GP Practice renamed", org_id="B12345")],
+    ]
+
+    ods_portal_data_fetcher = OdsPortalDataFetcher(ods_client=mock_ods_client)
+
+    practice, other_practice = ods_portal_data_fetcher.fetch_all_practices()
+    (sicbl_practice,) = ods_portal_data_fetcher.fetch_practices_for_sicbl("12A")
+    (renamed_practice,) = ods_portal_data_fetcher.fetch_practices_for_sicbl("13B")
+    cache = ods_portal_data_fetcher.organisation_cache
+
+    assert sicbl_practice is practice
+    assert renamed_practice is not other_practice
+    assert renamed_practice == OrganisationDetails(name="GP Practice renamed", ods_code="B12345")
+    assert (cache.requested_count, cache.created_count) == (4, 3)
@@ -0,0 +1,64 @@
+from unittest.mock import Mock
+
+import boto3
+import pytest
+from moto import mock_s3
+
+from prmods.domain.ods_portal.ods_portal_data_fetcher import (
+    OdsPortalDataFetcher,
+    OrganisationDetails,
+)
+from prmods.domain.ods_portal.ods_snapshot import OdsSnapshot, ReplayOdsDataSource
+from prmods.utils.io.s3 import S3DataManager, S3ObjectNotFound
+from tests.builders.ods_portal import build_ods_organisation_data_response
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+def _build_snapshot(conn) -> OdsSnapshot:
+    conn.create_bucket(Bucket="test_bucket")
+    return OdsSnapshot(S3DataManager(conn.meta.client), "s3://test_bucket/odsSnapshots/run-1")
+
+
+@mock_s3
+def test_snapshot_reads_query_results_it_wrote():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    snapshot = _build_snapshot(conn)
+    organisations = [
+        build_ods_organisation_data_response(name="GP Practice", org_id="A12345"),
+        build_ods_organisation_data_response(name="GP Practice 2", org_id="B12345"),
+    ]
+
+    snapshot.write({"PrimaryRoleId": "RO177", "Limit": "1000"}, organisations)
+
+    assert snapshot.read({"Limit": "1000", "PrimaryRoleId": "RO177"}) == organisations
+    objects = list(conn.Bucket("test_bucket").objects.all())
+    assert len(objects) == 1
+    assert objects[0].key.startswith("odsSnapshots/run-1/")
+    assert objects[0].key.endswith(".ndjson.gz")
+    assert objects[0].Object().metadata == {"ods-query": "Limit=1000&PrimaryRoleId=RO177"}
+
+
+@mock_s3
+def test_fetcher_writes_each_query_result_to_snapshot():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    snapshot = _build_snapshot(conn)
+    mock_ods_client = Mock()
+    mock_ods_client.fetch_organisation_data.return_value = [
+        build_ods_organisation_data_response(name="ICB", org_id="12A")
+    ]
+
+    OdsPortalDataFetcher(ods_client=mock_ods_client, snapshot=snapshot).fetch_all_sicbls()
+
+    replayed = ReplayOdsDataSource(snapshot).fetch_all_sicbls()
+
+    assert replayed == [OrganisationDetails(ods_code="12A", name="ICB")]
+    mock_ods_client.fetch_organisation_data.assert_called_once()
+
+
+@mock_s3
+def test_replay_raises_when_query_is_missing_from_snapshot():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    snapshot = _build_snapshot(conn)
+
+    with pytest.raises(S3ObjectNotFound):
+        ReplayOdsDataSource(snapshot).fetch_practices_for_sicbl("12A")
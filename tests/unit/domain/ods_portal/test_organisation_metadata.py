@@ -51,3 +51,25 @@ def test_returns_multiple_practices_and_sicbls():
 
     assert actual.practices == practice_metadata
     assert actual.sicbls == sicbl_metadata
+
+
+def test_builds_organisation_metadata_from_dict():
+    data = {
+        "generated_on": "2020-01-30T18:44:49+00:00",
+        "year": 2020,
+        "month": 1,
+        "practices": [{"ods_code": "A12345", "name": "GP Practice", "asids": ["123456781234"]}],
+        "sicbls": [{"ods_code": "12A", "name": "SICBL", "practices": ["A12345"]}],
+    }
+
+    expected = OrganisationMetadata(
+        generated_on=datetime(2020, 1, 30, 18, 44, 49, tzinfo=tzutc()),
+        year=2020,
+        month=1,
+        practices=[PracticeDetails(ods_code="A12345", name="GP Practice", asids=["123456781234"])],
+        sicbls=[SicblDetails(ods_code="12A", name="SICBL", practices=["A12345"])],
+    )
+
+    actual = OrganisationMetadata.from_dict(data)
+
+    assert actual == expected
@@ -0,0 +1,111 @@
+import json
+import logging
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Iterator
+
+from prmods.domain.ods_portal.asid_lookup import AsidLookup, OdsAsid
+from prmods.domain.ods_portal.metadata_encoder import encode_organisation_metadata
+from prmods.domain.ods_portal.metadata_service import (
+    Gp2gpOrganisationMetadataService,
+    MetadataServiceObservabilityProbe,
+    OrganisationMetadata,
+)
+from prmods.domain.ods_portal.ods_portal_data_fetcher import (
+    OdsPortalDataFetcher,
+    StreamingOdsDataSource,
+)
+from prmods.domain.ods_portal.streaming_metadata import iter_encode_streamed_organisation_metadata
+
+GENERATED_ON = datetime(2020, 1, 30, 18, 44, 49)
+SICBL_COUNT = 100
+
+quiet_logger = logging.getLogger(__name__ + ".quiet")
+quiet_logger.disabled = True
+
+
+class FakeOdsClient:
+    def __init__(self, practice_count: int):
+        self._practice_count = practice_count
+
+    def _iter_practices(self, start: int = 0, step: int = 1) -> Iterator[dict]:
+        for index in range(start, self._practice_count, step):
+            yield {"OrgId": f"A{index:05d}", "Name": f"GP PRACTICE NUMBER {index}"}
+
+    def iter_organisation_data(self, params: Dict[str, str]) -> Iterator[dict]:
+        if "TargetOrgId" in params:
+            return self._iter_practices(start=int(params["TargetOrgId"]), step=SICBL_COUNT)
+        if params.get("PrimaryRoleId") == "RO98":
+            return iter(
+                [
+                    {"OrgId": f"{index:03d}", "Name": f"SICBL {index}"}
+                    for index in range(SICBL_COUNT)
+                ]
+                + [{"OrgId": "000", "Name": "SICBL 0"}]
+            )
+        return self._iter_practices()
+
+    def fetch_organisation_data(self, params: Dict[str, str]):
+        return list(self.iter_organisation_data(params))
+
+
+def _asid_lookup(practice_count: int) -> AsidLookup:
+    # Every other practice has an ASID, and the rest are dropped during enrichment
+    return AsidLookup(
+        OdsAsid(f"A{index:05d}", f"{index:012d}") for index in range(0, practice_count, 2)
+    )
+
+
+def _service(ods_client: FakeOdsClient) -> Gp2gpOrganisationMetadataService:
+    return Gp2gpOrganisationMetadataService(
+        OdsPortalDataFetcher(ods_client), MetadataServiceObservabilityProbe(quiet_logger)
+    )
+
+
+def _stream(ods_client: FakeOdsClient, asid_lookup: AsidLookup) -> Iterator[str]:
+    return iter_encode_streamed_organisation_metadata(
+        _service(ods_client), StreamingOdsDataSource(ods_client), asid_lookup, GENERATED_ON, 2020, 1
+    )
+
+
+def test_streamed_document_matches_document_built_from_lists():
+    ods_client = FakeOdsClient(practice_count=1000)
+    asid_lookup = _asid_lookup(1000)
+    service = _service(ods_client)
+    practices = service.retrieve_practices_with_asids(asid_lookup)
+    expected = OrganisationMetadata(
+        generated_on=GENERATED_ON,
+        year=2020,
+        month=1,
+        practices=practices,
+        sicbls=service.retrieve_sicbl_practice_allocations(practices),
+    )
+
+    actual = "".join(_stream(ods_client, asid_lookup))
+
+    assert actual == encode_organisation_metadata(expected)
+    assert len(json.loads(actual)["sicbls"]) == SICBL_COUNT // 2
+
+
+def test_streamed_document_peak_memory_is_bounded_by_ods_code_sets():
+    practice_count = 50000
+    ods_client = FakeOdsClient(practice_count)
+    asid_lookup = _asid_lookup(practice_count)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        seen_ods_codes = {f"A{index:05d}" for index in range(practice_count)}
+        canonical_ods_codes = set(seen_ods_codes)
+        ods_code_sets_size = tracemalloc.get_traced_memory()[0] - baseline
+        del seen_ods_codes, canonical_ods_codes
+
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _ in _stream(ods_client, asid_lookup):
+            pass
+        streaming_peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    assert streaming_peak < ods_code_sets_size + 1024 * 1024
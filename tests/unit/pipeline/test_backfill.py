@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pytest
+from dateutil.tz import tzutc
+
+from prmods.pipeline.backfill import OdsBackfill, backfill_months
+from prmods.pipeline.config import InvalidEnvironmentVariableValue, OdsPortalConfig
+
+
+def test_backfill_months_returns_each_month_in_range_inclusive():
+    actual = backfill_months(datetime(2020, 11, 15), datetime(2021, 2, 3))
+
+    expected = [
+        datetime(2020, 11, 1, tzinfo=tzutc()),
+        datetime(2020, 12, 1, tzinfo=tzutc()),
+        datetime(2021, 1, 1, tzinfo=tzutc()),
+        datetime(2021, 2, 1, tzinfo=tzutc()),
+    ]
+
+    assert actual == expected
+
+
+def test_backfill_rejects_sicbl_crawl_queue():
+    config = OdsPortalConfig(
+        output_bucket="output-bucket",
+        mapping_bucket="mapping-bucket",
+        build_tag="abc",
+        date_anchor=datetime(2020, 1, 1),
+        search_url=None,
+        show_prison_practices_toggle=True,
+        backfill_start_month=datetime(2020, 1, 1),
+        backfill_end_month=datetime(2020, 2, 1),
+        sicbl_crawl_queue_url="https://sqs.eu-west-2.amazonaws.com/123456789012/sicbl-crawl",
+    )
+
+    with pytest.raises(InvalidEnvironmentVariableValue, match="SICBL_CRAWL_QUEUE_URL"):
+        OdsBackfill(config)
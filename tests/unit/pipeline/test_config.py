@@ -4,7 +4,12 @@ import pytest
 from dateutil.tz import tzutc
 
 from prmods.domain.ods_portal.ods_portal_client import ODS_PORTAL_SEARCH_URL
-from prmods.pipeline.config import MissingEnvironmentVariable, OdsPortalConfig
+from prmods.pipeline.config import (
+    InvalidEnvironmentVariableValue,
+    MissingEnvironmentVariable,
+    OdsPortalConfig,
+    OutputDestination,
+)
 
 
 def test_reads_from_environment_variables_and_converts_to_required_format():
@@ -69,3 +74,85 @@ def test_error_from_environment_when_required_fields_are_not_set():
 
     with pytest.raises(MissingEnvironmentVariable):
         OdsPortalConfig.from_environment_variables(environment)
+
+
+def test_reads_output_compression_from_environment_variables():
+    environment = {
+        "OUTPUT_BUCKET": "output-bucket",
+        "MAPPING_BUCKET": "mapping-bucket",
+        "BUILD_TAG": "61ad1e1c",
+        "OUTPUT_COMPRESSION": "zstd",
+        "WRITE_UNCOMPRESSED_OUTPUT": "False",
+    }
+
+    actual_config = OdsPortalConfig.from_environment_variables(environment)
+
+    assert actual_config.output_compression == "zstd"
+    assert actual_config.write_uncompressed_output is False
+
+
+def test_error_from_environment_when_output_compression_is_not_supported():
+    environment = {
+        "OUTPUT_BUCKET": "output-bucket",
+        "MAPPING_BUCKET": "mapping-bucket",
+        "BUILD_TAG": "61ad1e1c",
+        "OUTPUT_COMPRESSION": "brotli",
+    }
+
+    with pytest.raises(InvalidEnvironmentVariableValue):
+        OdsPortalConfig.from_environment_variables(environment)
+
+
+def test_reads_output_destinations_from_environment_variables():
+    environment = {
+        "OUTPUT_BUCKET": "output-bucket",
+        "MAPPING_BUCKET": "mapping-bucket",
+        "BUILD_TAG": "61ad1e1c",
+        "OUTPUT_DESTINATIONS": (
+            '[{"bucket": "consumer-bucket"}, '
+            '{"bucket": "other-bucket", "s3_endpoint_url": "https://an.endpoint:3000"}]'
+        ),
+    }
+
+    actual_config = OdsPortalConfig.from_environment_variables(environment)
+
+    assert actual_config.output_destinations == [
+        OutputDestination(bucket="consumer-bucket"),
+        OutputDestination(bucket="other-bucket", s3_endpoint_url="https://an.endpoint:3000"),
+    ]
+
+
+def test_error_from_environment_when_output_destinations_are_invalid():
+    environment = {
+        "OUTPUT_BUCKET": "output-bucket",
+        "MAPPING_BUCKET": "mapping-bucket",
+        "BUILD_TAG": "61ad1e1c",
+        "OUTPUT_DESTINATIONS": '[{"endpoint": "https://an.endpoint:3000"}]',
+    }
+
+    with pytest.raises(InvalidEnvironmentVariableValue):
+        OdsPortalConfig.from_environment_variables(environment)
+
+
+def test_error_from_environment_when_observability_events_file_is_set_without_aggregation():
+    environment = {
+        "OUTPUT_BUCKET": "output-bucket",
+        "MAPPING_BUCKET": "mapping-bucket",
+        "BUILD_TAG": "61ad1e1c",
+        "WRITE_OBSERVABILITY_EVENTS_FILE": "True",
+    }
+
+    with pytest.raises(InvalidEnvironmentVariableValue, match="AGGREGATE_OBSERVABILITY_EVENTS"):
+        OdsPortalConfig.from_environment_variables(environment)
+
+
+def test_error_from_environment_when_log_queue_overflow_policy_is_not_supported():
+    environment = {
+        "OUTPUT_BUCKET": "output-bucket",
+        "MAPPING_BUCKET": "mapping-bucket",
+        "BUILD_TAG": "61ad1e1c",
+        "LOG_QUEUE_OVERFLOW_POLICY": "drop_everything",
+    }
+
+    with pytest.raises(InvalidEnvironmentVariableValue, match="LOG_QUEUE_OVERFLOW_POLICY"):
+        OdsPortalConfig.from_environment_variables(environment)
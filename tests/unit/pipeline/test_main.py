@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from os import environ
+from unittest import mock
+
+from prmods.pipeline.main import logger, main
+from prmods.utils.io.log_queue import BoundedQueueHandler
+
+REQUIRED_ENVIRONMENT = {
+    "OUTPUT_BUCKET": "output-bucket",
+    "MAPPING_BUCKET": "mapping-bucket",
+    "BUILD_TAG": "61ad1e1c",
+}
+
+
+def test_flushes_queued_log_records_when_main_fails(capsys):
+    environment = {**REQUIRED_ENVIRONMENT, "ASYNC_LOGGING": "True"}
+    with mock.patch.dict(environ, environment, clear=True):
+        with mock.patch("prmods.pipeline.main._run", side_effect=RuntimeError("run failed")):
+            with mock.patch.object(sys, "exit") as exit_spy:
+                main()
+
+    captured = capsys.readouterr()
+
+    assert '"event": "FAILED_TO_RUN_MAIN"' in captured.err
+    exit_spy.assert_called_with("Failed to run main, exiting...")
+    assert not any(isinstance(handler, BoundedQueueHandler) for handler in logger.handlers)
+
+
+def test_logs_invalid_log_queue_overflow_policy_as_a_config_error(capsys):
+    environment = {**REQUIRED_ENVIRONMENT, "LOG_QUEUE_OVERFLOW_POLICY": "drop_everything"}
+    with mock.patch.dict(environ, environment, clear=True):
+        with mock.patch.object(logger, "handlers", []):
+            with mock.patch.object(sys, "exit") as exit_spy:
+                main()
+
+    captured = capsys.readouterr()
+
+    assert '"event": "FAILED_TO_RUN_MAIN"' in captured.err
+    assert "LOG_QUEUE_OVERFLOW_POLICY value is invalid" in captured.err
+    exit_spy.assert_called_with("Failed to run main, exiting...")
+
+
+def test_importing_main_does_not_import_heavy_dependencies():
+    heavy_modules = ["boto3", "botocore", "requests", "dateutil"]
+    code = (
+        "import sys; import prmods.pipeline.main; "
+        f"print([name for name in {heavy_modules} if name in sys.modules])"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,86 @@
+import gzip
+import json
+from datetime import datetime
+from unittest import mock
+
+import boto3
+import pytest
+from dateutil.tz import tzutc
+from moto import mock_s3
+
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+from prmods.pipeline import metadata_publisher
+from prmods.pipeline.metadata_publisher import OdsMetadataPublisher, PublishTarget
+from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+SOME_METADATA = {"content-sha256": "abc123"}
+DATE_ANCHOR = datetime(2020, 1, 30, tzinfo=tzutc())
+OUTPUT_KEY = "v5/2020/1/organisationMetadata.json"
+
+
+def _build_metadata():
+    return OrganisationMetadata(
+        generated_on=datetime(2020, 1, 30, 18, 44, 49, tzinfo=tzutc()),
+        year=2020,
+        month=1,
+        practices=[PracticeDetails(ods_code="A12345", name="GP Practice", asids=["111"])],
+        sicbls=[SicblDetails(ods_code="12A", name="SICBL", practices=["A12345"])],
+    )
+
+
+def _build_target(conn, bucket):
+    uris = OdsDownloaderS3UriResolver(asid_lookup_bucket="input", ods_metadata_bucket=bucket)
+    return PublishTarget(bucket, S3DataManager(conn.meta.client), uris)
+
+
+@mock_s3
+def test_publishes_the_same_document_to_every_target():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    primary = conn.create_bucket(Bucket="primary")
+    consumer = conn.create_bucket(Bucket="consumer")
+    publisher = OdsMetadataPublisher(
+        [_build_target(conn, "primary"), _build_target(conn, "consumer")],
+        output_compression="gzip",
+    )
+
+    publisher.publish(_build_metadata(), DATE_ANCHOR, SOME_METADATA)
+
+    primary_body = primary.Object(OUTPUT_KEY).get()["Body"].read()
+    consumer_body = consumer.Object(OUTPUT_KEY).get()["Body"].read()
+    consumer_compressed_body = consumer.Object(f"{OUTPUT_KEY}.gz").get()["Body"].read()
+
+    assert json.loads(primary_body)["practices"][0]["ods_code"] == "A12345"
+    assert consumer_body == primary_body
+    assert gzip.decompress(consumer_compressed_body) == primary_body
+
+
+@mock_s3
+def test_reports_each_target_and_raises_when_a_target_fails():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    primary = conn.create_bucket(Bucket="primary")
+    publisher = OdsMetadataPublisher(
+        [_build_target(conn, "primary"), _build_target(conn, "missing")]
+    )
+
+    with mock.patch.object(metadata_publisher, "logger") as mock_logger:
+        with pytest.raises(RuntimeError, match="missing"):
+            publisher.publish(_build_metadata(), DATE_ANCHOR, SOME_METADATA)
+
+    assert primary.Object(OUTPUT_KEY).get()["Metadata"] == SOME_METADATA
+    mock_logger.info.assert_any_call(
+        "Published organisation metadata to primary",
+        extra={
+            "event": "ODS_METADATA_PUBLISHED",
+            "bucket": "primary",
+            "uploaded_object_uris": [f"s3://primary/{OUTPUT_KEY}"],
+        },
+    )
+    mock_logger.error.assert_called_once_with(
+        mock.ANY, extra={"event": "ODS_METADATA_PUBLISH_FAILED", "bucket": "missing"}
+    )
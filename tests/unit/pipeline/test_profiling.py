@@ -0,0 +1,94 @@
+import pstats
+from unittest import mock
+
+import boto3
+import pytest
+from moto import mock_s3
+
+from prmods.pipeline import profiling
+from prmods.pipeline.profiling import RunProfiler
+from prmods.pipeline.stage_graph import Stage, StageGraph, StageGraphExecutor
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+def _staged_run(profiler: RunProfiler):
+    def run():
+        numbers = [number * 2 for number in range(1000)]
+        profiler.record_stage_boundary("FIRST")
+        profiler.record_stage_boundary("SECOND")
+        return sum(numbers)
+
+    return run
+
+
+def test_writes_pstats_and_allocation_reports_to_local_directory(tmp_path):
+    profiler = RunProfiler(str(tmp_path), trace_memory=True)
+
+    with mock.patch.object(profiling, "logger") as mock_logger:
+        result = profiler.profile(_staged_run(profiler))
+
+    (run_directory,) = tmp_path.iterdir()
+    artifact_names = sorted(path.name for path in run_directory.iterdir())
+
+    assert result == 999000
+    assert artifact_names == [
+        "ods-downloader.pstats",
+        "tracemalloc-01-FIRST.txt",
+        "tracemalloc-02-SECOND.txt",
+    ]
+    stats_profile = pstats.Stats(str(run_directory / "ods-downloader.pstats")).get_stats_profile()
+    assert "run" in stats_profile.func_profiles
+    assert (
+        (run_directory / "tracemalloc-01-FIRST.txt")
+        .read_text()
+        .startswith("Top 25 allocations after stage FIRST")
+    )
+    mock_logger.info.assert_called_once_with(
+        mock.ANY,
+        extra={
+            "event": "PROFILING_ARTIFACTS_WRITTEN",
+            "location": str(run_directory),
+            "artifacts": [str(run_directory / name) for name in artifact_names],
+        },
+    )
+
+
+def _double_numbers():
+    return [number * 2 for number in range(1000)]
+
+
+def test_profiles_stages_run_on_worker_threads(tmp_path):
+    graph = StageGraph([Stage("DOUBLE_NUMBERS", _double_numbers)])
+    executor = StageGraphExecutor(max_workers=2, logger=mock.Mock())
+
+    with mock.patch.object(profiling, "logger"):
+        RunProfiler(str(tmp_path)).profile(lambda: executor.run(graph))
+
+    (run_directory,) = tmp_path.iterdir()
+    stats_profile = pstats.Stats(str(run_directory / "ods-downloader.pstats")).get_stats_profile()
+    assert "_double_numbers" in stats_profile.func_profiles
+
+
+def test_writes_artifacts_when_the_run_fails(tmp_path):
+    def failing_run():
+        raise ValueError("run failed")
+
+    with pytest.raises(ValueError):
+        RunProfiler(str(tmp_path)).profile(failing_run)
+
+    (run_directory,) = tmp_path.iterdir()
+    assert [path.name for path in run_directory.iterdir()] == ["ods-downloader.pstats"]
+
+
+@mock_s3
+def test_writes_artifacts_to_s3_prefix():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="profiles")
+    profiler = RunProfiler("s3://profiles/ods/", s3_manager=S3DataManager(conn.meta.client))
+
+    profiler.profile(_staged_run(profiler))
+
+    (pstats_object,) = bucket.objects.all()
+    assert pstats_object.key.startswith("ods/")
+    assert pstats_object.key.endswith("/ods-downloader.pstats")
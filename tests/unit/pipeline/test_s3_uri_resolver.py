@@ -34,3 +34,124 @@ def test_resolver_returns_correct_ods_metadata_uri_given_date_anchor():
     expected = f"s3://{ods_metadata_bucket}/v5/{year}/{month}/organisationMetadata.json"
 
     assert actual == expected
+
+
+def test_resolver_returns_correct_compressed_ods_metadata_uri_given_date_anchor():
+    ods_metadata_bucket = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=a_string(), ods_metadata_bucket=ods_metadata_bucket
+    )
+
+    actual = uri_resolver.compressed_ods_metadata(date_anchor, ".gz")
+
+    expected = f"s3://{ods_metadata_bucket}/v5/{year}/{month}/organisationMetadata.json.gz"
+
+    assert actual == expected
+
+
+def test_resolver_returns_correct_ods_metadata_table_uri_given_date_anchor():
+    ods_metadata_bucket = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=a_string(), ods_metadata_bucket=ods_metadata_bucket
+    )
+
+    actual = uri_resolver.ods_metadata_table(date_anchor, "practice_asids")
+
+    expected = f"s3://{ods_metadata_bucket}/v5/{year}/{month}/tables/practice_asids.parquet"
+
+    assert actual == expected
+
+
+def test_resolver_returns_correct_ods_metadata_delta_uri_given_date_anchor():
+    ods_metadata_bucket = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=a_string(), ods_metadata_bucket=ods_metadata_bucket
+    )
+
+    actual = uri_resolver.ods_metadata_delta(date_anchor)
+
+    expected = f"s3://{ods_metadata_bucket}/v5/{year}/{month}/organisationMetadataDelta.json"
+
+    assert actual == expected
+
+
+def test_resolver_returns_correct_sicbl_shard_uris_given_date_anchor():
+    ods_metadata_bucket = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=a_string(), ods_metadata_bucket=ods_metadata_bucket
+    )
+
+    actual_shard = uri_resolver.sicbl_shard(date_anchor, "12A")
+    actual_index = uri_resolver.sicbl_shard_index(date_anchor)
+
+    assert actual_shard == f"s3://{ods_metadata_bucket}/v5/{year}/{month}/sicbls/12A.json"
+    assert actual_index == f"s3://{ods_metadata_bucket}/v5/{year}/{month}/sicbls/index.json"
+
+
+def test_resolver_returns_correct_observability_events_uri_given_date_anchor():
+    ods_metadata_bucket = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=a_string(), ods_metadata_bucket=ods_metadata_bucket
+    )
+
+    actual = uri_resolver.observability_events(date_anchor)
+
+    expected = f"s3://{ods_metadata_bucket}/staging/{year}/{month}/observabilityEvents.json"
+
+    assert actual == expected
+
+
+def test_resolver_returns_correct_ods_snapshot_uri_given_date_anchor():
+    ods_metadata_bucket = a_string()
+    snapshot_id = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=a_string(), ods_metadata_bucket=ods_metadata_bucket
+    )
+
+    actual = uri_resolver.ods_snapshot(date_anchor, snapshot_id)
+
+    expected = f"s3://{ods_metadata_bucket}/staging/{year}/{month}/odsSnapshots/{snapshot_id}"
+
+    assert actual == expected
+
+
+def test_resolver_returns_correct_sicbl_crawl_result_uri_given_date_anchor():
+    ods_metadata_bucket = a_string()
+    crawl_id = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = OdsDownloaderS3UriResolver(
+        asid_lookup_bucket=a_string(), ods_metadata_bucket=ods_metadata_bucket
+    )
+
+    actual = uri_resolver.sicbl_crawl_result(date_anchor, crawl_id, "12A")
+
+    expected = f"s3://{ods_metadata_bucket}/staging/{year}/{month}/sicblCrawl/{crawl_id}/12A.json"
+
+    assert actual == expected
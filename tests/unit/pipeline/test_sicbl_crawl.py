@@ -0,0 +1,172 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import boto3
+import pytest
+from moto import mock_s3, mock_sqs
+
+from prmods.domain.ods_portal.ods_portal_data_fetcher import OrganisationDetails
+from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
+from prmods.pipeline.sicbl_crawl import SicblCrawlCoordinator, SicblCrawlWorker
+from prmods.utils.io.s3 import S3DataManager
+from prmods.utils.io.s3_io_stats import S3IoStats
+from prmods.utils.io.sqs import SqsJsonQueue
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+DATE_ANCHOR = datetime(2023, 1, 1)
+
+SICBLS = [
+    OrganisationDetails(ods_code="12A", name="Test SICBL"),
+    OrganisationDetails(ods_code="13B", name="Test SICBL 2"),
+]
+
+SICBL_PRACTICES = {
+    "12A": [OrganisationDetails(ods_code="A12345", name="Test GP")],
+    "13B": [],
+}
+
+
+URIS = OdsDownloaderS3UriResolver(asid_lookup_bucket="mapping", ods_metadata_bucket="output")
+
+
+def _build_queue_and_s3_manager(queue_attributes=None):
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="output")
+    sqs_client = boto3.client("sqs", region_name=MOTO_MOCK_REGION)
+    queue_url = sqs_client.create_queue(QueueName="sicbl-crawl", Attributes=queue_attributes or {})[
+        "QueueUrl"
+    ]
+    return SqsJsonQueue(queue_url, sqs_client), S3DataManager(conn.meta.client)
+
+
+def _build_coordinator(queue, s3_manager, **kwargs) -> SicblCrawlCoordinator:
+    return SicblCrawlCoordinator(queue, s3_manager, URIS, DATE_ANCHOR, "crawl-1", **kwargs)
+
+
+def _build_worker(queue, data_source, s3_manager) -> SicblCrawlWorker:
+    return SicblCrawlWorker(queue, data_source, s3_manager, URIS, idle_polls=1, wait_seconds=0)
+
+
+def _build_data_source():
+    data_source = Mock()
+    data_source.fetch_practices_for_sicbl.side_effect = SICBL_PRACTICES.get
+    return data_source
+
+
+@mock_s3
+@mock_sqs
+def test_coordinator_gathers_practices_fetched_by_workers():
+    queue, s3_manager = _build_queue_and_s3_manager()
+    coordinator = _build_coordinator(queue, s3_manager)
+
+    coordinator.enqueue(["12A", "13B"])
+    _build_worker(queue, _build_data_source(), s3_manager).run()
+
+    assert coordinator.gather(["12A", "13B"]) == SICBL_PRACTICES
+
+
+@mock_s3
+@mock_sqs
+def test_worker_does_not_query_ods_again_for_redelivered_message():
+    queue, s3_manager = _build_queue_and_s3_manager()
+    coordinator = _build_coordinator(queue, s3_manager)
+    data_source = _build_data_source()
+
+    coordinator.enqueue(["12A"])
+    coordinator.enqueue(["12A"])
+    _build_worker(queue, data_source, s3_manager).run()
+
+    data_source.fetch_practices_for_sicbl.assert_called_once_with("12A")
+    assert coordinator.gather(["12A"]) == {"12A": SICBL_PRACTICES["12A"]}
+    assert queue.receive(wait_seconds=0) == []
+
+
+@mock_s3
+@mock_sqs
+def test_worker_retries_failed_query_when_message_is_redelivered():
+    queue, s3_manager = _build_queue_and_s3_manager({"VisibilityTimeout": "0"})
+    coordinator = _build_coordinator(queue, s3_manager)
+    data_source = Mock()
+    data_source.fetch_practices_for_sicbl.side_effect = [
+        RuntimeError("ODS unavailable"),
+        SICBL_PRACTICES["12A"],
+    ]
+
+    coordinator.enqueue(["12A"])
+    _build_worker(queue, data_source, s3_manager).run()
+
+    assert data_source.fetch_practices_for_sicbl.call_count == 2
+    assert coordinator.gather(["12A"]) == {"12A": SICBL_PRACTICES["12A"]}
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        {"crawl_id": "crawl-1", "date_anchor": DATE_ANCHOR.isoformat()},
+        {"sicbl_ods_code": "12A", "date_anchor": DATE_ANCHOR.isoformat()},
+        {"crawl_id": "crawl-1", "sicbl_ods_code": "12A", "date_anchor": "not a date"},
+    ],
+)
+def test_worker_deletes_invalid_message_without_querying_ods(message):
+    queue = Mock()
+    queue.receive.side_effect = [[(message, "receipt-1")], []]
+    data_source = _build_data_source()
+
+    _build_worker(queue, data_source, Mock()).run()
+
+    data_source.fetch_practices_for_sicbl.assert_not_called()
+    queue.delete.assert_called_once_with("receipt-1")
+
+
+@mock_s3
+@mock_sqs
+def test_coordinator_lists_crawl_results_instead_of_checking_each_sicbl():
+    queue, s3_manager = _build_queue_and_s3_manager()
+    io_stats = S3IoStats()
+    coordinator_s3_manager = S3DataManager(
+        boto3.client("s3", region_name=MOTO_MOCK_REGION), io_stats=io_stats
+    )
+    coordinator = _build_coordinator(queue, coordinator_s3_manager)
+
+    coordinator.enqueue(["12A", "13B"])
+    _build_worker(queue, _build_data_source(), s3_manager).run()
+    coordinator.gather(["12A", "13B"])
+
+    operations = io_stats.operation_stats()
+    assert sorted(operations) == ["GetObject", "ListObjectsV2"]
+    assert operations["ListObjectsV2"].requests == 1
+
+
+@mock_s3
+@mock_sqs
+def test_worker_writes_result_for_crawl_id_and_sicbl_of_message():
+    queue, s3_manager = _build_queue_and_s3_manager()
+    queue.send_all(
+        [
+            {
+                "crawl_id": "crawl-2",
+                "sicbl_ods_code": "12A",
+                "date_anchor": DATE_ANCHOR.isoformat(),
+                "result_uri": "s3://output/v5/2023/1/organisationMetadata.json",
+            }
+        ]
+    )
+
+    _build_worker(queue, _build_data_source(), s3_manager).run()
+
+    assert s3_manager.list_object_uris("s3://output/") == [
+        "s3://output/staging/2023/1/sicblCrawl/crawl-2/12A.json"
+    ]
+
+
+@mock_s3
+@mock_sqs
+def test_coordinator_times_out_when_results_are_missing():
+    queue, s3_manager = _build_queue_and_s3_manager()
+    clock = Mock(side_effect=[0, 5, 11])
+    coordinator = _build_coordinator(
+        queue, s3_manager, timeout_seconds=10, clock=clock, sleep=Mock()
+    )
+
+    with pytest.raises(TimeoutError, match="2 SICBL crawl results: 12A, 13B"):
+        coordinator.fetch_sicbl_practices(SICBLS)
@@ -0,0 +1,83 @@
+import hashlib
+import json
+from datetime import datetime
+
+import boto3
+from dateutil.tz import tzutc
+from moto import mock_s3
+
+from prmods.domain.ods_portal.metadata_service import (
+    OrganisationMetadata,
+    PracticeDetails,
+    SicblDetails,
+)
+from prmods.pipeline.s3_uri_resolver import OdsDownloaderS3UriResolver
+from prmods.pipeline.sicbl_shards import SicblShardWriter
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+SOME_METADATA = {"metadata_field": "metadata_value"}
+DATE_ANCHOR = datetime(2020, 1, 30, tzinfo=tzutc())
+
+
+def _build_metadata():
+    return OrganisationMetadata(
+        generated_on=datetime(2020, 1, 30, 18, 44, 49, tzinfo=tzutc()),
+        year=2020,
+        month=1,
+        practices=[
+            PracticeDetails(ods_code="A12345", name="GP Practice", asids=["111"]),
+            PracticeDetails(ods_code="B12345", name="GP Practice 2", asids=["222", "333"]),
+        ],
+        sicbls=[
+            SicblDetails(ods_code="12A", name="SICBL", practices=["A12345"]),
+            SicblDetails(ods_code="34B", name="SICBL 2", practices=["A12345", "B12345"]),
+        ],
+    )
+
+
+def _build_writer(conn):
+    uris = OdsDownloaderS3UriResolver(asid_lookup_bucket="input", ods_metadata_bucket="output")
+    return SicblShardWriter(S3DataManager(conn.meta.client), uris, max_workers=2)
+
+
+@mock_s3
+def test_writes_one_shard_per_sicbl_with_practice_details():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="output")
+
+    _build_writer(conn).write(_build_metadata(), DATE_ANCHOR, SOME_METADATA)
+
+    actual = json.loads(bucket.Object("v5/2020/1/sicbls/34B.json").get()["Body"].read())
+
+    assert actual == {
+        "generated_on": "2020-01-30T18:44:49+00:00",
+        "year": 2020,
+        "month": 1,
+        "ods_code": "34B",
+        "name": "SICBL 2",
+        "practices": [
+            {"ods_code": "A12345", "name": "GP Practice", "asids": ["111"]},
+            {"ods_code": "B12345", "name": "GP Practice 2", "asids": ["222", "333"]},
+        ],
+    }
+
+
+@mock_s3
+def test_writes_index_listing_shard_sizes_and_hashes():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="output")
+
+    _build_writer(conn).write(_build_metadata(), DATE_ANCHOR, SOME_METADATA)
+
+    index = json.loads(bucket.Object("v5/2020/1/sicbls/index.json").get()["Body"].read())
+    shard_body = bucket.Object("v5/2020/1/sicbls/12A.json").get()["Body"].read()
+
+    assert [shard["ods_code"] for shard in index["shards"]] == ["12A", "34B"]
+    assert index["shards"][0] == {
+        "ods_code": "12A",
+        "object_uri": "s3://output/v5/2020/1/sicbls/12A.json",
+        "size_bytes": len(shard_body),
+        "sha256": hashlib.sha256(shard_body).hexdigest(),
+    }
+    assert (index["year"], index["month"]) == (2020, 1)
@@ -0,0 +1,93 @@
+from threading import Barrier
+from unittest.mock import Mock
+
+import pytest
+
+from prmods.pipeline.stage_graph import (
+    InvalidStageGraph,
+    Stage,
+    StageGraph,
+    StageGraphExecutor,
+    StageTiming,
+    critical_path,
+)
+
+
+def test_passes_input_results_to_each_stage_in_declared_order():
+    graph = StageGraph(
+        [
+            Stage("subtract", lambda a, b: a - b, inputs=("ten", "three")),
+            Stage("ten", lambda: 10),
+            Stage("three", lambda: 3),
+        ]
+    )
+
+    result = StageGraphExecutor(max_workers=2, logger=Mock()).run(graph)
+
+    assert result.results == {"ten": 10, "three": 3, "subtract": 7}
+
+
+def test_runs_independent_stages_concurrently():
+    barrier = Barrier(2, timeout=5)
+    graph = StageGraph(
+        [
+            Stage("first", barrier.wait),
+            Stage("second", barrier.wait),
+        ]
+    )
+
+    result = StageGraphExecutor(max_workers=2, logger=Mock()).run(graph)
+
+    assert set(result.results) == {"first", "second"}
+
+
+def test_does_not_start_dependent_stages_after_a_failure():
+    downstream = Mock()
+
+    def fail():
+        raise ValueError("stage failed")
+
+    graph = StageGraph([Stage("fail", fail), Stage("downstream", downstream, inputs=("fail",))])
+
+    with pytest.raises(ValueError, match="stage failed"):
+        StageGraphExecutor(logger=Mock()).run(graph)
+
+    downstream.assert_not_called()
+
+
+def test_rejects_unknown_inputs_and_cycles():
+    with pytest.raises(InvalidStageGraph):
+        StageGraph([Stage("a", lambda b: b, inputs=("b",))])
+
+    with pytest.raises(InvalidStageGraph):
+        StageGraph([Stage("a", lambda b: b, inputs=("b",)), Stage("b", lambda a: a, inputs=("a",))])
+
+
+def test_critical_path_follows_the_slowest_chain_of_inputs():
+    graph = StageGraph(
+        [
+            Stage("lookup", lambda: None),
+            Stage("practices", lambda: None),
+            Stage("enrich", lambda *_: None, inputs=("lookup", "practices")),
+            Stage("write", lambda _: None, inputs=("enrich",)),
+        ]
+    )
+    timings = {
+        "lookup": StageTiming(0.0, 1.0),
+        "practices": StageTiming(0.0, 4.0),
+        "enrich": StageTiming(4.0, 5.0),
+        "write": StageTiming(5.0, 7.0),
+    }
+
+    assert critical_path(graph, timings) == (["practices", "enrich", "write"], 7.0)
+
+
+def test_logs_critical_path_at_the_end_of_the_run():
+    mock_logger = Mock()
+    graph = StageGraph([Stage("a", lambda: 1), Stage("b", lambda a: a, inputs=("a",))])
+
+    StageGraphExecutor(logger=mock_logger).run(graph)
+
+    extra = mock_logger.info.call_args.kwargs["extra"]
+    assert extra["event"] == "STAGE_GRAPH_CRITICAL_PATH"
+    assert extra["critical_path"] == ["a", "b"]
@@ -0,0 +1,85 @@
+import json
+import time
+from logging import makeLogRecord
+from threading import Thread
+from unittest.mock import Mock
+
+import pytest
+
+from prmods.pipeline.stage_spans import StageTimer
+from prmods.utils.io.json_formatter import JsonFormatter
+
+
+def test_logs_stage_completed_event_with_embedded_metrics():
+    mock_logger = Mock()
+    stage_timer = StageTimer(logger=mock_logger, namespace="test-namespace")
+
+    with stage_timer.span("FETCH_PRACTICES") as stage_span:
+        stage_span.item_count = 3
+
+    (stage_completed,) = stage_timer.spans()
+    extra = mock_logger.info.call_args.kwargs["extra"]
+    metrics_directive = extra["_aws"]["CloudWatchMetrics"][0]
+
+    assert stage_completed.stage == "FETCH_PRACTICES"
+    assert stage_completed.wall_seconds >= 0
+    assert extra["event"] == "RUN_STAGE_COMPLETED"
+    assert extra["stage"] == "FETCH_PRACTICES"
+    assert extra["item_count"] == 3
+    assert metrics_directive["Namespace"] == "test-namespace"
+    assert metrics_directive["Dimensions"] == [["stage"]]
+    assert {metric["Name"] for metric in metrics_directive["Metrics"]} <= extra.keys()
+
+
+def test_stage_completed_event_is_embedded_metric_format_when_formatted():
+    mock_logger = Mock()
+    stage_timer = StageTimer(logger=mock_logger)
+
+    with stage_timer.span("WRITE_OUTPUTS"):
+        pass
+
+    record = makeLogRecord(
+        {"msg": mock_logger.info.call_args.args[0], **mock_logger.info.call_args.kwargs["extra"]}
+    )
+    formatted = json.loads(JsonFormatter().format(record))
+
+    assert formatted["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["stage"]]
+    assert formatted["stage"] == "WRITE_OUTPUTS"
+    assert isinstance(formatted["_aws"]["Timestamp"], int)
+
+
+def test_logs_run_summary_of_completed_stages():
+    mock_logger = Mock()
+    stage_timer = StageTimer(logger=mock_logger)
+
+    with stage_timer.span("READ_ASID_LOOKUP") as stage_span:
+        stage_span.item_count = 2
+    with pytest.raises(ValueError):
+        with stage_timer.span("FETCH_PRACTICES"):
+            raise ValueError("failed")
+    stage_timer.log_summary()
+
+    extra = mock_logger.info.call_args.kwargs["extra"]
+
+    assert extra["event"] == "RUN_SUMMARY"
+    assert extra["item_count"] == 2
+    assert [stage["stage"] for stage in extra["stages"]] == ["READ_ASID_LOOKUP"]
+    assert extra["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [[]]
+
+
+def test_stage_cpu_time_excludes_work_on_other_threads():
+    def busy_loop():
+        finish = time.perf_counter() + 0.2
+        while time.perf_counter() < finish:
+            pass
+
+    stage_timer = StageTimer(logger=Mock())
+    other_stage = Thread(target=busy_loop)
+
+    with stage_timer.span("READ_ASID_LOOKUP"):
+        other_stage.start()
+        other_stage.join()
+
+    (stage_span,) = stage_timer.spans()
+    assert stage_span.wall_seconds >= 0.2
+    assert stage_span.cpu_seconds < 0.1
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pytest
+
+from prmods.pipeline.config import InvalidEnvironmentVariableValue, OdsPortalConfig
+from prmods.pipeline.streaming_downloader import (
+    StreamingOdsDownloader,
+    unsupported_streaming_options,
+)
+
+
+def _config(**kwargs) -> OdsPortalConfig:
+    return OdsPortalConfig(
+        output_bucket="output",
+        mapping_bucket="mapping",
+        build_tag="build",
+        date_anchor=datetime(2020, 1, 1),
+        search_url="http://ods",
+        show_prison_practices_toggle=True,
+        streaming_pipeline=True,
+        **kwargs,
+    )
+
+
+def test_no_unsupported_options_by_default():
+    assert unsupported_streaming_options(_config()) == []
+
+
+def test_lists_options_that_streaming_would_bypass():
+    config = _config(write_metadata_delta=True, checkpoint_location="/tmp", run_id="run-1")
+
+    assert unsupported_streaming_options(config) == ["WRITE_METADATA_DELTA", "CHECKPOINT_LOCATION"]
+
+
+def test_downloader_rejects_unsupported_options():
+    with pytest.raises(InvalidEnvironmentVariableValue, match="ODS_CACHE_DIRECTORY"):
+        StreamingOdsDownloader(_config(ods_cache_directory="/tmp/ods-cache"))
@@ -0,0 +1,198 @@
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import boto3
+import pytest
+from botocore.hooks import HierarchicalEmitter
+from moto import mock_s3
+
+from prmods.utils.io.s3 import S3DataManager
+from prmods.utils.io.s3_io_stats import S3IoStats, S3OperationStats
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+def _fake_client() -> SimpleNamespace:
+    return SimpleNamespace(meta=SimpleNamespace(events=HierarchicalEmitter()))
+
+
+def _emit_call(client, operation: str, body=b"", status_code=200, retries=0, content_length="0"):
+    context: dict = {}
+    model = SimpleNamespace(name=operation)
+    client.meta.events.emit(
+        f"before-call.s3.{operation}", model=model, params={"body": body}, context=context
+    )
+    client.meta.events.emit(
+        f"after-call.s3.{operation}",
+        http_response=SimpleNamespace(
+            status_code=status_code, headers={"content-length": content_length}
+        ),
+        parsed={"ResponseMetadata": {"RetryAttempts": retries}},
+        model=model,
+        context=context,
+    )
+
+
+@mock_s3
+def test_counts_requests_and_bytes_by_operation():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+    io_stats = S3IoStats()
+    s3_manager = S3DataManager(conn.meta.client, io_stats=io_stats)
+
+    s3_manager.write_bytes(
+        "s3://test_bucket/object.bin", b"x" * 100, content_type="text/plain", metadata={}
+    )
+    s3_manager.read_bytes("s3://test_bucket/object.bin")
+    s3_manager.read_object_metadata("s3://test_bucket/object.bin")
+    s3_manager.read_object_metadata("s3://test_bucket/missing.bin")
+
+    operations = io_stats.operation_stats()
+    assert sorted(operations) == ["GetObject", "HeadObject", "PutObject"]
+    assert (operations["PutObject"].requests, operations["PutObject"].bytes_sent) == (1, 100)
+    assert (operations["GetObject"].requests, operations["GetObject"].bytes_received) == (1, 100)
+    assert operations["HeadObject"].requests == 2
+    assert operations["HeadObject"].errors == 1
+    assert operations["HeadObject"].bytes_received == 0
+
+
+@mock_s3
+def test_counts_bytes_of_file_bodies_and_multipart_parts():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+    client = conn.meta.client
+    io_stats = S3IoStats()
+    io_stats.instrument(client)
+
+    client.put_object(Bucket="test_bucket", Key="file.bin", Body=BytesIO(b"y" * 50))
+    upload = client.create_multipart_upload(Bucket="test_bucket", Key="parts.bin")
+    part = client.upload_part(
+        Bucket="test_bucket",
+        Key="parts.bin",
+        UploadId=upload["UploadId"],
+        PartNumber=1,
+        Body=b"z" * 200,
+    )
+    client.complete_multipart_upload(
+        Bucket="test_bucket",
+        Key="parts.bin",
+        UploadId=upload["UploadId"],
+        MultipartUpload={"Parts": [{"ETag": part["ETag"], "PartNumber": 1}]},
+    )
+
+    operations = io_stats.operation_stats()
+    assert operations["PutObject"].bytes_sent == 50
+    assert operations["UploadPart"].bytes_sent == 200
+    assert operations["CreateMultipartUpload"].requests == 1
+    assert operations["CompleteMultipartUpload"].requests == 1
+
+
+def test_counts_each_retry_as_a_request():
+    client = _fake_client()
+    io_stats = S3IoStats()
+    io_stats.instrument(client)
+
+    _emit_call(client, "GetObject", retries=2, content_length="10")
+
+    stats = io_stats.operation_stats()["GetObject"]
+    stats.seconds = 0.0
+    assert stats == S3OperationStats(
+        requests=3, retries=2, errors=0, bytes_sent=0, bytes_received=10
+    )
+
+
+def test_counts_calls_that_raise_as_errors():
+    client = _fake_client()
+    io_stats = S3IoStats()
+    io_stats.instrument(client)
+    context: dict = {}
+
+    client.meta.events.emit(
+        "before-call.s3.PutObject",
+        model=SimpleNamespace(name="PutObject"),
+        params={"body": b"abc"},
+        context=context,
+    )
+    client.meta.events.emit(
+        "after-call-error.s3.PutObject", exception=ConnectionError(), context=context
+    )
+
+    stats = io_stats.operation_stats()["PutObject"]
+    assert (stats.requests, stats.errors, stats.bytes_sent) == (1, 1, 3)
+
+
+def test_estimates_request_cost_by_operation_price():
+    client = _fake_client()
+    io_stats = S3IoStats()
+    io_stats.instrument(client)
+
+    for _ in range(1000):
+        _emit_call(client, "PutObject")
+        _emit_call(client, "GetObject")
+        _emit_call(client, "DeleteObject")
+
+    assert io_stats.estimated_request_cost() == pytest.approx(0.0053 + 0.00042)
+
+
+def test_logs_summary_of_s3_io():
+    client = _fake_client()
+    logger = Mock()
+    io_stats = S3IoStats(logger=logger)
+    io_stats.instrument(client)
+
+    _emit_call(client, "PutObject", body=b"x" * 30)
+    _emit_call(client, "GetObject", content_length="20", retries=1)
+    io_stats.log_summary()
+
+    extra = logger.info.call_args.kwargs["extra"]
+    assert extra["event"] == "S3_IO_SUMMARY"
+    assert (extra["requests"], extra["retries"]) == (3, 1)
+    assert (extra["bytes_sent"], extra["bytes_received"]) == (30, 20)
+    assert sorted(extra["operations"]) == ["GetObject", "PutObject"]
+
+
+def _emit_before_call(client, operation: str, body: bytes, context: dict):
+    client.meta.events.emit(
+        f"before-call.s3.{operation}",
+        model=SimpleNamespace(name=operation),
+        params={"body": body},
+        context=context,
+    )
+
+
+def _emit_after_call(client, operation: str, context: dict):
+    client.meta.events.emit(
+        f"after-call.s3.{operation}",
+        http_response=SimpleNamespace(status_code=200, headers={"content-length": "0"}),
+        parsed={"ResponseMetadata": {"RetryAttempts": 0}},
+        model=SimpleNamespace(name=operation),
+        context=context,
+    )
+
+
+def test_measures_throughput_over_wall_clock_time_of_overlapping_calls():
+    client = _fake_client()
+    logger = Mock()
+    io_stats = S3IoStats(logger=logger)
+    io_stats.instrument(client)
+    first_call: dict = {}
+    second_call: dict = {}
+
+    with patch("prmods.utils.io.s3_io_stats.time.perf_counter", side_effect=[0.0, 0.5, 1.0, 2.0]):
+        _emit_before_call(client, "PutObject", b"x" * 100, first_call)
+        _emit_before_call(client, "PutObject", b"y" * 100, second_call)
+        _emit_after_call(client, "PutObject", first_call)
+        _emit_after_call(client, "PutObject", second_call)
+    io_stats.log_summary()
+
+    extra = logger.info.call_args.kwargs["extra"]
+    assert (extra["seconds"], extra["wall_seconds"]) == (2.5, 2.0)
+    assert extra["bytes_per_second"] == 100
+
+
+def test_does_not_log_summary_without_s3_io():
+    logger = Mock()
+
+    S3IoStats(logger=logger).log_summary()
+
+    logger.info.assert_not_called()
@@ -0,0 +1,31 @@
+import boto3
+from moto import mock_s3
+
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+@mock_s3
+def test_returns_uris_of_objects_under_prefix():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    for key in ["crawl/1/12A.json", "crawl/1/13B.json", "crawl/2/12A.json"]:
+        bucket.Object(key).put(Body=b"{}")
+    s3_manager = S3DataManager(conn.meta.client)
+
+    expected = ["s3://test_bucket/crawl/1/12A.json", "s3://test_bucket/crawl/1/13B.json"]
+
+    actual = s3_manager.list_object_uris("s3://test_bucket/crawl/1/")
+
+    assert actual == expected
+
+
+@mock_s3
+def test_returns_empty_list_when_prefix_has_no_objects():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn.meta.client)
+
+    actual = s3_manager.list_object_uris("s3://test_bucket/crawl/1/")
+
+    assert actual == []
@@ -20,7 +20,7 @@ def test_returns_csv_row_as_dictionary():
         )
     )
 
-    s3_manager = S3DataManager(conn)
+    s3_manager = S3DataManager(conn.meta.client)
 
     expected = [
         {"header1": "row1-col1", "header2": "row1-col2"},
@@ -45,7 +45,7 @@ def test_will_log_reading_file_event():
         )
     )
 
-    s3_manager = S3DataManager(conn)
+    s3_manager = S3DataManager(conn.meta.client)
     object_uri = f"s3://{bucket_name}/test_object.csv.gz"
 
     with mock.patch.object(logger, "info") as mock_log_info:
@@ -0,0 +1,38 @@
+import boto3
+import pytest
+from moto import mock_s3
+
+from prmods.utils.io.s3 import S3DataManager, S3ObjectNotFound
+from tests.builders.file import build_gzip_csv
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+@mock_s3
+def test_returns_decompressed_line_aligned_chunks():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    bucket.Object("test_object.csv.gz").put(
+        Body=build_gzip_csv(
+            header=["header1", "header2"],
+            rows=[["row1-col1", "row1-col2"], ["row2-col1", "row2-col2"]],
+        )
+    )
+
+    s3_manager = S3DataManager(conn.meta.client)
+
+    actual = list(
+        s3_manager.read_gzip_text_chunks("s3://test_bucket/test_object.csv.gz", chunk_size=16)
+    )
+
+    assert actual == ["header1,header2\n", "row1-col1,row1-col2\n", "row2-col1,row2-col2"]
+
+
+@mock_s3
+def test_raises_when_object_is_missing():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+
+    s3_manager = S3DataManager(conn.meta.client)
+
+    with pytest.raises(S3ObjectNotFound):
+        list(s3_manager.read_gzip_text_chunks("s3://test_bucket/missing.csv.gz"))
@@ -0,0 +1,35 @@
+import boto3
+from moto import mock_s3
+
+from prmods.utils.io.compression import GZIP, compress_text_chunks
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+@mock_s3
+def test_returns_json_as_dictionary():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    bucket.Object("test_object.json").put(Body=b'{"fruit": "mango"}')
+    s3_manager = S3DataManager(conn.meta.client)
+
+    expected = {"fruit": "mango"}
+
+    actual = s3_manager.read_json("s3://test_bucket/test_object.json")
+
+    assert actual == expected
+
+
+@mock_s3
+def test_decompresses_json_according_to_content_encoding():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    compressed = compress_text_chunks(['{"fruit": "mango"}'], GZIP)
+    bucket.Object("test_object.json.gz").put(Body=compressed.body, ContentEncoding="gzip")
+    s3_manager = S3DataManager(conn.meta.client)
+
+    expected = {"fruit": "mango"}
+
+    actual = s3_manager.read_json("s3://test_bucket/test_object.json.gz")
+
+    assert actual == expected
@@ -0,0 +1,30 @@
+import boto3
+from moto import mock_s3
+
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+@mock_s3
+def test_returns_metadata_of_existing_object():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    bucket.Object("test_object.json").put(Body=b"{}", Metadata={"content-sha256": "abc"})
+    s3_manager = S3DataManager(conn.meta.client)
+
+    expected = {"content-sha256": "abc"}
+
+    actual = s3_manager.read_object_metadata("s3://test_bucket/test_object.json")
+
+    assert actual == expected
+
+
+@mock_s3
+def test_returns_none_when_object_does_not_exist():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn.meta.client)
+
+    actual = s3_manager.read_object_metadata("s3://test_bucket/test_object.json")
+
+    assert actual is None
@@ -0,0 +1,54 @@
+import gzip
+from unittest import mock
+
+import boto3
+from moto import mock_s3
+
+from prmods.utils.io.compression import GZIP, compress_text_chunks
+from prmods.utils.io.s3 import S3DataManager, logger
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+SOME_METADATA = {"metadata_field": "metadata_value"}
+
+
+@mock_s3
+def test_writes_compressed_body_with_content_encoding():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn.meta.client)
+    compressed = compress_text_chunks(['{"fruit": "mango"}'], GZIP)
+
+    s3_manager.write_compressed_json(
+        "s3://test_bucket/test_object.json.gz", compressed, metadata=SOME_METADATA
+    )
+
+    actual = bucket.Object("test_object.json.gz").get()
+    assert gzip.decompress(actual["Body"].read()) == b'{"fruit": "mango"}'
+    assert actual["ContentType"] == "application/json"
+    assert actual["ContentEncoding"] == "gzip"
+    assert actual["Metadata"] == SOME_METADATA
+
+
+@mock_s3
+def test_will_log_compression_statistics():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn.meta.client)
+    compressed = compress_text_chunks(['{"fruit": "mango"}'], GZIP)
+    object_uri = "s3://test_bucket/test_object.json.gz"
+
+    with mock.patch.object(logger, "info") as mock_log_info:
+        s3_manager.write_compressed_json(object_uri, compressed, metadata=SOME_METADATA)
+
+    mock_log_info.assert_called_with(
+        f"Successfully uploaded to: {object_uri}",
+        extra={
+            "event": "UPLOADED_COMPRESSED_JSON_TO_S3",
+            "object_uri": object_uri,
+            "content_encoding": "gzip",
+            "uncompressed_size": 18,
+            "compressed_size": compressed.compressed_size,
+            "compression_ratio": round(compressed.compression_ratio, 2),
+            "compression_seconds": round(compressed.compression_seconds, 4),
+        },
+    )
@@ -14,7 +14,7 @@ SOME_METADATA = {"metadata_field": "metadata_value"}
 def test_writes_dictionary():
     conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
     bucket = conn.create_bucket(Bucket="test_bucket")
-    s3 = S3DataManager(conn)
+    s3 = S3DataManager(conn.meta.client)
     data = {"fruit": "mango"}
 
     expected = b'{"fruit": "mango"}'
@@ -30,7 +30,7 @@ def test_writes_dictionary():
 def test_writes_dictionary_with_timestamp():
     conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
     bucket = conn.create_bucket(Bucket="test_bucket")
-    s3 = S3DataManager(conn)
+    s3 = S3DataManager(conn.meta.client)
     data = {"timestamp": datetime(2020, 7, 23)}
 
     expected = b'{"timestamp": "2020-07-23T00:00:00"}'
@@ -47,7 +47,7 @@ def test_writes_correct_content_type():
     conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
     bucket = conn.create_bucket(Bucket="test_bucket")
     data = {"fruit": "mango"}
-    s3_manager = S3DataManager(conn)
+    s3_manager = S3DataManager(conn.meta.client)
 
     expected = "application/json"
 
@@ -65,7 +65,7 @@ def test_will_log_writing_file_events():
     conn.create_bucket(Bucket=bucket_name)
     data = {"fruit": "mango"}
 
-    s3_manager = S3DataManager(conn)
+    s3_manager = S3DataManager(conn.meta.client)
     object_uri = f"s3://{bucket_name}/test_object.json"
 
     with mock.patch.object(logger, "info") as mock_log_info:
@@ -90,7 +90,7 @@ def test_write_json_will_write_metadata_when_supplied():
     bucket_name = "test_bucket"
     bucket = conn.create_bucket(Bucket=bucket_name)
     data = {"fruit": "mango"}
-    s3_manager = S3DataManager(conn)
+    s3_manager = S3DataManager(conn.meta.client)
 
     metadata = {
         "metadata_field": "metadata_field_value",
@@ -105,3 +105,20 @@ def test_write_json_will_write_metadata_when_supplied():
     actual = bucket.Object("test_object.json").get()["Metadata"]
 
     assert actual == expected
+
+
+@mock_s3
+def test_write_encoded_json_writes_body_as_given():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn.meta.client)
+    body = '{"fruit": "mango"}'
+
+    expected = b'{"fruit": "mango"}'
+
+    s3_manager.write_encoded_json("s3://test_bucket/test_object.json", body, SOME_METADATA)
+
+    actual = bucket.Object("test_object.json").get()
+    assert actual["Body"].read() == expected
+    assert actual["ContentType"] == "application/json"
+    assert actual["Metadata"] == SOME_METADATA
@@ -0,0 +1,42 @@
+from io import BytesIO
+
+import boto3
+import pytest
+from moto import mock_s3
+
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+
+SOME_METADATA = {"metadata_field": "metadata_value"}
+
+
+@mock_s3
+def test_writes_columns_as_parquet_table():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn.meta.client)
+    columns = {"ods_code": ["A12345", "B12345"], "asid": ["111", "222"]}
+
+    s3_manager.write_parquet("s3://test_bucket/practice_asids.parquet", columns, SOME_METADATA)
+
+    actual = bucket.Object("practice_asids.parquet").get()
+    table = pyarrow_parquet.read_table(BytesIO(actual["Body"].read()))
+    assert table.to_pydict() == columns
+    assert actual["ContentType"] == "application/vnd.apache.parquet"
+    assert actual["Metadata"] == SOME_METADATA
+
+
+@mock_s3
+def test_reads_only_requested_columns():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn.meta.client)
+    columns = {"ods_code": ["A12345"], "name": ["GP Practice"]}
+
+    s3_manager.write_parquet("s3://test_bucket/practices.parquet", columns, SOME_METADATA)
+
+    body = BytesIO(bucket.Object("practices.parquet").get()["Body"].read())
+    table = pyarrow_parquet.read_table(body, columns=["ods_code"])
+    assert table.to_pydict() == {"ods_code": ["A12345"]}
@@ -0,0 +1,26 @@
+from io import StringIO
+
+from prmods.utils.io.chunks import iter_line_aligned_chunks
+
+
+def test_chunks_end_at_line_breaks_and_keep_every_line():
+    text = "header\nfirst line\nsecond\nthird line without break"
+
+    chunks = list(iter_line_aligned_chunks(StringIO(text), chunk_size=8))
+
+    assert "".join(chunks) == text
+    assert all(chunk.endswith("\n") for chunk in chunks[:-1])
+    assert chunks[-1] == "third line without break"
+
+
+def test_no_chunks_for_empty_stream():
+    assert list(iter_line_aligned_chunks(StringIO(""), chunk_size=8)) == []
+
+
+def test_chunks_do_not_end_inside_quoted_fields():
+    text = 'header\n"multi\nline ""quoted""\nfield",x\nlast,"y"\n'
+
+    chunks = list(iter_line_aligned_chunks(StringIO(text), chunk_size=8))
+
+    assert "".join(chunks) == text
+    assert chunks == ["header\n", '"multi\nline ""quoted""\nfield",x\n', 'last,"y"\n']
@@ -0,0 +1,61 @@
+import gzip
+
+import pytest
+
+from prmods.utils.io.compression import (
+    GZIP,
+    ZSTD,
+    compress_text_chunks,
+    decompress,
+    file_extension,
+    validate_content_encoding,
+)
+
+
+def test_compress_text_chunks_produces_gzip_of_the_joined_chunks():
+    chunks = ['{"fruit": ', '"mango"', "}"]
+
+    actual = compress_text_chunks(chunks, GZIP)
+
+    assert gzip.decompress(actual.body) == b'{"fruit": "mango"}'
+    assert actual.content_encoding == "gzip"
+
+
+def test_compress_text_chunks_produces_zstd_of_the_joined_chunks():
+    zstandard = pytest.importorskip("zstandard")
+    chunks = ['{"fruit": ', '"mango"', "}"]
+
+    actual = compress_text_chunks(chunks, ZSTD)
+
+    decompressed = zstandard.ZstdDecompressor().decompressobj().decompress(actual.body)
+    assert decompressed == b'{"fruit": "mango"}'
+    assert actual.content_encoding == "zstd"
+
+
+def test_compress_text_chunks_reports_sizes_and_ratio():
+    chunks = ["mango" * 1000, "papaya" * 1000]
+
+    actual = compress_text_chunks(chunks, GZIP)
+
+    assert actual.uncompressed_size == 11000
+    assert actual.compressed_size == len(actual.body)
+    assert actual.compression_ratio == 11000 / len(actual.body)
+    assert actual.compression_seconds >= 0
+
+
+def test_file_extension_returns_extension_for_content_encoding():
+    assert file_extension(GZIP) == ".gz"
+    assert file_extension(ZSTD) == ".zst"
+
+
+def test_validate_content_encoding_rejects_unknown_encoding():
+    with pytest.raises(ValueError):
+        validate_content_encoding("brotli")
+
+
+def test_decompress_reverses_compress_text_chunks():
+    compressed = compress_text_chunks(['{"fruit": "mango"}'], GZIP)
+
+    actual = decompress(compressed.body, GZIP)
+
+    assert actual == b'{"fruit": "mango"}'
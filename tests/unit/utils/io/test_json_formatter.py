@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 from logging import makeLogRecord
 
 from prmods.utils.io.json_formatter import JsonFormatter
@@ -28,3 +29,33 @@ def test_json_formatter_correctly_formats_record():
     actual = json.loads(actual_json_string)
 
     assert actual == expected
+
+
+def _format_as_before(record):
+    return json.dumps(
+        {
+            name: value
+            for (name, value) in vars(record).items()
+            if name not in vars(makeLogRecord({})).keys()
+        }
+        | {
+            "level": record.levelname,
+            "message": record.msg,
+            "module": record.module,
+            "time": datetime.utcfromtimestamp(record.created).isoformat(),
+        }
+    )
+
+
+def test_json_formatter_output_is_unchanged_from_dictionary_merge_implementation():
+    formatter = JsonFormatter()
+    records = [
+        makeLogRecord({"msg": "a message", "created": 1607965513.358049, "event": "AN_EVENT"}),
+        makeLogRecord({"msg": "same second", "created": 1607965513.9, "ods_code": "A12345"}),
+        makeLogRecord({"msg": "next second", "created": 1607965514.0, "level": "overridden"}),
+        makeLogRecord({"msg": "rounds up", "created": 1607965514.9999997}),
+        makeLogRecord({"msg": "Practice in Ynys Môn", "created": 1607965515.0, "count": 1.5}),
+    ]
+
+    for record in records:
+        assert formatter.format(record) == _format_as_before(record)
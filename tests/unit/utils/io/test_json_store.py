@@ -0,0 +1,32 @@
+import boto3
+from moto import mock_s3
+
+from prmods.utils.io.json_store import LocalJsonStore, S3JsonStore
+from prmods.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+def test_local_json_store_returns_none_for_missing_key(tmp_path):
+    assert LocalJsonStore(str(tmp_path)).read("run-1/missing.json") is None
+
+
+def test_local_json_store_reads_written_data(tmp_path):
+    store = LocalJsonStore(str(tmp_path))
+
+    store.write("run-1/query.json", [{"OrgId": "A12345"}])
+
+    assert store.read("run-1/query.json") == [{"OrgId": "A12345"}]
+    assert [path.name for path in (tmp_path / "run-1").iterdir()] == ["query.json"]
+
+
+@mock_s3
+def test_s3_json_store_reads_written_data_under_prefix():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="staging")
+    store = S3JsonStore(S3DataManager(conn.meta.client), "s3://staging/checkpoints/")
+
+    store.write("run-1/query.json", [{"OrgId": "A12345"}])
+
+    assert store.read("run-1/query.json") == [{"OrgId": "A12345"}]
+    assert store.read("run-1/missing.json") is None
+    assert [obj.key for obj in bucket.objects.all()] == ["checkpoints/run-1/query.json"]
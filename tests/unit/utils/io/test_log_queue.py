@@ -0,0 +1,87 @@
+import logging
+import threading
+from logging import makeLogRecord
+from queue import Queue
+
+import pytest
+
+from prmods.utils.io.log_queue import BoundedQueueHandler, QueuedLogging
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(record.msg)
+        self.threads.add(threading.current_thread().name)
+
+
+def _a_logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def test_writes_all_queued_records_on_a_background_thread_before_stop_returns():
+    logger = _a_logger("test_log_queue.background")
+    recording_handler = RecordingHandler()
+    queued_logging = QueuedLogging(logger, recording_handler, max_size=5)
+
+    queued_logging.start()
+    for index in range(20):
+        logger.info(f"message {index}")
+    queued_logging.stop()
+
+    assert recording_handler.messages == [f"message {index}" for index in range(20)]
+    assert threading.current_thread().name not in recording_handler.threads
+
+
+def test_detaches_queue_handler_from_logger_on_stop():
+    logger = _a_logger("test_log_queue.detach")
+    queued_logging = QueuedLogging(logger, RecordingHandler())
+
+    queued_logging.start()
+    queued_logging.stop()
+
+    assert queued_logging.queue_handler not in logger.handlers
+
+
+def test_does_not_format_records_on_the_logging_thread():
+    handler = BoundedQueueHandler(Queue())
+    record = makeLogRecord({"msg": "a %s message", "args": ("formatted",)})
+
+    actual = handler.prepare(record)
+
+    assert actual is record
+    assert actual.msg == "a %s message"
+
+
+def test_drop_newest_policy_discards_records_when_queue_is_full():
+    log_queue: Queue = Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, overflow_policy="drop_newest")
+
+    for index in range(3):
+        handler.emit(makeLogRecord({"msg": f"message {index}"}))
+
+    assert [log_queue.get().msg for _ in range(2)] == ["message 0", "message 1"]
+    assert handler.dropped_records == 1
+
+
+def test_drop_oldest_policy_discards_oldest_record_when_queue_is_full():
+    log_queue: Queue = Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, overflow_policy="drop_oldest")
+
+    for index in range(3):
+        handler.emit(makeLogRecord({"msg": f"message {index}"}))
+
+    assert [log_queue.get().msg for _ in range(2)] == ["message 1", "message 2"]
+    assert handler.dropped_records == 1
+
+
+def test_rejects_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(Queue(), overflow_policy="explode")
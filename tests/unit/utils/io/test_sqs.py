@@ -0,0 +1,21 @@
+import boto3
+from moto import mock_sqs
+
+from prmods.utils.io.sqs import SqsJsonQueue
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+@mock_sqs
+def test_sends_receives_and_deletes_json_messages_in_batches():
+    client = boto3.client("sqs", region_name=MOTO_MOCK_REGION)
+    queue_url = client.create_queue(QueueName="test-queue")["QueueUrl"]
+    queue = SqsJsonQueue(queue_url, client)
+
+    queue.send_all({"number": number} for number in range(12))
+
+    received = queue.receive(wait_seconds=0) + queue.receive(wait_seconds=0)
+    for _, receipt_handle in received:
+        queue.delete(receipt_handle)
+
+    assert sorted(message["number"] for message, _ in received) == list(range(12))
+    assert queue.receive(wait_seconds=0) == []